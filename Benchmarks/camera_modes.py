@@ -0,0 +1,54 @@
+""" Замер режимов захвата камеры: частота, декодирование, оценка задержки.
+
+Запуск из корня проекта:
+    python -m Benchmarks.camera_modes --save
+"""
+import argparse
+import sys
+
+import cv2
+
+from Camera.CaptureConfig import (CANDIDATE_MODES, capture_backend, device_id, format_mode,
+                                  load_cache, negotiate_mode, save_cache)
+from Settings import get_settings
+
+
+def main():
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Замер режимов захвата камеры")
+    parser.add_argument('--device', type=int, default=settings['camera_device'], help="номер камеры")
+    parser.add_argument('--buffer-size', type=int, default=settings['camera_buffer_size'],
+                        help="кадров в буфере драйвера")
+    parser.add_argument('--min-width', type=int, default=0,
+                        help="минимальная ширина кадра (по умолчанию - все режимы)")
+    parser.add_argument('--save', action='store_true',
+                        help="запомнить лучший режим для устройства в Files/camera_modes.json")
+    args = parser.parse_args()
+
+    cap = cv2.VideoCapture(args.device, capture_backend())
+    if not cap.isOpened():
+        print(f"Error: Could not open camera {args.device}.")
+        return 1
+
+    key = device_id(args.device)
+    print(f"Device {key}, {len(CANDIDATE_MODES)} candidate modes, buffer {args.buffer_size}")
+    try:
+        best, results = negotiate_mode(cap, args.buffer_size, args.min_width, verbose=True)
+    finally:
+        cap.release()
+
+    if best is None:
+        print("No working capture mode")
+        return 1
+    print(f"\nBest: {format_mode(best)} ({len(results)} modes measured)")
+
+    if args.save:
+        cache = load_cache()
+        cache[key] = format_mode(best)
+        save_cache(cache)
+        print(f"Saved for {key}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
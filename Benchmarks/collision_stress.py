@@ -0,0 +1,148 @@
+""" Стресс-тест непрерывной проверки столкновений.
+
+Запуск из корня проекта:
+    python -m Benchmarks.collision_stress
+    python -m Benchmarks.collision_stress --box-collisions  # только прямоугольники
+
+Результат - промахи сквозь препятствия; время шага только выводится
+(оно зависит от нагрузки машины). Те же сценарии без замеров -
+в Tests/test_collision.py
+"""
+import argparse
+import sys
+import time
+
+from Physics.Collision import aabb_overlap, sweep_aabb
+from Physics.GameSimulation import GameSimulation
+
+SPEEDS = [1, 5, 15, 50, 200, 800]  # Скорости врагов (пикселей за шаг)
+STEPS = 1000                        # Шагов на один прогон
+REPEATS = 5                         # Прогонов на скорость: время шага - лучший из них
+
+
+def box(square):
+    return square.x, square.y, square.size, square.size
+
+
+def step(simulation, x, y, gesture):
+    simulation.step(x, y, gesture)
+
+
+def make_simulation(collision_masks=True):
+    """ Поле 800x800: цель сверху, блок на пути врага, второй враг стоит.
+    Рост скорости выключен: скорость врагов задает сам тест """
+    simulation = GameSimulation(800, 800, seed=0, collision_masks=collision_masks)
+    simulation.difficulty = None
+
+    simulation.orange_circle.x, simulation.orange_circle.y = 400, 100
+    simulation.beetle.x, simulation.beetle.y = 375, 700
+    simulation.beetle2.x, simulation.beetle2.y = 20, 720
+    simulation.beetle2.set_target(None)
+    simulation.squares[0].x, simulation.squares[0].y = 360, 400  # Блок на пути
+    simulation.squares[1].x, simulation.squares[1].y = 700, 20   # Второй блок в углу
+    return simulation
+
+
+def run_blocked_enemy(speed, collision_masks):
+    """ Враг летит прямо в блок: он не должен проскочить сквозь него """
+    simulation = make_simulation(collision_masks)
+    simulation.beetle.speed = speed
+    block = simulation.squares[0]
+    tunnels = 0
+    steps = 0
+
+    start = time.perf_counter()
+    for _ in range(STEPS):
+        steps += 1
+        before = box(simulation.beetle)
+        step(simulation, 0.95, 0.95, 0)
+        after = box(simulation.beetle)
+
+        # Путь за шаг задел блок, но в конце шага враг не касается его
+        # и оказался по другую сторону - это туннелирование
+        delta = (after[0] - before[0], after[1] - before[1])
+        touched = sweep_aabb(before, delta, box(block)) is not None
+        passed = after[1] + after[3] <= block.y
+        if touched and passed and not aabb_overlap(after, box(block)):
+            tunnels += 1
+        if simulation.end_game:
+            break
+    per_step = (time.perf_counter() - start) / steps
+    return tunnels, simulation.swept_hits, per_step
+
+
+def blocked_enemy_series(collision_masks):
+    """ run_blocked_enemy для всех SPEEDS, REPEATS кругов по всем скоростям:
+    время шага - минимум по кругам, так случайная нагрузка системы не попадает
+    в одну скорость (прогоны детерминированы - промахи и касания те же).
+    Возвращает {скорость: (промахи, касания, время шага)} """
+    results = {}
+    for _ in range(REPEATS):
+        for speed in SPEEDS:
+            tunnels, hits, per_step = run_blocked_enemy(speed, collision_masks)
+            if speed in results:
+                per_step = min(per_step, results[speed][2])
+            results[speed] = tunnels, hits, per_step
+    return results
+
+
+def run_free_enemy(speed, collision_masks):
+    """ Путь до цели свободен: конец игры должен наступить,
+    даже если враг за один шаг перелетает через цель """
+    simulation = make_simulation(collision_masks)
+    simulation.squares[0].x, simulation.squares[0].y = 20, 20
+    simulation.beetle.speed = speed
+
+    for _ in range(STEPS):
+        step(simulation, 0.95, 0.95, 0)
+        if simulation.end_game:
+            return True
+    return False
+
+
+def run_teleport_drag(collision_masks):
+    """ Курсор перескакивает с блоком через врага за один кадр трекера """
+    simulation = make_simulation(collision_masks)
+    simulation.beetle.set_target(None)
+    simulation.beetle.x, simulation.beetle.y = 375, 400
+    block = simulation.squares[0]
+    block.x, block.y = 60, 380
+
+    step(simulation, 100 / 800, 420 / 800, 1)  # Захват блока
+    step(simulation, 700 / 800, 420 / 800, 1)  # Прыжок курсора
+    return simulation.swept_hits > 0 and block.x + block.size < 700
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Стресс-тест непрерывной проверки столкновений")
+    parser.add_argument('--box-collisions', action='store_false', dest='collision_masks',
+                        help="столкновения по прямоугольникам вместо масок текстур")
+    args = parser.parse_args()
+    failures = 0
+
+    print(f"{'speed':>6} {'tunnels':>8} {'swept hits':>11} {'us/step':>9} {'game over':>10}")
+    costs = []
+    series = blocked_enemy_series(args.collision_masks)
+    for speed in SPEEDS:
+        tunnels, hits, per_step = series[speed]
+        game_over = run_free_enemy(speed, args.collision_masks)
+        costs.append(per_step)
+        print(f"{speed:>6} {tunnels:>8} {hits:>11} {per_step * 1e6:>9.1f} {str(game_over):>10}")
+        if tunnels or not game_over:
+            failures += 1
+
+    drag_ok = run_teleport_drag(args.collision_masks)
+    print(f"Teleport drag stopped by enemy: {drag_ok}")
+    if not drag_ok:
+        failures += 1
+
+    # Стоимость шага не должна расти со скоростью (нет подшагов) - только отчет
+    ratio = max(costs) / min(costs)
+    print(f"Per-step cost spread: x{ratio:.2f}")
+
+    print("OK" if not failures else f"FAILED: {failures}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+""" Сокращение обучающих данных: удаление почти одинаковых строк (KD-дерево)
+и сбалансированное ядро заданного размера против обучения на всех строках.
+
+Для каждого варианта - строк в обучении, время обучения, размер модели,
+задержка предсказания одного кадра и точность на одной и той же полной
+тестовой выборке. Без --data данные синтетические: серии соседних кадров
+одной позы, как при сборе с камеры.
+
+Запуск из корня проекта:
+    python -m Benchmarks.dataset_reduction
+    python -m Benchmarks.dataset_reduction --data data.pickle --radius 0.05 0.1 --coreset 100 200
+"""
+import argparse
+import pickle
+import sys
+import time
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import train_test_split
+
+from Processing.Coreset import reduce_dataset
+
+
+def synthetic_dataset(poses=40, run=50, seed=0):
+    """ Два жеста: у каждого poses поз, каждая - серия из run кадров
+    с дрожанием точек, как у кадров одной позы подряд """
+    rng = np.random.default_rng(seed)
+    data, labels = [], []
+    base = rng.random(42)
+    for label in ('0', '1'):
+        # Жесты пересекаются: центры поз близки, позы разбросаны
+        center = base + rng.normal(0, 0.03, 42)
+        for _ in range(poses):
+            pose = center + rng.normal(0, 0.4, 42)
+            drift = np.cumsum(rng.normal(0, 0.002, (run, 42)), axis=0)
+            data.append(pose + drift + rng.normal(0, 0.004, (run, 42)))
+            labels += [label] * run
+    return np.vstack(data), np.array(labels)
+
+
+def measure(x_train, y_train, x_test, y_test):
+    """ (время обучения, с; размер модели, КБ; предсказание кадра, мс; точность) """
+    model = RandomForestClassifier(random_state=0)
+    start = time.perf_counter()
+    model.fit(x_train, y_train)
+    train_time = time.perf_counter() - start
+    size = len(pickle.dumps({'model': model})) / 1024
+
+    sample = x_test[:1]
+    model.predict(sample)
+    times = []
+    for _ in range(100):
+        start = time.perf_counter()
+        model.predict(sample)
+        times.append(time.perf_counter() - start)
+    return train_time, size, np.median(times) * 1000, accuracy_score(y_test, model.predict(x_test))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Удаление дубликатов и ядро обучающих данных")
+    parser.add_argument('--data', help="data.pickle после разметки (иначе синтетика)")
+    parser.add_argument('--radius', type=float, nargs='+', default=[0.05, 0.1],
+                        help="радиусы удаления дубликатов")
+    parser.add_argument('--coreset', type=int, nargs='+', default=[200, 100],
+                        help="размеры ядра (после удаления дубликатов с первым радиусом)")
+    args = parser.parse_args()
+
+    if args.data:
+        with open(args.data, 'rb') as f:
+            data_dict = pickle.load(f)
+        data, labels = np.asarray(data_dict['data']), np.asarray(data_dict['labels'])
+    else:
+        data, labels = synthetic_dataset()
+
+    x_train, x_test, y_train, y_test = train_test_split(
+        data, labels, test_size=0.2, shuffle=True, stratify=labels, random_state=0
+    )
+
+    variants = [('all rows', 0.0, 0)]
+    variants += [(f'dedup r={radius:g}', radius, 0) for radius in args.radius]
+    variants += [(f'dedup r={args.radius[0]:g} + coreset {size}', args.radius[0], size)
+                 for size in args.coreset]
+
+    print(f"{len(data)} rows, test {len(x_test)} rows")
+    print(f"{'variant':28s} {'rows':>6s} {'reduce':>8s} {'train':>8s} {'model':>9s} "
+          f"{'predict':>9s} {'accuracy':>9s}")
+    for name, radius, size in variants:
+        start = time.perf_counter()
+        kept = reduce_dataset(x_train, y_train, radius, size)
+        reduce_time = time.perf_counter() - start
+        train_time, model_size, predict_ms, accuracy = measure(
+            x_train[kept], y_train[kept], x_test, y_test)
+        print(f"{name:28s} {len(kept):6d} {reduce_time:7.2f}s {train_time:7.2f}s "
+              f"{model_size:7.0f}KB {predict_ms:7.2f}ms {accuracy * 100:8.1f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
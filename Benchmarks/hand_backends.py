@@ -0,0 +1,179 @@
+""" Сравнение бэкендов поиска рук на записанных роликах:
+mediapipe.solutions.hands и HandLandmarker из MediaPipe Tasks (video и live_stream).
+
+Для каждого бэкенда: пропускная способность (кадров/с), задержка кадра
+(от подачи кадра до точек) и согласие точек с первым бэкендом списка:
+совпадение числа рук и среднее расстояние между точками в пикселях.
+
+Запуск из корня проекта (модель Tasks - Model/hand_landmarker.task или --model):
+    python -m Benchmarks.hand_backends clip.mp4 other.mp4
+    python -m Benchmarks.hand_backends clip.mp4 --backends solutions,tasks-video --max-hands 2
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from Settings import get_settings
+from Tracking.HandBackends import LANDMARKER_PATH, SolutionsHandBackend, TasksHandBackend
+from Tracking.HandFeatures import CENTER_LANDMARK
+
+BACKENDS = ('solutions', 'tasks-video', 'tasks-live')
+
+
+def read_clip(path, max_frames):
+    """ Кадры ролика в RGB (без отражения, как в трекере) и частота кадров """
+    cap = cv2.VideoCapture(path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30
+    frames = []
+    while len(frames) < max_frames:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+    cap.release()
+    return frames, fps
+
+
+def create(name, args):
+    if name == 'solutions':
+        return SolutionsHandBackend(args.max_hands, args.complexity)
+    return TasksHandBackend(args.max_hands, args.model,
+                            'live_stream' if name == 'tasks-live' else 'video')
+
+
+def run_sync(backend, frames, fps):
+    """ Кадр за кадром без пауз: (точки по кадрам, задержки, с, общее время, с) """
+    points, latencies = [], []
+    start = time.perf_counter()
+    for i, frame in enumerate(frames):
+        frame_start = time.perf_counter()
+        points.append(backend.detect(frame, i / fps))
+        latencies.append(time.perf_counter() - frame_start)
+    return points, latencies, time.perf_counter() - start
+
+
+def run_live(backend, frames, fps):
+    """ Кадры с частотой ролика, результаты приходят асинхронно.
+    Кадры, пропущенные графом, остаются без точек (None) """
+    submitted = {}
+    results = {}
+    done = threading.Event()
+    last_timestamp = []
+
+    def on_points(timestamp_ms, points):
+        results[timestamp_ms] = (points, time.perf_counter() - submitted[timestamp_ms])
+        if last_timestamp and timestamp_ms >= last_timestamp[0]:
+            done.set()
+
+    backend.listener = on_points
+    timestamps = []
+    start = time.perf_counter()
+    next_frame = time.monotonic()
+    for frame in frames:
+        delay = next_frame - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        next_frame += 1 / fps
+        submitted_at = time.perf_counter()
+        backend.detect(frame)
+        timestamps.append(backend.last_timestamp_ms)
+        submitted[backend.last_timestamp_ms] = submitted_at
+    last_timestamp.append(timestamps[-1])
+    done.wait(2.0)
+    elapsed = time.perf_counter() - start
+
+    points = [results[t][0] if t in results else None for t in timestamps]
+    latencies = [results[t][1] for t in timestamps if t in results]
+    return points, latencies, elapsed
+
+
+def agreement(reference, points, width, height):
+    """ Доля кадров с одинаковым числом рук и средняя ошибка точек, пиксели
+    (руки сопоставляются по ближайшему центру) """
+    same_count, errors = 0, []
+    compared = 0
+    for ref, other in zip(reference, points):
+        if ref is None or other is None:
+            continue
+        compared += 1
+        same_count += len(ref) == len(other)
+        for hand in ref:
+            if not len(other):
+                break
+            centers = other[:, CENTER_LANDMARK]
+            match = other[np.argmin(np.hypot(*(centers - hand[CENTER_LANDMARK]).T))]
+            errors.append(np.hypot((match[:, 0] - hand[:, 0]) * width,
+                                   (match[:, 1] - hand[:, 1]) * height).mean())
+    if not compared:
+        return None, None
+    return same_count / compared, (np.mean(errors) if errors else None)
+
+
+def main():
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Сравнение бэкендов поиска рук на роликах")
+    parser.add_argument('clips', nargs='+', help="записанные ролики")
+    parser.add_argument('--backends', default=','.join(BACKENDS),
+                        help="бэкенды через запятую, первый - эталон для согласия точек")
+    parser.add_argument('--max-hands', type=int, default=settings['max_hands'])
+    parser.add_argument('--complexity', type=int, default=settings['hand_model_complexity'],
+                        help="модель точек solutions: 0 или 1")
+    parser.add_argument('--model', default=settings['hand_landmarker_path'] or LANDMARKER_PATH,
+                        help="модель HandLandmarker (.task)")
+    parser.add_argument('--max-frames', type=int, default=600, help="кадров на ролик")
+    args = parser.parse_args()
+
+    names = [name for name in args.backends.split(',') if name]
+    unknown = [name for name in names if name not in BACKENDS]
+    if unknown:
+        parser.error(f"unknown backends: {', '.join(unknown)}")
+    if any(name.startswith('tasks') for name in names) and not os.path.exists(args.model):
+        print(f"HandLandmarker model not found: {args.model}, Tasks backends skipped")
+        names = [name for name in names if not name.startswith('tasks')]
+
+    compared = 0
+    for clip in args.clips:
+        frames, fps = read_clip(clip, args.max_frames)
+        if not frames:
+            print(f"{clip}: no frames")
+            continue
+        height, width = frames[0].shape[:2]
+        print(f"\n{clip}: {len(frames)} frames {width}x{height} @ {fps:g} fps")
+        print(f"  {'backend':12s} {'fps':>7s} {'p50':>7s} {'p90':>7s} {'hands':>6s} "
+              f"{'same n':>7s} {'err px':>7s}")
+
+        reference = None
+        for name in names:
+            backend = create(name, args)
+            try:
+                run = run_live if name == 'tasks-live' else run_sync
+                points, latencies, elapsed = run(backend, frames, fps)
+            finally:
+                backend.close()
+
+            results = [p for p in points if p is not None]
+            throughput = len(results) / elapsed
+            p50, p90 = (np.percentile(latencies, [50, 90]) * 1000 if latencies
+                        else (float('nan'), float('nan')))
+            with_hands = sum(1 for p in results if len(p)) / max(len(results), 1)
+
+            if reference is None:
+                reference = points
+                same, error = 1.0, 0.0
+            else:
+                same, error = agreement(reference, points, width, height)
+            same_text = '-' if same is None else f"{same:6.0%}"
+            error_text = '-' if error is None else f"{error:7.1f}"
+            print(f"  {name:12s} {throughput:7.1f} {p50:7.1f} {p90:7.1f} {with_hands:6.0%} "
+                  f"{same_text:>7s} {error_text:>7s}")
+        compared += len(names) >= 2
+    return 0 if compared else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+""" Цена второй руки в трекере: признаки и классификация жестов
+по руке отдельно (прежний путь) и всех рук одним вызовом модели.
+
+MediaPipe здесь не участвует - точки рук синтетические, модель настоящая.
+
+Запуск из корня проекта:
+    python -m Benchmarks.hand_batch --frames 2000
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from HandTrackerThread import load_gesture_model
+from Tracking.HandFeatures import hand_features
+
+
+def per_hand_features(points):
+    """ Прежний путь: списки Python и отдельный вектор на руку """
+    features = []
+    for hand in points:
+        x_, y_ = hand[:, 0].tolist(), hand[:, 1].tolist()
+        min_x, min_y, max_x, max_y = min(x_), min(y_), max(x_), max(y_)
+        data_aux = []
+        for x, y in zip(x_, y_):
+            data_aux.append((x - min_x) / (max_x - min_x))
+            data_aux.append((y - min_y) / (max_y - min_y))
+        features.append(data_aux)
+    return features
+
+
+def time_frames(frames, classify):
+    start = time.perf_counter()
+    for points in frames:
+        classify(points)
+    return (time.perf_counter() - start) / len(frames) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Цена второй руки: по руке или одним вызовом")
+    parser.add_argument('--frames', type=int, default=1000, help="кадров на замер")
+    args = parser.parse_args()
+
+    model = load_gesture_model()
+    rng = np.random.default_rng(0)
+
+    def per_hand(points):
+        return [model.predict([np.asarray(features)])[0] for features in per_hand_features(points)]
+
+    def batched(points):
+        return model.predict(hand_features(points))
+
+    # Признаки обоих путей должны совпадать
+    check = rng.random((2, 21, 2))
+    if not np.allclose(per_hand_features(check), hand_features(check)):
+        print("Features differ between per-hand and batched paths")
+        return 1
+
+    results = {}
+    for hands in (1, 2):
+        frames = [rng.random((hands, 21, 2)) for _ in range(args.frames)]
+        results[hands] = (time_frames(frames, per_hand), time_frames(frames, batched))
+        print(f"{hands} hand(s): per-hand {results[hands][0]:.3f} ms/frame, "
+              f"batched {results[hands][1]:.3f} ms/frame")
+
+    ratio = results[2][1] / results[1][1]
+    print(f"Second hand costs x{ratio:.2f} of one hand with batching "
+          f"(x{results[2][0] / results[1][0]:.2f} per hand)")
+    return 0 if ratio < 2 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+""" Замер задержки «стекло - курсор» без камеры.
+
+По умолчанию позиции руки берутся из журнала ввода (--log) или с синтетической
+траектории и идут тем же путем, что и от трекера: почтовый ящик результатов,
+опрос раз в кадр экрана, обновление виджета, отрисовка курсора. С --video весь
+конвейер (CameraService, MediaPipe, классификатор) работает на записанном ролике
+вместо камеры. --signals - для сравнения старая доставка очередью сигналов.
+Превью камеры идет с частотой --preview-fps, как у трекера; в конце - отчет
+о загрузке потока интерфейса курсором и превью.
+
+Запуск из корня проекта:
+    python -m Benchmarks.latency_probe --seconds 10
+    python -m Benchmarks.latency_probe --video clip.mp4
+    python -m Benchmarks.latency_probe --gui-load-ms 40   # медленный поток интерфейса
+    python -m Benchmarks.latency_probe --gui-load-ms 40 --signals
+    python -m Benchmarks.latency_probe --preview-fps 0    # превью на каждом кадре
+"""
+import argparse
+import math
+import sys
+import time
+
+import numpy as np
+from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal
+from PyQt5.QtGui import QImage, QPixmap
+from PyQt5.QtWidgets import QApplication, QLabel
+
+from Diagnostics.GuiLoad import GuiLoad
+from Diagnostics.LatencyProbe import LatencyProbe
+from Physics.InputLog import RECORD_STEP, read_input_log
+from Settings import get_settings
+from Tracking.TrackerResult import HandState, ResultMailbox, TrackerResult
+
+
+class ReplaySource(QThread):
+    """ Источник позиций вместо трекера: кадры с заданной частотой """
+
+    result_ready = pyqtSignal(object)  # Доставка очередью сигналов (--signals)
+
+    def __init__(self, positions, fps, use_signals=False):
+        super().__init__()
+        self.positions = positions
+        self.fps = fps
+        self.use_signals = use_signals
+        self.mailbox = ResultMailbox()
+        self.running = True
+
+        # Превью строит настоящий трекер из шумового «кадра камеры»
+        from HandTrackerThread import HandTrackerThread
+        self.tracker = HandTrackerThread()
+        self.tracker.set_preview_size(394, 394)
+        self.camera_image = np.random.default_rng(0).integers(0, 256, (480, 640, 3), dtype=np.uint8)
+
+    def run(self):
+        probe = LatencyProbe.instance()
+        next_frame = time.monotonic()
+        index = 0
+        while self.running:
+            delay = next_frame - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            next_frame += 1 / self.fps
+
+            x, y, gesture = self.positions[index % len(self.positions)]
+            index += 1
+            captured = time.monotonic()
+            probe.mark(captured, 'tracked', captured)  # Распознавания нет
+            hands = (HandState(0, x, y, gesture),)
+            preview = None
+            if self.tracker.preview_due():
+                preview = self.tracker.make_preview(self.camera_image, hands)
+            result = TrackerResult(index, captured, True, x, y, gesture, preview, hands)
+            if self.use_signals:
+                self.result_ready.emit(result)
+            else:
+                self.mailbox.post(result)
+
+    def stop(self):
+        self.running = False
+        self.wait(1000)
+
+
+def synthetic_positions(count=300):
+    """ Курсор по кругу, каждые 2 секунды - кулак """
+    return [(0.5 + 0.3 * math.cos(i / count * 2 * math.pi),
+             0.5 + 0.3 * math.sin(i / count * 2 * math.pi),
+             int(i % 60 >= 45)) for i in range(count)]
+
+
+def log_positions(path):
+    _, records = read_input_log(path)
+    return [(record[2], record[3], record[4]) for record in records if record[0] == RECORD_STEP]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Замер задержки от кадра до курсора без камеры")
+    parser.add_argument('--seconds', type=float, default=10, help="длительность замера")
+    parser.add_argument('--fps', type=float, default=30, help="частота кадров источника")
+    parser.add_argument('--log', help="журнал ввода (Physics.InputLog) как источник позиций")
+    parser.add_argument('--video', help="ролик вместо камеры: полный конвейер трекера")
+    parser.add_argument('--gui-load-ms', type=float, default=0,
+                        help="имитация работы потока интерфейса на каждый кадр, мс")
+    parser.add_argument('--signals', action='store_true',
+                        help="доставка каждого результата сигналом вместо почтового ящика")
+    parser.add_argument('--preview-fps', type=float, default=get_settings()['preview_fps'],
+                        help="частота превью камеры (0 - на каждом кадре)")
+    parser.add_argument('--canvas', choices=('raster', 'opengl'), default='raster')
+    args, qt_args = parser.parse_known_args()
+    get_settings()['preview_fps'] = args.preview_fps
+
+    app = QApplication(sys.argv[:1] + qt_args)
+
+    # Импорт после QApplication: виджеты создают пиксмапы при загрузке текстур
+    from HandCursorWidget import HandCursorWidget
+
+    probe = LatencyProbe.instance()
+    probe.enabled = True
+
+    load = GuiLoad.instance()
+    load.enabled = True
+    load.set_mode('active')
+
+    widget = HandCursorWidget(canvas=args.canvas)
+    widget.setFixedSize(800, 800)
+    widget.game_paused = False
+    widget.show()
+    camera_widget = QLabel()
+    camera_widget.setFixedSize(394, 394)
+    camera_widget.show()
+
+    def on_result(result):
+        """ То же, что MainWindow.poll_tracker для позиции курсора и превью """
+        if result is None:
+            return
+        if result.hand_detected:
+            with load.measure('cursor'):
+                probe.mark(result.captured, 'received')
+                if args.gui_load_ms:
+                    end = time.perf_counter() + args.gui_load_ms / 1000
+                    while time.perf_counter() < end:
+                        pass
+                widget.update_cursor_position(result.x, result.y, result.gesture,
+                                              result.captured, result.hands)
+        if result.frame is not None:
+            with load.measure('preview'):
+                h, w, ch = result.frame.shape
+                image = QImage(result.frame.data, w, h, ch * w, QImage.Format_BGR888)
+                camera_widget.setPixmap(QPixmap.fromImage(image))
+
+    if args.video:
+        from Camera.CameraService import CameraService
+        from HandTrackerThread import HandTrackerThread, POWER_ACTIVE
+
+        CameraService._instance = CameraService(args.video)
+        source = HandTrackerThread()
+        source.set_power_state(POWER_ACTIVE)
+    else:
+        positions = log_positions(args.log) if args.log else synthetic_positions()
+        source = ReplaySource(positions, args.fps, args.signals)
+
+    if args.signals and not args.video:
+        source.result_ready.connect(on_result)
+    else:
+        # Опрос раз в кадр экрана, как в MainWindow
+        refresh_rate = app.primaryScreen().refreshRate() or 60
+        poll_timer = QTimer()
+        poll_timer.setTimerType(Qt.PreciseTimer)
+        poll_timer.setInterval(max(1, int(1000 / refresh_rate)))
+        poll_timer.timeout.connect(lambda: on_result(source.mailbox.take()))
+        poll_timer.start()
+
+    # Кадры до прогрева не учитываем
+    QTimer.singleShot(1000, probe.reset)
+    QTimer.singleShot(1000, load.reset)
+    QTimer.singleShot(int((args.seconds + 1) * 1000), app.quit)
+    source.start()
+    app.exec_()
+    source.stop()
+
+    if args.video:
+        CameraService.instance().close()
+    print(probe.report())
+    print(load.report())
+    if not (args.signals and not args.video):
+        print(f"Mailbox: {source.mailbox.posted} posted, "
+              f"{source.mailbox.overwritten} overwritten before the GUI read them")
+    return 0 if probe.samples else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+""" Цена кадра превью камеры: прежний путь (отражение всего кадра, пиксельный
+эффект в полном размере, сглаженное масштабирование в окне) против превью,
+построенного трекером сразу в размере показа с отражением точек рук.
+
+Запуск из корня проекта:
+    python -m Benchmarks.preview_pipeline --frames 500 --size 1280x720
+"""
+import argparse
+import sys
+import time
+
+import cv2
+import numpy as np
+from PyQt5.QtCore import QSize, Qt
+from PyQt5.QtGui import QImage
+
+from HandTrackerThread import HandTrackerThread
+
+PREVIEW_AREA = (394, 394)  # Виджет камеры без рамки
+
+
+def old_path(frame, pixel_size):
+    """ Прежний путь: кадр для трекера и превью, масштабированное в окне """
+    mirrored = cv2.flip(frame, 1)
+    rgb = cv2.cvtColor(mirrored, cv2.COLOR_BGR2RGB)
+    small = cv2.resize(mirrored, (frame.shape[1] // pixel_size, frame.shape[0] // pixel_size),
+                       interpolation=cv2.INTER_NEAREST)
+    preview = cv2.resize(small, (frame.shape[1], frame.shape[0]), interpolation=cv2.INTER_NEAREST)
+    h, w, ch = preview.shape
+    image = QImage(preview.data, w, h, ch * w, QImage.Format_BGR888)
+    image.scaled(QSize(*PREVIEW_AREA), Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    return rgb
+
+
+def new_path(tracker, frame):
+    """ Новый путь: кадр без отражения для трекера, превью в размере показа """
+    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    preview = tracker.pixelate(frame)
+    h, w, ch = preview.shape
+    QImage(preview.data, w, h, ch * w, QImage.Format_BGR888)
+    return rgb
+
+
+def time_path(frames, function):
+    start = time.perf_counter()
+    for frame in frames:
+        function(frame)
+    return (time.perf_counter() - start) / len(frames) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Цена кадра превью камеры")
+    parser.add_argument('--frames', type=int, default=300, help="кадров на замер")
+    parser.add_argument('--size', default='640x480', help="размер кадра камеры")
+    args = parser.parse_args()
+
+    width, height = (int(value) for value in args.size.lower().split('x'))
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 256, (height, width, 3), dtype=np.uint8) for _ in range(8)]
+    frames = [frames[i % len(frames)] for i in range(args.frames)]
+
+    tracker = HandTrackerThread()
+    tracker.set_preview_size(*PREVIEW_AREA)
+    pixel_size = tracker.pixel_size
+
+    old = time_path(frames, lambda frame: old_path(frame, pixel_size))
+    new = time_path(frames, lambda frame: new_path(tracker, frame))
+    # Без перевода в RGB для MediaPipe - он нужен в обоих путях
+    convert = time_path(frames, lambda frame: cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+
+    preview = tracker.pixelate(frames[0])
+    print(f"{width}x{height} frames, preview {preview.shape[1]}x{preview.shape[0]}, "
+          f"pixel size {pixel_size}")
+    print(f"  old path: {old:6.2f} ms/frame ({old - convert:6.2f} ms without RGB conversion)")
+    print(f"  new path: {new:6.2f} ms/frame ({new - convert:6.2f} ms without RGB conversion)")
+    print(f"  preview work x{(old - convert) / max(new - convert, 1e-6):.1f} less")
+    return 0 if new < old else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
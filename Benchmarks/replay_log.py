@@ -0,0 +1,60 @@
+""" Воспроизведение журналов ввода без графики: проверка повторяемости и профиль.
+
+Запись журнала: python main.py --record-input Files/InputLogs
+Запуск из корня проекта:
+    python -m Benchmarks.replay_log Files/InputLogs/input_*.bin --profile
+"""
+import argparse
+import cProfile
+import pstats
+import sys
+import time
+
+from Physics.InputLog import read_input_log, replay
+
+
+def replay_file(path, profile):
+    """ Воспроизведение одного журнала со сводкой; True, если хэш совпал """
+    profiler = cProfile.Profile() if profile else None
+    start = time.perf_counter()
+    try:
+        header, records = read_input_log(path)
+        if profiler is not None:
+            profiler.enable()
+        simulation, matched = replay(path)
+    except (OSError, ValueError) as e:
+        # Непрочитанный журнал не прерывает проверку остальных
+        print(f"\n== {path} ==\n  error:    {e}")
+        return False
+    finally:
+        if profiler is not None:
+            profiler.disable()
+    elapsed = time.perf_counter() - start
+
+    game_time = simulation.game_time  # Сумма записанных длительностей шагов
+    print(f"\n== {path} ==")
+    print(f"  seed {header['seed']}, field {header['width']}x{header['height']}, "
+          f"{len(records)} records")
+    print(f"  ticks:    {simulation.tick} ({game_time:.1f} s of game time, "
+          f"{simulation.active_time:.1f} s active)")
+    print(f"  replay:   {simulation.tick / max(elapsed, 1e-9):,.0f} ticks/s, "
+          f"{game_time / max(elapsed, 1e-9):,.0f}x real time")
+    print(f"  state:    {'OK' if matched else 'MISMATCH' if matched is False else 'no end record'}")
+
+    if profiler is not None:
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(15)
+    return matched is not False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Воспроизведение журналов ввода")
+    parser.add_argument('logs', nargs='+', help="файлы журналов")
+    parser.add_argument('--profile', action='store_true', help="профиль cProfile по каждому журналу")
+    args = parser.parse_args()
+
+    ok = all([replay_file(path, args.profile) for path in args.logs])
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
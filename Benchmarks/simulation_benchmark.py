@@ -0,0 +1,168 @@
+""" Бенчмарк игровой логики без графики: много партий параллельно.
+
+Запуск из корня проекта:
+    python -m Benchmarks.simulation_benchmark --games 64 --workers 4
+"""
+import argparse
+import math
+import statistics
+import sys
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+from Physics.GameSimulation import GameSimulation
+
+
+def idle_policy(simulation, rng, state):
+    """ Рука открыта и стоит в углу: враги летят без помех """
+    return 0.95, 0.95, 0
+
+
+def random_policy(simulation, rng, state):
+    """ Случайное блуждание курсора с редкими скачками и сменой жеста """
+    x, y = state.get('cursor', (0.5, 0.5))
+    if rng.random() < 0.05:
+        x, y = rng.random(), rng.random()  # Скачок между редкими кадрами
+    else:
+        x = min(1.0, max(0.0, x + rng.normal(0, 0.02)))
+        y = min(1.0, max(0.0, y + rng.normal(0, 0.02)))
+    if rng.random() < 0.05:
+        state['gesture'] = 1 - state.get('gesture', 0)
+    state['cursor'] = x, y
+    return x, y, state.get('gesture', 0)
+
+
+def defender_policy(simulation, rng, state):
+    """ Хватает ближайшего к цели врага и оттаскивает его в дальний угол """
+    width, height = simulation.width, simulation.height
+    x, y = state.get('cursor', (0.5, 0.5))
+    max_move = 40 / width  # Скорость руки - не больше 40 пикселей за кадр
+
+    target_x, target_y = simulation.orange_circle.get_center()
+    dragging = simulation.dragging_square
+    if dragging is not None:
+        # Тащим врага в угол, дальний от цели
+        goal = (0.95 if target_x < width / 2 else 0.05,
+                0.95 if target_y < height / 2 else 0.05)
+        gesture = 1
+        if abs(goal[0] - x) < 0.02 and abs(goal[1] - y) < 0.02:
+            gesture = 0
+    else:
+        enemy = min(simulation.enemies,
+                    key=lambda e: (e.get_center()[0] - target_x) ** 2 +
+                                  (e.get_center()[1] - target_y) ** 2)
+        enemy_x, enemy_y = enemy.get_center()
+        goal = (enemy_x / width, enemy_y / height)
+        gesture = 1 if enemy.contains_point(x * width, y * height) else 0
+
+    dx = max(-max_move, min(max_move, goal[0] - x))
+    dy = max(-max_move, min(max_move, goal[1] - y))
+    state['cursor'] = x + dx, y + dy
+    return x + dx, y + dy, gesture
+
+
+POLICIES = {
+    'idle': idle_policy,
+    'random': random_policy,
+    'defender': defender_policy,
+}
+
+
+def run_game(args):
+    """ Одна партия до конца игры или до max_steps шагов """
+    policy_name, seed, max_steps, collision_masks = args
+    policy = POLICIES[policy_name]
+    rng = np.random.default_rng(seed)
+    # Партия повторяется по зерну
+    simulation = GameSimulation(800, 800, seed=seed, collision_masks=collision_masks)
+    state = {}
+
+    start = time.perf_counter()
+    while simulation.tick < max_steps and not simulation.end_game:
+        x, y, gesture = policy(simulation, rng, state)
+        simulation.step(x, y, gesture)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'steps': simulation.tick,
+        'elapsed': elapsed,
+        'collisions': simulation.collisions,
+        'swept_hits': simulation.swept_hits,
+        'survival': simulation.active_time,
+        'ended': simulation.end_game,
+        'speed': simulation.speed,
+    }
+
+
+PACE_RATES = (15, 30)  # Частоты кадров трекера для проверки темпа игры, Гц
+PACE_SECONDS = 5.0     # Игрового времени на проверку - враги еще не дошли до цели
+PACE_TOLERANCE = 0.02  # Допустимое расхождение пути врагов между частотами
+
+
+def enemy_travel(rate, seconds=PACE_SECONDS, collision_masks=True):
+    """ Путь врагов за секунду игры при кадрах трекера с частотой rate """
+    simulation = GameSimulation(800, 800, seed=0, collision_masks=collision_masks)
+    travel = 0.0
+    for _ in range(round(seconds * rate)):
+        starts = [(enemy.x, enemy.y) for enemy in simulation.enemies]
+        simulation.step(0.95, 0.95, 0, 1 / rate)
+        travel += sum(math.hypot(enemy.x - x, enemy.y - y)
+                      for enemy, (x, y) in zip(simulation.enemies, starts))
+    return travel / simulation.game_time
+
+
+def check_pace(collision_masks=True):
+    """ Темп игры не зависит от частоты кадров: путь врагов за секунду
+    игры одинаков при 15 и 30 кадрах трекера в секунду """
+    travels = {rate: enemy_travel(rate, collision_masks=collision_masks) for rate in PACE_RATES}
+    spread = max(travels.values()) / min(travels.values()) - 1
+    ok = spread <= PACE_TOLERANCE
+    print("== pace ==")
+    for rate, travel in travels.items():
+        print(f"  {rate:>2} Hz: enemies travel {travel:.1f} px per game second")
+    print(f"  spread {spread * 100:.2f}% (limit {PACE_TOLERANCE * 100:.0f}%): {'OK' if ok else 'FAIL'}")
+    return ok
+
+
+def report(policy_name, results, wall_time):
+    """ Сводка по партиям одной стратегии """
+    steps = sum(r['steps'] for r in results)
+    busy = sum(r['elapsed'] for r in results)
+    survival = [r['survival'] for r in results]
+    print(f"\n== {policy_name}: {len(results)} games ==")
+    print(f"  steps/s per process: {steps / busy:,.0f}")
+    print(f"  steps/s total:       {steps / wall_time:,.0f}")
+    print(f"  collisions/game:     {statistics.mean(r['collisions'] for r in results):.1f}")
+    print(f"  swept hits/game:     {statistics.mean(r['swept_hits'] for r in results):.1f}")
+    print(f"  survival, s:         mean {statistics.mean(survival):.1f}, "
+          f"median {statistics.median(survival):.1f}, max {max(survival):.1f}")
+    print(f"  games lost:          {sum(r['ended'] for r in results)}/{len(results)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк игровой логики без графики")
+    parser.add_argument('--games', type=int, default=32, help="партий на стратегию")
+    parser.add_argument('--workers', type=int, default=None, help="процессов (по умолчанию - все ядра)")
+    parser.add_argument('--max-steps', type=int, default=20000, help="предел шагов на партию")
+    parser.add_argument('--policy', choices=sorted(POLICIES), action='append',
+                        help="стратегия курсора (можно несколько раз)")
+    parser.add_argument('--seed', type=int, default=0, help="начальное зерно")
+    parser.add_argument('--box-collisions', action='store_false', dest='collision_masks',
+                        help="столкновения по прямоугольникам вместо масок текстур")
+    args = parser.parse_args()
+
+    ok = check_pace(args.collision_masks)
+    with Pool(args.workers) as pool:
+        for policy_name in args.policy or sorted(POLICIES):
+            jobs = [(policy_name, args.seed + i, args.max_steps, args.collision_masks)
+                    for i in range(args.games)]
+            start = time.perf_counter()
+            results = pool.map(run_game, jobs)
+            report(policy_name, results, time.perf_counter() - start)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+""" Профиль запуска: время до первого окна и до первого распознанного кадра.
+
+Запускает main.py --startup-profile несколько раз и выводит медианы,
+с --importtime - самые долгие импорты при загрузке main.
+
+Запуск из корня проекта:
+    python -m Benchmarks.startup_profile --runs 5 --camera clip.mp4
+"""
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+
+LINE = re.compile(r'startup: first_window=(\d+) first_tracked=(\d+|none) warmup: (.*)')
+
+
+def run_once(camera):
+    """ Один запуск приложения: (мс до окна, мс до кадра или None, прогрев) """
+    command = [sys.executable, 'main.py', '--startup-profile']
+    if camera:
+        command += ['--camera', camera]
+    output = subprocess.run(command, capture_output=True, text=True, timeout=120).stdout
+
+    match = LINE.search(output)
+    if match is None:
+        return None
+    first_window, first_tracked, warmup = match.groups()
+    return (int(first_window), None if first_tracked == 'none' else int(first_tracked), warmup)
+
+
+def import_profile(top):
+    """ Самые долгие импорты main (накопительное время, мс) """
+    output = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import main'],
+                            capture_output=True, text=True).stderr
+    rows = []
+    for line in output.splitlines():
+        parts = line.split('|')
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            rows.append((int(parts[1]) / 1000, parts[2].rstrip()))
+    print(f"\nImport time of main (cumulative, top {top}):")
+    for cumulative, name in sorted(rows, reverse=True)[:top]:
+        print(f"  {cumulative:8.1f} ms {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Профиль запуска приложения")
+    parser.add_argument('--runs', type=int, default=3, help="число запусков")
+    parser.add_argument('--camera', help="номер камеры или видеофайл")
+    parser.add_argument('--importtime', action='store_true', help="профиль импортов main")
+    parser.add_argument('--top', type=int, default=15, help="строк профиля импортов")
+    args = parser.parse_args()
+
+    results = []
+    for i in range(args.runs):
+        result = run_once(args.camera)
+        if result is None:
+            print(f"run {i + 1}: no startup report")
+            continue
+        first_window, first_tracked, warmup = result
+        print(f"run {i + 1}: first window {first_window} ms, "
+              f"first tracked frame {first_tracked if first_tracked is not None else '-'} ms, "
+              f"warmup {warmup}")
+        results.append(result)
+
+    if results:
+        print(f"\nmedian first window:        {statistics.median(r[0] for r in results):.0f} ms")
+        tracked = [r[1] for r in results if r[1] is not None]
+        if tracked:
+            print(f"median first tracked frame: {statistics.median(tracked):.0f} ms")
+
+    if args.importtime:
+        import_profile(args.top)
+    return 0 if results else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
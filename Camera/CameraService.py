@@ -0,0 +1,222 @@
+import threading
+import time
+from collections import namedtuple
+
+import cv2
+
+from Camera.CaptureConfig import open_capture
+from Diagnostics.Log import get_logger
+from Settings import get_settings
+
+log = get_logger('camera')
+
+# Кадр камеры: изображение BGR (только для чтения - общее для всех подписчиков),
+# время захвата по time.monotonic() и порядковый номер
+CameraFrame = namedtuple('CameraFrame', ['image', 'timestamp', 'index'])
+
+
+class CameraSubscription:
+    """ Подписка на кадры камеры: хранится только последний кадр,
+    медленный подписчик пропускает кадры, а не копит очередь """
+
+    def __init__(self, service, name):
+        self.service = service
+        self.name = name
+        self.closed = False
+        self.interval = 0.0   # Минимальный интервал между кадрами, с (0 - каждый кадр)
+        self.next_time = 0.0  # Время, с которого подписчику нужен следующий кадр
+        self._condition = threading.Condition()
+        self._frame = None
+        self._last_index = -1
+
+    def set_rate(self, fps):
+        """ Нужная подписчику частота кадров (0 - каждый кадр камеры).
+        Кадр, не нужный ни одному подписчику, поток захвата не декодирует """
+        interval = 1 / fps if fps > 0 else 0.0
+        with self._condition:
+            if interval != self.interval:
+                self.interval = interval
+                self.next_time = 0.0  # Новая частота - со следующего кадра
+
+    def due(self, now):
+        """ Нужен ли подписчику кадр, захваченный сейчас """
+        return now >= self.next_time
+
+    def publish(self, frame):
+        """ Новый кадр от потока захвата """
+        with self._condition:
+            if frame.timestamp - self.next_time >= self.interval:
+                self.next_time = frame.timestamp  # После пропуска - без накопленного долга
+            self.next_time += self.interval
+            self._frame = frame
+            self._condition.notify_all()
+
+    def read(self, timeout=1.0):
+        """ Следующий еще не прочитанный кадр (None по таймауту или после отписки) """
+        with self._condition:
+            ready = self._condition.wait_for(
+                lambda: self.closed or (self._frame is not None and
+                                        self._frame.index > self._last_index),
+                timeout
+            )
+            if not ready or self.closed:
+                return None
+            self._last_index = self._frame.index
+            return self._frame
+
+    def close(self):
+        """ Отписка от камеры (устройство остается открытым) """
+        self.service.unsubscribe(self)
+
+    def mark_closed(self):
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+
+
+class CameraService:
+    """ Единственный владелец камеры: устройство открывается один раз
+    и остается открытым, кадры раздаются подписчикам
+    (трекер игры, сбор данных, тест модели) """
+
+    _instance = None
+
+    def __init__(self, device=None):
+        """ device - номер камеры или путь к видеофайлу (кадры файла
+        выдаются с его частотой по кругу - для замеров без камеры) """
+        self.device = get_settings()['camera_device'] if device is None else device
+        self.is_file = isinstance(self.device, str)
+        self.cap = None
+        self.frames = 0               # Кадров декодировано с открытия
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._open_lock = threading.Lock()  # Открытие устройства - по одному за раз
+        self._thread = None
+
+    @classmethod
+    def instance(cls):
+        """ Общий экземпляр службы камеры """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def is_opened(self):
+        return self.cap is not None
+
+    def open(self):
+        """ Открытие устройства и запуск потока захвата (повторный вызов ничего не делает).
+        Подбор режима идет секунды - без блокировки _lock, чтобы не ждали
+        отписка, закрытие и подписчики уже открытой камеры """
+        with self._open_lock:
+            with self._lock:
+                if self.cap is not None:
+                    return True
+
+            # Режим захвата (формат, размер, частота, буфер) - см. CaptureConfig
+            cap = open_capture(self.device)
+            if not cap.isOpened():
+                cap.release()
+                log.error("Error: Could not open camera.")
+                return False
+
+            with self._lock:
+                self.cap = cap
+                self._thread = threading.Thread(target=self._capture_loop, args=(cap,),
+                                                name='CameraService', daemon=True)
+                self._thread.start()
+            return True
+
+    def subscribe(self, name):
+        """ Новая подписка на кадры (None, если камера не открылась) """
+        if not self.open():
+            return None
+        subscription = CameraSubscription(self, name)
+        with self._lock:
+            self._subscribers.append(subscription)
+            self._wake.notify_all()
+        log.info("Camera subscriber added: %s", name)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+                log.info("Camera subscriber removed: %s", subscription.name)
+        subscription.mark_closed()
+
+    def close(self):
+        """ Остановка захвата и освобождение устройства (при выходе из приложения).
+        Устройство освобождает сам поток захвата после последнего чтения:
+        освобождение во время cap.read() (зависшая камера) роняет OpenCV """
+        with self._lock:
+            self.cap = None
+            thread, self._thread = self._thread, None
+            subscribers, self._subscribers = self._subscribers, []
+            self._wake.notify_all()
+        for subscription in subscribers:
+            subscription.mark_closed()
+
+        if thread is not None:
+            thread.join(1.0)
+            if thread.is_alive():
+                log.warning("Camera read is blocked, the device will be released when it returns")
+
+    def _capture_loop(self, cap):
+        """ Поток захвата устройства cap: после закрытия службы он же
+        освобождает устройство - уже после последнего чтения """
+        try:
+            self._capture_frames(cap)
+        finally:
+            cap.release()
+            log.info("Камера освобождена")
+
+    def _capture_frames(self, cap):
+        """ Чтение кадров, пока есть подписчики, до закрытия службы (self.cap
+        больше не cap). Декодируются только кадры, нужные хотя бы одному
+        подписчику (CameraSubscription.set_rate), остальные забираются
+        из драйвера без декодирования - в буфере не остаются старые кадры """
+        next_file_frame = time.monotonic()
+        while True:
+            with self._lock:
+                # Без подписчиков кадры не читаем, но устройство не закрываем
+                self._wake.wait_for(lambda: self._subscribers or self.cap is not cap)
+                if self.cap is not cap:
+                    return
+
+            if self.is_file:
+                # Видеофайл - в темпе его частоты кадров
+                next_file_frame = self._pace_file(cap, next_file_frame)
+
+            with self._lock:
+                now = time.monotonic()
+                subscribers = [subscription for subscription in self._subscribers
+                               if subscription.due(now)]
+
+            if subscribers:
+                ok, image = cap.read()
+            else:
+                ok, image = cap.grab(), None
+            if not ok:
+                if self.is_file:
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)  # С начала по кругу
+                time.sleep(0.01)
+                continue
+            if image is None:
+                continue
+
+            image.flags.writeable = False
+            frame = CameraFrame(image, time.monotonic(), self.frames)
+            self.frames += 1
+
+            for subscription in subscribers:
+                subscription.publish(frame)
+
+    @staticmethod
+    def _pace_file(cap, next_frame):
+        """ Ожидание момента следующего кадра файла """
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30
+        delay = next_frame - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        return max(next_frame, time.monotonic() - 1 / fps) + 1 / fps
@@ -0,0 +1,212 @@
+import json
+import os
+import sys
+import time
+from collections import namedtuple
+
+import cv2
+
+from Diagnostics.Log import get_logger
+from Settings import get_settings
+
+log = get_logger('camera')
+
+CACHE_PATH = os.path.join('Files', 'camera_modes.json')
+
+# Режим захвата: формат пикселей (FOURCC), размер кадра, частота
+CaptureMode = namedtuple('CaptureMode', ['fourcc', 'width', 'height', 'fps'])
+
+# Кандидаты для автоподбора: MJPG сжимается в камере и проходит по USB
+# на большей частоте, YUYV не требует декодирования
+CANDIDATE_MODES = [
+    CaptureMode(fourcc, width, height, fps)
+    for fourcc in ('MJPG', 'YUYV')
+    for width, height in ((320, 240), (640, 480), (1280, 720))
+    for fps in (60, 30)
+]
+
+BENCHMARK_FRAMES = 30  # Кадров на замер одного режима
+
+
+def parse_mode(text):
+    """ Режим из строки вида 'MJPG 640x480@30' """
+    fourcc, size = text.split()
+    resolution, fps = size.split('@')
+    width, height = resolution.lower().split('x')
+    return CaptureMode(fourcc.upper(), int(width), int(height), int(fps))
+
+
+def format_mode(mode):
+    return f"{mode.fourcc} {mode.width}x{mode.height}@{mode.fps:g}"
+
+
+def capture_backend():
+    """ API захвата: V4L2 на Linux (поддерживает FOURCC и размер буфера) """
+    backend = get_settings()['camera_backend']
+    if backend == 'v4l2' or (backend == 'auto' and sys.platform.startswith('linux')):
+        return cv2.CAP_V4L2
+    return cv2.CAP_ANY
+
+
+def device_id(device):
+    """ Ключ устройства для кэша: имя камеры из V4L2, если оно доступно """
+    name_path = f'/sys/class/video4linux/video{device}/name'
+    try:
+        with open(name_path, 'r', encoding='utf-8') as f:
+            return f"{device}:{f.read().strip()}"
+    except (OSError, TypeError):
+        return str(device)
+
+
+def decode_fourcc(value):
+    value = int(value)
+    return ''.join(chr((value >> 8 * i) & 0xFF) for i in range(4))
+
+
+def apply_mode(cap, mode, buffer_size):
+    """ Запрос режима у драйвера. Возвращает режим, который драйвер
+    реально установил (может отличаться от запрошенного) """
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*mode.fourcc))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, mode.width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, mode.height)
+    cap.set(cv2.CAP_PROP_FPS, mode.fps)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, buffer_size)
+    return CaptureMode(
+        decode_fourcc(cap.get(cv2.CAP_PROP_FOURCC)),
+        int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        cap.get(cv2.CAP_PROP_FPS)
+    )
+
+
+def benchmark_mode(cap, frames=BENCHMARK_FRAMES):
+    """ Замер режима: (реальная частота кадров, среднее время декодирования, с).
+    None, если кадры не читаются """
+    # Первые кадры после смены режима часто приходят с задержкой
+    for _ in range(5):
+        if not cap.grab():
+            return None
+
+    decode_time = 0.0
+    start = time.perf_counter()
+    for _ in range(frames):
+        if not cap.grab():
+            return None
+        decode_start = time.perf_counter()
+        ok, _ = cap.retrieve()
+        decode_time += time.perf_counter() - decode_start
+        if not ok:
+            return None
+    elapsed = time.perf_counter() - start
+    return frames / elapsed, decode_time / frames
+
+
+def estimated_latency(fps, decode_time, buffer_size):
+    """ Оценка задержки кадра: ожидание в буфере драйвера,
+    половина интервала экспозиции и декодирование """
+    interval = 1 / fps
+    return (buffer_size - 1) * interval + interval / 2 + decode_time
+
+
+def negotiate_mode(cap, buffer_size, min_width, candidates=CANDIDATE_MODES, verbose=False):
+    """ Перебор режимов и выбор режима с наименьшей задержкой.
+    Режимы уже min_width не рассматриваются: на мелком кадре
+    MediaPipe теряет руку на краю поля. Замер каждого режима пишется
+    в журнал, с verbose - печатается таблицей (Benchmarks.camera_modes).
+    Возвращает (лучший режим или None, список (режим, fps, декодирование, задержка)) """
+    results = []
+    tried = set()
+    for candidate in candidates:
+        if candidate.width < min_width:
+            continue
+        actual = apply_mode(cap, candidate, buffer_size)
+        if actual in tried:
+            continue  # Драйвер подменил режим на уже проверенный
+        tried.add(actual)
+        if actual.width < min_width:
+            continue
+
+        measured = benchmark_mode(cap)
+        if measured is None:
+            continue
+        fps, decode_time = measured
+        latency = estimated_latency(fps, decode_time, buffer_size)
+        results.append((actual, fps, decode_time, latency))
+        if verbose:
+            print(f"  {format_mode(actual):22s} {fps:5.1f} fps, "
+                  f"decode {decode_time * 1000:5.1f} ms, latency ~{latency * 1000:5.1f} ms")
+        else:
+            # Свой ключ на режим - ограничитель частоты не схлопывает строки замера
+            log.info("Mode %s: %.1f fps, decode %.1f ms, latency ~%.1f ms",
+                     format_mode(actual), fps, decode_time * 1000, latency * 1000,
+                     extra={'key': ('camera mode', actual)})
+
+    if not results:
+        return None, results
+    best = min(results, key=lambda result: result[3])
+    return best[0], results
+
+
+def load_cache(path=CACHE_PATH):
+    try:
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+    except Exception as e:
+        log.error("Error loading camera mode cache: %s", e)
+    return {}
+
+
+def save_cache(cache, path=CACHE_PATH):
+    try:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, indent=4)
+    except Exception as e:
+        log.error("Error saving camera mode cache: %s", e)
+
+
+def open_capture(device, renegotiate=False):
+    """ Открытие камеры в настроенном режиме.
+    device - номер камеры или путь к видеофайлу.
+    camera_mode = 'auto': режим подбирается замером при первом запуске
+    и запоминается для устройства в Files/camera_modes.json """
+    if isinstance(device, str):
+        # Видеофайл вместо камеры (воспроизведение записанных роликов)
+        return cv2.VideoCapture(device)
+
+    settings = get_settings()
+    buffer_size = settings['camera_buffer_size']
+
+    cap = cv2.VideoCapture(device, capture_backend())
+    if not cap.isOpened():
+        return cap
+
+    mode_setting = settings['camera_mode']
+    if mode_setting == 'driver':
+        # Режим драйвера по умолчанию, только размер буфера
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, buffer_size)
+        return cap
+
+    if mode_setting != 'auto':
+        actual = apply_mode(cap, parse_mode(mode_setting), buffer_size)
+        log.info("Camera mode: %s", format_mode(actual))
+        return cap
+
+    cache = load_cache()
+    key = device_id(device)
+    if key in cache and not renegotiate:
+        actual = apply_mode(cap, parse_mode(cache[key]), buffer_size)
+        log.info("Camera mode (cached): %s", format_mode(actual))
+        return cap
+
+    log.info("Подбор режима камеры...")
+    best, _ = negotiate_mode(cap, buffer_size, settings['camera_min_width'])
+    if best is None:
+        log.warning("Camera mode negotiation failed, using driver defaults")
+        return cap
+
+    apply_mode(cap, best, buffer_size)
+    cache[key] = format_mode(best)
+    save_cache(cache)
+    log.info("Camera mode: %s", format_mode(best))
+    return cap
@@ -0,0 +1,72 @@
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+
+class GuiLoad:
+    """ Загрузка потока интерфейса работой по результатам трекера:
+    время задач (курсор, превью) по режимам трекера и доля от времени
+    в режиме. Отметки - time.perf_counter() """
+
+    _instance = None
+
+    def __init__(self):
+        self.enabled = False
+        self.mode = None
+        self.mode_started = time.perf_counter()
+        self.wall = defaultdict(float)   # режим -> время в режиме, с
+        self.busy = defaultdict(float)   # (режим, задача) -> время задачи, с
+        self.calls = defaultdict(int)    # (режим, задача) -> вызовов
+
+    @classmethod
+    def instance(cls):
+        """ Общий экземпляр замера загрузки """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def set_mode(self, mode):
+        """ Смена режима трекера: время до нее засчитывается прежнему режиму """
+        now = time.perf_counter()
+        if self.mode is not None:
+            self.wall[self.mode] += now - self.mode_started
+        self.mode, self.mode_started = mode, now
+
+    @contextmanager
+    def measure(self, task):
+        """ Замер задачи потока интерфейса в текущем режиме """
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            key = (self.mode, task)
+            self.busy[key] += time.perf_counter() - start
+            self.calls[key] += 1
+
+    def reset(self):
+        self.wall.clear()
+        self.busy.clear()
+        self.calls.clear()
+        self.mode_started = time.perf_counter()
+
+    def report(self):
+        """ Текстовый отчет: по режимам - мс на вызов и доля времени режима """
+        self.set_mode(self.mode)  # Засчитываем время текущего режима
+        if not self.calls:
+            return "GUI load: no samples"
+
+        lines = ["GUI load (tracker results on the GUI thread):"]
+        for mode, wall in self.wall.items():
+            tasks = [(task, self.busy[(m, task)], self.calls[(m, task)])
+                     for m, task in self.calls if m == mode]
+            if not tasks or wall <= 0:
+                continue
+            total = sum(busy for _, busy, _ in tasks)
+            lines.append(f"  {mode}: {wall:.1f} s, busy {total / wall:6.1%}")
+            for task, busy, calls in sorted(tasks):
+                lines.append(f"    {task:10s} {calls / wall:6.1f}/s {busy / calls * 1000:7.2f} ms "
+                             f"{busy / wall:6.1%}")
+        return '\n'.join(lines)
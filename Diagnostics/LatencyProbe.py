@@ -0,0 +1,105 @@
+import threading
+import time
+
+import numpy as np
+
+# Этапы пути кадра от камеры до курсора на экране
+STAGES = ('captured', 'tracked', 'received', 'painted')
+
+
+class LatencyProbe:
+    """ Замер задержки «стекло - курсор»: кадр метится временем захвата,
+    метка идет вместе с позицией руки через сигналы до отрисовки курсора.
+    Все отметки - time.monotonic() """
+
+    _instance = None
+
+    def __init__(self, max_pending=256):
+        self.enabled = False
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._pending = {}  # время захвата -> отметки этапов
+        self.samples = []   # законченные замеры: кортежи отметок по STAGES
+        self.dropped = 0    # кадры, чей курсор так и не был нарисован
+
+    @classmethod
+    def instance(cls):
+        """ Общий экземпляр замера задержки """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def mark(self, captured, stage, now=None):
+        """ Отметка этапа для кадра с временем захвата captured """
+        if not self.enabled or captured is None:
+            return
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            stamps = self._pending.get(captured)
+            if stamps is None:
+                if len(self._pending) >= self.max_pending:
+                    # Кадр, не дошедший до экрана (вытеснен более новым)
+                    self._pending.pop(next(iter(self._pending)))
+                    self.dropped += 1
+                stamps = self._pending[captured] = {'captured': captured}
+            stamps[stage] = now
+            if stage == STAGES[-1]:
+                del self._pending[captured]
+                self.samples.append(tuple(stamps.get(name) for name in STAGES))
+
+    def painted(self, captured):
+        """ Курсор кадра нарисован. Кадры, пропущенные между перерисовками,
+        считаются потерянными - курсор с их позицией на экран не попал """
+        if not self.enabled or captured is None:
+            return
+        self.mark(captured, 'painted')
+        with self._lock:
+            stale = [key for key in self._pending if key < captured]
+            for key in stale:
+                del self._pending[key]
+            self.dropped += len(stale)
+
+    def reset(self):
+        with self._lock:
+            self._pending.clear()
+            self.samples = []
+            self.dropped = 0
+
+    def stage_latencies(self):
+        """ Задержки в мс: словарь 'этап -> этап' и 'total' -> массив """
+        if not self.samples:
+            return {}
+        stamps = np.array([[np.nan if value is None else value for value in sample]
+                           for sample in self.samples])
+        result = {}
+        for i in range(1, len(STAGES)):
+            result[f'{STAGES[i - 1]} -> {STAGES[i]}'] = (stamps[:, i] - stamps[:, i - 1]) * 1000
+        result['total'] = (stamps[:, -1] - stamps[:, 0]) * 1000
+        return result
+
+    def report(self, bin_ms=5, max_ms=200):
+        """ Текстовый отчет: перцентили по этапам и гистограмма полной задержки """
+        latencies = self.stage_latencies()
+        if not latencies:
+            return "Latency probe: no samples"
+
+        lines = [f"Latency probe: {len(self.samples)} frames, {self.dropped} not painted"]
+        lines.append(f"  {'stage':24s} {'p50':>7s} {'p90':>7s} {'p99':>7s} {'max':>7s}  ms")
+        for name, values in latencies.items():
+            values = values[~np.isnan(values)]
+            if len(values) == 0:
+                continue
+            p50, p90, p99 = np.percentile(values, [50, 90, 99])
+            lines.append(f"  {name:24s} {p50:7.1f} {p90:7.1f} {p99:7.1f} {values.max():7.1f}")
+
+        total = latencies['total']
+        # Последний интервал - все, что дольше max_ms
+        counts, edges = np.histogram(np.minimum(total, max_ms),
+                                     bins=np.arange(0, max_ms + 2 * bin_ms, bin_ms))
+        width = 40 / max(counts.max(), 1)
+        lines.append("  total latency histogram:")
+        for count, edge in zip(counts, edges):
+            if count:
+                label = f">={edge:.0f}" if edge >= max_ms else f"{edge:.0f}-{edge + bin_ms:.0f}"
+                lines.append(f"  {label:>9s} ms {'#' * max(1, int(count * width)):40s} {count}")
+        return '\n'.join(lines)
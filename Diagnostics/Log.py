@@ -0,0 +1,190 @@
+import atexit
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+from collections import Counter
+
+from Settings import get_settings
+
+ROOT_LOGGER = 'hand_game'
+FORMAT = '%(asctime)s %(levelname)-7s %(name)s: %(message)s'
+MAX_KEYS = 1024  # Ключей в окнах ограничения (защита от сообщений без шаблона)
+
+_listener = None
+_lock = threading.Lock()
+
+
+class RateLimitFilter(logging.Filter):
+    """ Ограничение частоты по ключу сообщения: не больше burst записей
+    за interval секунд. Ключ - имя логгера и extra={'key': ...} или шаблон
+    сообщения (до подстановки аргументов), поэтому «Рука не обнаружена: %s»
+    для тысячи файлов - один ключ. Следующая пропущенная запись ключа
+    сообщает, сколько похожих было подавлено """
+
+    def __init__(self, burst=5, interval=10.0):
+        super().__init__()
+        self.burst = burst
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._windows = {}            # ключ -> (начало окна, записей в окне)
+        self._pending = Counter()     # ключ -> подавлено с последней пропущенной записи
+        self.suppressed = Counter()   # ключ -> подавлено всего
+
+    @staticmethod
+    def key(record):
+        return record.name, getattr(record, 'key', None) or record.msg
+
+    def filter(self, record):
+        key = self.key(record)
+        now = time.monotonic()
+        with self._lock:
+            start, count = self._windows.get(key, (now, 0))
+            if now - start >= self.interval:
+                start, count = now, 0
+            if count >= self.burst:
+                self._pending[key] += 1
+                self.suppressed[key] += 1
+                return False
+            if len(self._windows) >= MAX_KEYS and key not in self._windows:
+                self._windows.clear()
+            self._windows[key] = (start, count + 1)
+            skipped = self._pending.pop(key, 0)
+        if skipped:
+            record.suppressed = skipped
+        return True
+
+    def take_pending(self, prefix):
+        """ Подавленные записи логгеров prefix, о которых еще не сообщалось:
+        {ключ: число} """
+        with self._lock:
+            keys = [key for key in self._pending if is_child(key[0], prefix)]
+            return Counter({key: self._pending.pop(key) for key in keys})
+
+
+class SuppressedFormatter(logging.Formatter):
+    """ Формат с пометкой о подавленных похожих записях """
+
+    def format(self, record):
+        text = super().format(record)
+        suppressed = getattr(record, 'suppressed', 0)
+        if suppressed:
+            text += f" [{suppressed} similar suppressed]"
+        return text
+
+
+class SinkHandler(logging.Handler):
+    """ Раздача записей из фонового потока всем приемникам: консоль,
+    окна приложения (add_sink) """
+
+    def __init__(self):
+        super().__init__()
+        self.sinks = []
+
+    def emit(self, record):
+        flushed = getattr(record, 'flush_event', None)
+        if flushed is not None:
+            flushed.set()  # Все записи до метки уже разданы
+            return
+        for sink in list(self.sinks):
+            if record.levelno >= sink.level:
+                sink.handle(record)
+
+
+class CallbackHandler(logging.Handler):
+    """ Приемник записей логгера prefix: callback(текст) в фоновом потоке
+    логирования (для сигналов Qt) """
+
+    def __init__(self, callback, prefix=ROOT_LOGGER, level=logging.INFO):
+        super().__init__(level)
+        self.callback = callback
+        self.prefix = prefix
+        self.setFormatter(SuppressedFormatter('%(message)s'))
+
+    def emit(self, record):
+        if is_child(record.name, self.prefix):
+            self.callback(self.format(record))
+
+
+def is_child(name, prefix):
+    """ Логгер name - это prefix или его потомок """
+    return name == prefix or name.startswith(prefix + '.')
+
+
+def setup_logging():
+    """ Логирование приложения: ограничение частоты в вызывающем потоке,
+    очередь без блокировки и вывод в консоль из фонового потока """
+    global _listener
+    with _lock:
+        if _listener is not None:
+            return
+        settings = get_settings()
+        root = logging.getLogger(ROOT_LOGGER)
+        root.setLevel(settings['log_level'])
+        root.propagate = False
+
+        rate_limit = RateLimitFilter(settings['log_burst'], settings['log_interval'])
+        queue_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+        queue_handler.addFilter(rate_limit)
+        root.addHandler(queue_handler)
+
+        console = logging.StreamHandler()
+        console.setFormatter(SuppressedFormatter(FORMAT))
+        sink = SinkHandler()
+        sink.sinks.append(console)
+
+        _listener = logging.handlers.QueueListener(queue_handler.queue, sink)
+        _listener.rate_limit = rate_limit
+        _listener.sink = sink
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+
+def get_logger(name):
+    """ Логгер модуля приложения (например, 'tracker', 'processing') """
+    setup_logging()
+    return logging.getLogger(f'{ROOT_LOGGER}.{name}')
+
+
+def add_sink(handler):
+    setup_logging()
+    _listener.sink.sinks.append(handler)
+
+
+def remove_sink(handler):
+    if _listener is not None and handler in _listener.sink.sinks:
+        _listener.sink.sinks.remove(handler)
+
+
+def suppressed_counts():
+    """ Подавленные записи за все время: {ключ: число} """
+    return Counter() if _listener is None else Counter(_listener.rate_limit.suppressed)
+
+
+def report_suppressed(logger):
+    """ Итог по подавленным записям logger и его потомков, о которых
+    еще не сообщалось (например, в конце этапа обработки) """
+    if _listener is None:
+        return
+    for (name, template), count in _listener.rate_limit.take_pending(logger.name).items():
+        logging.getLogger(name).info("Suppressed %d more: %s", count, template,
+                                     extra={'key': ('suppressed', template)})
+
+
+def flush_logging(timeout=1.0):
+    """ Ожидание раздачи всех уже поставленных в очередь записей """
+    if _listener is None:
+        return
+    flushed = threading.Event()
+    _listener.queue.put_nowait(logging.makeLogRecord({'name': ROOT_LOGGER, 'flush_event': flushed}))
+    flushed.wait(timeout)
+
+
+def shutdown_logging():
+    """ Дописать очередь и остановить фоновый поток """
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
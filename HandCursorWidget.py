@@ -1,13 +1,37 @@
 import os
+import time
 
-import numpy as np
-from PyQt5.QtCore import Qt, QPoint, QTimer, pyqtSignal
-from PyQt5.QtGui import QPainter, QColor, QPen, QFont, QPixmap
+from PyQt5.QtCore import Qt, QPointF, QRectF, QSize, QTimer, pyqtSignal
+from PyQt5.QtGui import QPainter, QColor, QPen, QFont
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QApplication)
 
-from Objects.DraggableSquare import DraggableSquare
-from Objects.ObjectWithTarget import ObjectWithTarget
-from Objects.StaticCircle import StaticCircle
+from Diagnostics.LatencyProbe import LatencyProbe
+from Diagnostics.Log import get_logger
+from Physics.Difficulty import DifficultyCurve
+from Physics.GameSimulation import GameSimulation
+from Rendering.CursorTrail import CursorTrail
+from Rendering.ObjectPainter import draw_object, has_texture
+from Rendering.Particles import ParticleSystem
+from Rendering.Playfield import PlayfieldView
+from Rendering.Sprite import Sprite, texture_key
+from Rendering.TextureManager import TextureManager
+from Settings import get_settings
+
+log = get_logger('game')
+
+# Игровое поле в единицах мира: позиции, размеры и физика не зависят
+# от размера виджета и devicePixelRatio экрана
+WORLD_WIDTH = 800
+WORLD_HEIGHT = 800
+
+# Самый длинный шаг игры, с: после зависания трекера время не перескакивает
+MAX_STEP_SECONDS = 0.25
+
+# Цвет центра курсора по слоту руки (первая рука - белый, как раньше)
+CURSOR_CENTER_COLORS = (QColor(255, 255, 255), QColor(0, 200, 255))
+
+# Цвет поля без фоновой текстуры и полос вокруг поля
+FIELD_COLOR = QColor(0, 0, 51)
 
 class HandCursorWidget(QWidget):
     """ Виджет игрового поля """
@@ -15,97 +39,84 @@ class HandCursorWidget(QWidget):
     # Сигналы для взаимодействия с основным окном
     restart_requested = pyqtSignal() # Перезапуск игры
     game_ended = pyqtSignal() # Завершение игры
+    speed_changed = pyqtSignal(int) # Изменение скорости врагов
 
-    def __init__(self):
-        """ Инициализация виджета """
+    def __init__(self, canvas=None):
+        """ Инициализация виджета (canvas - raster или opengl) """
         super().__init__()
         self.setWindowTitle("Hand Cursor Controller")
         self.setStyleSheet("background-color: #000033; border: 2px solid #404040;")
-        self.setFixedSize(1000, 1000)
+        self.setMinimumSize(WORLD_WIDTH // 2, WORLD_HEIGHT // 2)
 
-        # Загрузка фонового изображения
+        # Отображение мира на виджет: текстуры масштабируются один раз
+        # на размер виджета и devicePixelRatio, а не на каждый кадр
+        self.view = PlayfieldView(WORLD_WIDTH, WORLD_HEIGHT)
+
+        # Фоновое изображение (текстура на все поле)
         texture_path = os.path.join('Images/space.png')
-        self.background = QPixmap(texture_path)
-        if self.background.isNull():
-            print("Фоновое изображение не найдено!")
-            self.background = QPixmap(self.size())
-            self.background.fill(QColor(0, 0, 51))
+        self.background_path = texture_path
+        if TextureManager.instance().source_image(texture_path) is None:
+            log.warning("Фоновое изображение не найдено!")
 
         # Параметры курсора
         self.cursor_pos = [0.5, 0.5]  # Нормализованная позиция курсора
         self.hand_detected = False    # Флаг обнаружения руки
         self.gesture = 0              # Текущий жест (0: ладонь, 1: кулак)
+        self.cursor_captured = None   # Время захвата кадра, давшего позицию курсора
+        self.hands = []               # Все руки кадра (слот, x, y, жест) - по курсору на руку
 
         # Параметры следа курсора
-        self.trail_positions = []     # Список позиций следа
-        self.trail_colors = []        # Цвета точек следа
+        settings = get_settings()
         self.is_trail = True          # Включение/отключение следа
-        self.trail_max_length = 20    # Максимальная длина следа
-
-        # Игровые объекты и состояние
-        self.dragging_square = None   # Перетаскиваемый объект
-        self.end_game = False         # Флаг завершения
+        self.trail = CursorTrail(     # Кольцевой буфер точек следа
+            length=settings['trail_length'],
+            fade_levels=settings['trail_fade_levels']
+        )
+
+        # Частицы эффектов: живут своим таймером, пока они есть,
+        # чтобы взрыв доигрывал и после остановки игры
+        self.particles = ParticleSystem(settings['particle_cap'])
+        self.particle_timer = QTimer(self)
+        self.particle_timer.setInterval(16)
+        self.particle_timer.timeout.connect(self.advance_particles)
+        self.particle_time = None     # Время предыдущего шага частиц (monotonic)
+
+        # Игровая логика (без Qt) и состояние виджета
+        self.simulation = GameSimulation(WORLD_WIDTH, WORLD_HEIGHT,
+                                         difficulty=DifficultyCurve.from_settings(settings),
+                                         collision_masks=settings['collision_masks'])
         self.end_game_timer = None    # Таймер перезапуска после завершения
         self.game_paused = True       # Флаг паузы
-        self.game_start_time = 0      # Время начала
         self.game_end = False         # Флаг окончания
+        self.input_log_pending = True # Начать журнал ввода на первом шаге партии
+        self.last_step_time = None    # Время кадра предыдущего шага (monotonic)
 
-        # Начальные позиции объектов
-        self.initial_positions = {
-            'blue_square': (200, 100),
-            'pink_square': (500, 100),
-            'circle': (400, 100),
-            'beetle': (500, 600),
-            'beetle2': (200, 600)
-        }
-
-        # Создание объектов
-        blue_pos = self.initial_positions['blue_square']
-        pink_pos = self.initial_positions['pink_square']
-        beetle_pos = self.initial_positions['beetle']
-        beetle2_pos = self.initial_positions['beetle2']
-        circle_pos = self.initial_positions['circle']
-
-        self.pink_square = DraggableSquare(pink_pos[0], pink_pos[1], 80, QColor(255, 105, 180))
-        self.beetle = ObjectWithTarget(beetle_pos[0], beetle_pos[1], 50, QColor(0, 255, 0))
-        self.beetle2 = ObjectWithTarget(beetle2_pos[0], beetle2_pos[1], 50, QColor(0, 255, 0))
-        self.orange_circle = StaticCircle(circle_pos[0], circle_pos[1], 70, QColor(255, 165, 0))
-
-        self.squares = [
-            DraggableSquare(blue_pos[0], blue_pos[1], 80, QColor(65, 105, 225)),
-            self.pink_square,
-            self.beetle,
-            self.beetle2
-        ]
-
-        # Настройка целей для движущихся объектов
-        self.beetle.set_target(self.orange_circle)
-        self.beetle2.set_target(self.orange_circle)
-
-        # Таймер
-        self.game_timer = QTimer()
         main_layout = QVBoxLayout()
+        main_layout.setContentsMargins(0, 0, 0, 0)
         self.setLayout(main_layout)
 
+        # Холст OpenGL (по умолчанию сцену рисует paintEvent через QPainter)
+        self.gl_canvas = None
+        if (canvas or get_settings()['canvas']) == 'opengl':
+            from Rendering.GLGameCanvas import GLGameCanvas
+            self.gl_canvas = GLGameCanvas(self, self)
+            main_layout.addWidget(self.gl_canvas)
+
     def reset_game(self):
         """ Сброс в начальное состояние"""
 
-        # Сброс позиций объектов
-        self.squares[0].x, self.squares[0].y = self.initial_positions['blue_square']
-        self.squares[1].x, self.squares[1].y = self.initial_positions['pink_square']
-        self.squares[2].x, self.squares[2].y = self.initial_positions['beetle']
-        self.orange_circle.x, self.orange_circle.y = self.initial_positions['circle']
-        self.beetle2.x, self.beetle2.y = self.initial_positions['beetle2']
-        self.orange_circle.reset_texture()
+        # Сброс объектов и скорости (новая партия - новое зерно)
+        self.simulation.reset()
+        self.speed_changed.emit(int(self.simulation.speed))
 
         # Сброс состояния
-        self.end_game = False
         self.game_end = False
-        self.dragging_square = None
+        self.input_log_pending = True
+        self.last_step_time = None
 
-        # Сброс следа курсора
-        self.trail_positions = []
-        self.trail_colors = []
+        # Сброс следа курсора и эффектов
+        self.trail.clear()
+        self.particles.clear()
 
         # Сброс позиции курсора
         self.cursor_pos = [0.5, 0.5]
@@ -113,273 +124,120 @@ class HandCursorWidget(QWidget):
         # Ставим игру на паузу после рестарта
         self.game_paused = True
 
-        self.update()
+        self.redraw()
+
+    def set_speed(self, speed):
+        """ Установка скорости врагов """
+        self.simulation.set_speed(speed)
 
+    def sizeHint(self):
+        """ Размер по умолчанию - мир один к одному """
+        return QSize(WORLD_WIDTH, WORLD_HEIGHT)
+
+    def resizeEvent(self, event):
+        """ Поле в мире не меняется - меняется только его отображение """
+        self.update_view()
+        super().resizeEvent(event)
+
+    def update_view(self):
+        """ Пересчет отображения под размер виджета и devicePixelRatio
+        (экран мог смениться без изменения размера) """
+        if self.view.update(self.width(), self.height(), self.devicePixelRatioF()):
+            # Текстуры прежнего размера не нужны - новые построятся по одному разу
+            TextureManager.instance().clear_scaled()
+            if self.gl_canvas is not None:
+                self.gl_canvas.reset_atlas()
 
     def set_hand_detected(self, detected):
         """ Обновление статуса обнаружения руки """
         if not detected:
             self.hand_detected = False
             # Сбрасываем перетаскивание при потере руки
-            if self.dragging_square is not None:
-                self.dragging_square.dragging = False
-                self.dragging_square = None
-
-    def update_cursor_position(self, x, y, gesture):
-        """ Обновление позиции курсора и взаимодействий """
-
-        # Всегда обновляем позицию курсора, даже на паузе
+            self.simulation.hand_lost()
+            # Время без руки в игре не идет
+            self.last_step_time = None
+
+    def start_input_log(self):
+        """ Журнал ввода партии для воспроизведения (если включен в настройках) """
+        log_dir = get_settings()['input_log_dir']
+        if not log_dir:
+            return
+        try:
+            os.makedirs(log_dir, exist_ok=True)
+            name = time.strftime('input_%Y%m%d_%H%M%S') + f'_{self.simulation.seed}.bin'
+            self.simulation.start_recording(os.path.join(log_dir, name))
+        except Exception as e:
+            log.error("Error starting input log: %s", e)
+
+    def update_cursor_position(self, x, y, gesture, captured=None, hands=None):
+        """ Обновление позиции курсора и взаимодействий
+        (captured - время захвата кадра для замера задержки,
+        hands - все руки кадра (слот, x, y, жест), если их несколько) """
+
+        # Всегда обновляем позиции курсоров, даже на паузе
         self.cursor_pos = [x, y]
+        self.cursor_captured = captured
         self.gesture = gesture
         self.hand_detected = True
+        self.hands = list(hands) if hands else [(0, x, y, gesture)]
 
         # Добавляем точку в след (если включен след)
         if self.is_trail:
-            color = QColor(255, 0, 0) if gesture == 0 else QColor(0, 255, 0)
-            self.trail_positions.append((x * self.width(), y * self.height()))
-            self.trail_colors.append(color)
-
-            if len(self.trail_positions) > self.trail_max_length:
-                self.trail_positions.pop(0)
-                self.trail_colors.pop(0)
+            self.trail.append(x, y, gesture)
 
         # Если игра на паузе или завершена - только обновляем курсор
-        if self.end_game or self.game_paused:
-            self.update()
+        if self.simulation.end_game or self.game_paused:
+            self.last_step_time = None
+            self.redraw()
             return
 
-        # Управление таймером
-        if gesture == 1:  # Кулак
-            if self.game_timer.isActive():
-                self.game_timer.stop()
-        else:
-            if not self.game_timer.isActive() and not self.game_paused:
-                self.game_timer.start(1000)  # 1 секунда
-
-        # Абсолютные координаты курсора
-        abs_x = x * self.width()
-        abs_y = y * self.height()
-
-        # Проверка столкновений и отталкивание квадратов
-        self.resolve_collisions()
-
-        # Перетаскивание объектов
-        if gesture == 1:  # Кулак (зажатие)
-            if self.dragging_square is not None:
-                # Продолжаем перетаскивание текущего квадрата
-                self.dragging_square.x = abs_x - self.dragging_square.size // 2
-                self.dragging_square.y = abs_y - self.dragging_square.size // 2
-
-                # Гарантируем, что перетаскиваемый квадрат остается в пределах
-                self.ensure_square_in_bounds(self.dragging_square)
-            else:
-                # Проверяем, находится ли курсор над каким-либо квадратом
-                for square in self.squares:
-                    if square.contains_point(abs_x, abs_y):
-                        # Начинаем перетаскивание этого квадрата
-                        self.dragging_square = square
-                        self.dragging_square.dragging = True
-                        # Центрируем квадрат относительно курсора
-                        self.dragging_square.x = abs_x - self.dragging_square.size // 2
-                        self.dragging_square.y = abs_y - self.dragging_square.size // 2
-                        break
-        else:  # Ладонь (разжатие)
-            if self.dragging_square is not None:
-                self.dragging_square.dragging = False
-                self.dragging_square = None
-
-        # Движение врагов при открытой ладони
-        if gesture != 1:
-            self.beetle.move_towards_target()
-            self.beetle2.move_towards_target()
-
-        # Проверка на конец игры
-        if not self.end_game and (
-                self.check_circle_collision(self.beetle, self.orange_circle) or
-                self.check_circle_collision(self.beetle2, self.orange_circle)
-        ):
-            self.show_end_game()
-
-        # Обрабатываем столкновения со стенами
-        self.resolve_wall_collisions()
-        self.update()
-
-
-    def ensure_square_in_bounds(self, square):
-        """ Проверка нахождения объектов в пределах границ """
-
-        # TODO оптимизировать
-
-        # Левая граница
-        if square.x < 0:
-            square.x = 0
-
-        # Верхняя граница
-        if square.y < 0:
-            square.y = 0
-
-        # Правая граница
-        if square.x + square.size > self.width():
-            square.x = self.width() - square.size
-
-        # Нижняя граница
-        if square.y + square.size > self.height():
-            square.y = self.height() - square.size
-
-    def resolve_wall_collisions(self):
-        """ Обработка столкновений объектов со стенами """
-        for square in self.squares:
-            self.ensure_square_in_bounds(square)
-
-    def resolve_collisions(self):
-        """ Обработка столкновений объектов"""
-
-        # Проверяем все пары объектов
-        for i in range(len(self.squares)):
-            for j in range(i + 1, len(self.squares)):
-                obj1 = self.squares[i]
-                obj2 = self.squares[j]
-
-                # Пропуск столкновений между врагами
-                if (isinstance(obj1, ObjectWithTarget)
-                        and isinstance(obj2, ObjectWithTarget)):
-                    continue
-
-                if self.check_collision(obj1, obj2):
-                    self.push_objects_apart(obj1, obj2)
-
-        # Проверяем столкновения квадратов с кругом
-        for square in self.squares:
-            if not isinstance(square, ObjectWithTarget):  # Не враги
-                if self.check_square_circle_collision(square, self.orange_circle):
-                    self.push_square_from_circle(square, self.orange_circle)
-
-    def check_collision(self, square1, square2):
-        """ Проверка столкновения двух квадратов """
-        # Проверяем пересечение по осям X и Y
-        return (square1.x < square2.x + square2.size and
-                square1.x + square1.size > square2.x and
-                square1.y < square2.y + square2.size and
-                square1.y + square1.size > square2.y)
-
-    def check_square_circle_collision(self, square, circle):
-        """Проверяет столкновение квадрата и круга"""
-        # Находим ближайшую точку на квадрате к центру круга
-        closest_x = max(square.x, min(circle.x, square.x + square.size))
-        closest_y = max(square.y, min(circle.y, square.y + square.size))
+        if self.input_log_pending:
+            self.input_log_pending = False
+            self.start_input_log()
 
-        # Расстояние между ближайшей точкой и центром круга
-        distance = ((circle.x - closest_x) ** 2 + (circle.y - closest_y) ** 2) ** 0.5
-
-        return distance < circle.radius
-
-    def push_square_from_circle(self, square, circle):
-        """ Отталкивает квадрат от круга """
-        if square.dragging:
-            return  # Не отталкиваем перетаскиваемый квадрат
-
-        # Вектор от центра круга к центру квадрата
-        square_center = square.get_center()
-        circle_center = circle.get_center()
-
-        dx = square_center.x() - circle_center.x()
-        dy = square_center.y() - circle_center.y()
-
-        # Если центры совпадают, добавляем случайное смещение
-        if abs(dx) < 1e-5 and abs(dy) < 1e-5:
-            dx = (np.random.rand() - 0.5) * 10
-            dy = (np.random.rand() - 0.5) * 10
-
-        # Нормализуем вектор
-        length = max(1e-5, (dx ** 2 + dy ** 2) ** 0.5)
-        dx /= length
-        dy /= length
-
-        # Минимальное расстояние (радиус круга + половина диагонали квадрата)
-        min_distance = circle.radius + (square.size * 0.7)
-
-        # Текущее расстояние между центрами
-        current_distance = ((square_center.x() - circle_center.x()) ** 2 +
-                            (square_center.y() - circle_center.y()) ** 2) ** 0.5
-
-        # Если объекты пересекаются, отталкиваем квадрат
-        if current_distance < min_distance:
-            # Сила отталкивания
-            force = (min_distance - current_distance) * 0.7
-
-            # Смещаем квадрат от круга
-            square.x += dx * force
-            square.y += dy * force
-
-    def check_circle_collision(self, beetle, circle):
-        # Проверяем столкновение по расстоянию между центрами
-        beetle_center = beetle.get_center()
-        circle_center = circle.get_center()
-
-        dx = circle_center.x() - beetle_center.x()
-        dy = circle_center.y() - beetle_center.y()
-        distance = (dx ** 2 + dy ** 2) ** 0.5
-
-        # Сумма радиусов (для жука берем половину размера как радиус)
-        min_distance = beetle.size / 2 + circle.radius
-
-        return distance < min_distance
-
-    def push_objects_apart(self, square1, square2):
-        """ Отталкивание объектов друг от друга"""
-
-        # Рассчитываем вектор между центрами
-        center1 = square1.get_center()
-        center2 = square2.get_center()
-
-        dx = center2.x() - center1.x()
-        dy = center2.y() - center1.y()
-
-        # Если квадраты находятся точно друг на друге, добавляем случайное смещение
-        if abs(dx) < 1e-5 and abs(dy) < 1e-5:
-            dx = (np.random.rand() - 0.5) * 10
-            dy = (np.random.rand() - 0.5) * 10
-
-        # Нормализуем вектор
-        length = max(1e-5, (dx ** 2 + dy ** 2) ** 0.5)
-        dx /= length
-        dy /= length
-
-        # Минимальное расстояние между центрами (диагональ квадратов)
-        min_distance = (square1.size + square2.size) * 0.7
-
-        # Текущее расстояние
-        current_distance = ((center2.x() - center1.x()) ** 2 +
-                            (center2.y() - center1.y()) ** 2) ** 0.5
-
-        # Если квадраты пересекаются, отталкиваем их
-        if current_distance < min_distance:
-            # Сила отталкивания
-            force = (min_distance - current_distance) * 0.5
+        # Шаг игровой логики (один тик на кадр трекера). Длительность шага -
+        # интервал между временами захвата кадров, а не частота таймеров GUI
+        now = captured if captured is not None else time.monotonic()
+        if self.last_step_time is None:
+            dt = self.simulation.tick_seconds
+        else:
+            dt = min(max(now - self.last_step_time, 0.0), MAX_STEP_SECONDS)
+        self.last_step_time = now
 
-            # Смещаем квадраты в противоположных направлениях
-            if not square1.dragging:
-                square1.x -= dx * force
-                square1.y -= dy * force
+        level = int(self.simulation.speed)
+        self.simulation.step_hands(self.hands, dt)
+        if int(self.simulation.speed) != level:
+            self.speed_changed.emit(int(self.simulation.speed))
 
-            if not square2.dragging:
-                square2.x += dx * force
-                square2.y += dy * force
+        self.spawn_effects()
+        if self.simulation.end_game:
+            self.show_end_game()
+        self.redraw()
+
+    def spawn_effects(self):
+        """ Частицы для событий шага игры """
+        events = self.simulation.take_events()
+        for name, x, y in events:
+            self.particles.emit(name, x, y)
+        if events and not self.particle_timer.isActive():
+            self.particle_time = time.monotonic()
+            self.particle_timer.start()
+
+    def advance_particles(self):
+        """ Шаг частиц по реальному времени; таймер стоит, пока частиц нет """
+        now = time.monotonic()
+        self.particles.update(min(now - self.particle_time, MAX_STEP_SECONDS))
+        self.particle_time = now
+        if not len(self.particles):
+            self.particle_timer.stop()
+        self.redraw()
 
     def show_end_game(self):
         """ Завершение игры """
         self.game_end = True
-        self.end_game = True
         self.game_paused = True
         self.game_ended.emit()
-
-        # Устанавливаем текстуру взрыва
-        self.orange_circle.set_explosion()
-        self.update()
-
-        # Остановка таймера
-        if self.game_timer.isActive():
-            self.game_timer.stop()
+        self.redraw()
 
         if hasattr(self, 'end_game_timer') and self.end_game_timer:
             self.end_game_timer.stop()
@@ -395,59 +253,143 @@ class HandCursorWidget(QWidget):
         # Останавливаем все таймеры
         if hasattr(self, 'end_game_timer') and self.end_game_timer:
             self.end_game_timer.stop()
+        self.particle_timer.stop()
 
-        if hasattr(self, 'game_timer') and self.game_timer:
-            self.game_timer.stop()
+        # Дописываем журнал ввода
+        self.simulation.stop_recording()
 
         # Закрываем главное окно
         main_window = self.window()
         if main_window:
             main_window.close()
 
+    def redraw(self):
+        """ Запрос перерисовки на активном холсте """
+        if self.gl_canvas is not None:
+            self.gl_canvas.update()
+        else:
+            self.update()
+
+    def collect_sprites(self):
+        """ Спрайты сцены в порядке отрисовки (для холста OpenGL),
+        прямоугольники - в логических пикселях виджета """
+        self.update_view()
+        sprites = [self.background_sprite()]
+        for obj in self.scene_objects():
+            if has_texture(obj):
+                sprites.append(self.view.screen_sprite(obj.get_sprite()))
+        return sprites
+
+    def background_sprite(self):
+        """ Фон на все поле """
+        return self.view.screen_sprite(Sprite(
+            texture_key(self.background_path, WORLD_WIDTH, WORLD_HEIGHT),
+            0, 0, WORLD_WIDTH, WORLD_HEIGHT))
+
+    def scene_objects(self):
+        """ Игровые объекты в порядке отрисовки """
+        return [self.simulation.orange_circle] + self.simulation.squares
+
+    def paint_overlay(self, painter):
+        """ Отрисовка поверх спрайтов (для холста OpenGL) """
+        self.update_view()
+        painter.setRenderHint(QPainter.Antialiasing)
+        self.draw_border(painter)
+        self.draw_trail(painter)
+
+        # Объекты без текстуры рисуются запасным способом
+        for obj in self.scene_objects():
+            if not has_texture(obj):
+                draw_object(painter, obj, self.view)
+
+        self.draw_particles(painter)
+        self.draw_cursor(painter)
+
     def paintEvent(self, event):
         """ Отрисовка игровой сцены """
+        if self.gl_canvas is not None:
+            return  # Сцену рисует холст OpenGL
+
+        self.update_view()
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
+        painter.fillRect(self.rect(), FIELD_COLOR)
 
-        # Рисуем фоновое изображение
-        painter.drawPixmap(self.rect(), self.background)
+        # Рисуем фоновое изображение (уже нужного размера - без масштабирования)
+        background = self.background_sprite()
+        pixmap = TextureManager.instance().pixmap(background.key, self.view.dpr)
+        if pixmap is not None:
+            painter.drawPixmap(QPointF(background.x, background.y), pixmap)
 
         # Рисуем рамку поверх изображения
-        painter.setPen(QPen(QColor(0x40, 0x40, 0x40), 2))  # #404040
-        painter.drawRect(self.rect().adjusted(1, 1, -1, -1))
+        self.draw_border(painter)
+
         # Отрисовка следа курсора
-        if self.is_trail and len(self.trail_positions) > 1:
-            for i in range(1, len(self.trail_positions)):
-                pen = QPen(self.trail_colors[i], 2)
-                painter.setPen(pen)
-                x1 = int(self.trail_positions[i - 1][0])
-                y1 = int(self.trail_positions[i - 1][1])
-                x2 = int(self.trail_positions[i][0])
-                y2 = int(self.trail_positions[i][1])
-                painter.drawLine(x1, y1, x2, y2)
-
-        # Отрисовка оранжевого круга
-        self.orange_circle.draw(painter)
-
-        # Отрисовка квадратов
-        for square in self.squares:
-            square.draw(painter)
+        self.draw_trail(painter)
+
+        # Отрисовка круга и квадратов
+        for obj in self.scene_objects():
+            draw_object(painter, obj, self.view)
+
+        # Частицы взрывов, ударов и захватов
+        self.draw_particles(painter)
 
         # Отрисовка курсора
+        self.draw_cursor(painter)
+
+    def draw_border(self, painter):
+        """ Рамка игрового поля """
+        painter.setPen(QPen(QColor(0x40, 0x40, 0x40), 2))  # #404040
+        painter.setBrush(Qt.NoBrush)
+        painter.drawRect(self.field_rect().adjusted(1, 1, -1, -1))
+
+    def field_rect(self):
+        """ Поле на экране, логические пиксели виджета """
+        return QRectF(self.view.offset_x, self.view.offset_y,
+                      self.view.field_width, self.view.field_height)
+
+    def draw_trail(self, painter):
+        """ Отрисовка следа курсора """
+        if self.is_trail:
+            painter.save()
+            painter.translate(self.view.offset_x, self.view.offset_y)
+            self.trail.draw(painter, self.view.field_width, self.view.field_height)
+            painter.restore()
+
+    def draw_particles(self, painter):
+        """ Отрисовка частиц (позиции частиц - в единицах мира) """
+        painter.save()
+        painter.translate(self.view.offset_x, self.view.offset_y)
+        self.particles.draw(painter, self.view.scale)
+        painter.restore()
+
+    def draw_cursor(self, painter):
+        """ Отрисовка курсоров рук и надписи окончания игры """
         if self.hand_detected:
-            color = QColor(255, 0, 0) if self.gesture == 0 else QColor(0, 200, 0)
-            painter.setBrush(color)
             painter.setPen(Qt.NoPen)
-            x = int(self.cursor_pos[0] * self.width())
-            y = int(self.cursor_pos[1] * self.height())
-            x = max(15, min(self.width() - 15, x))
-            y = max(15, min(self.height() - 15, y))
-            size = 20 if self.gesture == 0 else 10
-            painter.drawEllipse(QPoint(x, y), size, size)
-            painter.setBrush(QColor(255, 255, 255))
-            painter.drawEllipse(QPoint(x, y), 5, 5)
+            scale = self.view.scale
+            margin = 15 * scale
+            for slot, hand_x, hand_y, gesture in self.hands:
+                # Курсоры рук различаются цветом центра
+                color = QColor(255, 0, 0) if gesture == 0 else QColor(0, 200, 0)
+                painter.setBrush(color)
+                x = max(margin, min(self.view.field_width - margin, hand_x * self.view.field_width))
+                y = max(margin, min(self.view.field_height - margin, hand_y * self.view.field_height))
+                center = QPointF(self.view.offset_x + x, self.view.offset_y + y)
+                size = (20 if gesture == 0 else 10) * scale
+                painter.drawEllipse(center, size, size)
+                painter.setBrush(CURSOR_CENTER_COLORS[slot % len(CURSOR_CENTER_COLORS)])
+                painter.drawEllipse(center, 5 * scale, 5 * scale)
+
+            # Курсор кадра нарисован - конец замера задержки
+            if self.cursor_captured is not None:
+                LatencyProbe.instance().painted(self.cursor_captured)
+                self.cursor_captured = None
 
         if self.game_end:
             painter.setPen(QColor(255, 0, 0))
-            painter.setFont(QFont('Courier New', 48, QFont.Bold))
-            painter.drawText(self.rect(), Qt.AlignCenter, "GAME OVER")
\ No newline at end of file
+            font = QFont('Courier New')
+            font.setBold(True)
+            font.setPixelSize(max(1, int(64 * self.view.scale)))
+            painter.setFont(font)
+            painter.drawText(self.field_rect(), Qt.AlignCenter, "GAME OVER")
\ No newline at end of file
@@ -1,66 +1,152 @@
 import os
+import threading
+import time
 
 import cv2
 import pickle
 import numpy as np
 
-from PIL import Image, ImageDraw, ImageFont
-
 from PyQt5.QtCore import QThread, pyqtSignal
-from PyQt5.QtGui import QImage
+
+from Camera.CameraService import CameraService
+from Diagnostics.LatencyProbe import LatencyProbe
+from Diagnostics.Log import get_logger
+from Settings import get_settings
+from Tracking.HandBackends import create_hand_backend
+from Tracking.HandFeatures import CENTER_LANDMARK, HandSlots, hand_features, mirror_points
+from Tracking.TrackerResult import HandState, ResultMailbox, TrackerResult
+
+# Режимы работы трекера (задаются состоянием игры)
+POWER_ACTIVE = 'active'        # Игра идет: MediaPipe на каждом кадре
+POWER_PREVIEW = 'preview'      # Пауза: только превью камеры с низкой частотой
+POWER_SUSPENDED = 'suspended'  # Трекер не нужен: поток спит, камера не читается
+
+log = get_logger('tracker')
+
+MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Model', 'model.p')
+
+
+def load_gesture_model(path=MODEL_PATH):
+    """ Модель классификации жестов из файла """
+    with open(path, 'rb') as f:
+        return pickle.load(f)['model']
+
+
+def create_hands():
+    """ Поиск рук MediaPipe (Tracking.HandBackends) с прогоном пустого кадра:
+    граф строится при первом кадре, это основная часть инициализации """
+    hands = create_hand_backend(get_settings())
+    hands.detect(np.zeros((480, 640, 3), dtype=np.uint8))
+    log.info("Hand backend: %s", hands.name)
+    return hands
 
 
 class HandTrackerThread(QThread):
     """ Поток для отслеживания положения руки и распознавания жестов  """
 
-    # Сигналы для взаимодействия с основным потоком
-    landmarks_detected = pyqtSignal(bool)  # Обнаружены ли характерные точки руки
-    position_updated = pyqtSignal(float, float, int)  # x, y, gesture
-    frame_updated = pyqtSignal(QImage) # Обновление изображения с камеры
+    # Результаты кадров передаются через mailbox (интерфейс забирает последний),
+    # сигналом - только редкие события
     tracker_ready = pyqtSignal(bool) # Готовность трекера к работе
 
-    def __init__(self):
-        """ Инициализация трекера руки """
+    def __init__(self, warmup=None):
+        """ Инициализация трекера руки (warmup - прогрев при запуске, Tracking.Warmup) """
         super().__init__()
+        self.warmup = warmup
 
         self.running = True # Флаг работы потока
         self.model = None   # Модель классификации жестов
-        self.cap = None     # Объект захвата видео
+        self.camera = None  # Подписка на кадры общей камеры
         self.labels_dict = {0: 'palm', 1: 'fist'} # Словарь жестов
         # (palm - ладонь, fist - кулак)
-        self.last_gesture = 0  # Последний распознанный жест
+        self.last_gestures = {}  # Последний распознанный жест по слотам рук
+        self.hand_slots = HandSlots(get_settings()['max_hands'])
+        self.mailbox = ResultMailbox()  # Последний результат для интерфейса
 
-    # HandTrackerThread.py
-    def init_camera(self):
-        """ Инициализация камеры"""
-        # Попробуем освободить камеру перед открытием
-        try:
-            temp_cap = cv2.VideoCapture(0)
-            if temp_cap.isOpened():
-                temp_cap.release()
-        except:
-            pass
+        # Режим работы и условие, на котором поток ждет смены режима
+        self.power_state = POWER_PREVIEW
+        self.model_reload = False      # Запрошена перезагрузка модели
+        self.condition = threading.Condition()
+        self.next_preview_time = 0.0
+        self.next_active_preview = 0.0  # Время следующего превью во время игры
 
-        self.cap = cv2.VideoCapture(0)
+        # Превью: размер «пикселя» (1 - без эффекта) и область показа в окне
+        self.pixel_size = get_settings()['preview_pixel_size']
+        self.preview_size = (400, 400)
 
-        if not self.cap.isOpened():
-            print("Error: Could not open camera.")
-            return False
+    def set_preview_size(self, width, height):
+        """ Размер области показа превью: кадр превью строится сразу в нем """
+        self.preview_size = (width, height)
 
-        return True
+    def init_camera(self):
+        """ Подписка на кадры общей камеры (устройство держит CameraService) """
+        self.camera = CameraService.instance().subscribe('tracker')
+        return self.camera is not None
+
+    def release_camera(self):
+        """ Отписка от камеры - устройство остается открытым для других """
+        if self.camera is not None:
+            self.camera.close()
+            self.camera = None
+
+    def set_power_state(self, state):
+        """ Смена режима работы (вызывается из основного потока) """
+        with self.condition:
+            if self.power_state != state:
+                log.info("Tracker power state: %s", state)
+            self.power_state = state
+            self.condition.notify_all()
+
+    def request_model_reload(self):
+        """ Перечитать модель из файла (после обучения) """
+        with self.condition:
+            self.model_reload = True
+            self.condition.notify_all()
+
+    def take_model_reload(self):
+        """ Запрошена ли перезагрузка модели (запрос снимается) """
+        with self.condition:
+            reload, self.model_reload = self.model_reload, False
+            return reload
+
+    def wait_for(self, predicate, timeout=None):
+        """ Ожидание условия без загрузки процессора """
+        with self.condition:
+            return self.condition.wait_for(predicate, timeout)
+
+    def wait_until_needed(self):
+        """ Сон, пока трекер приостановлен. Возвращает текущий режим
+        или None, если поток останавливается """
+        with self.condition:
+            if self.power_state == POWER_SUSPENDED:
+                # Отписка от камеры: без подписчиков CameraService не читает кадры,
+                # но держит устройство открытым - возобновление мгновенное
+                self.release_camera()
+            self.condition.wait_for(
+                lambda: not self.running or self.power_state != POWER_SUSPENDED)
+            if not self.running:
+                return None
+            state = self.power_state
+
+        if self.camera is None and not self.init_camera():
+            # Камера пропала - пробуем снова через секунду
+            self.wait_for(lambda: not self.running, 1.0)
+            return None if not self.running else POWER_SUSPENDED
+        return state
+
+    def prepared(self, name, factory):
+        """ Объект из прогрева при запуске (только первый раз), иначе factory() """
+        if self.warmup is not None:
+            return self.warmup.take(name, factory)
+        return factory()
 
     def load_model(self):
         """ Загрузка модели классификации из файла"""
         try:
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            model_path = os.path.join(current_dir, 'Model', 'model.p')
-
-            model_dict = pickle.load(open(model_path, 'rb'))
-            self.model = model_dict['model']
-            print("Model loaded successfully.")
+            self.model = self.prepared('model', load_gesture_model)
+            log.info("Model loaded successfully.")
             return True
         except Exception as e:
-            print(f"Error loading model: {e}")
+            log.error("Error loading model: %s", e)
             return False
 
     def run(self):
@@ -71,183 +157,229 @@ class HandTrackerThread(QThread):
         model_ok = self.load_model()
         self.tracker_ready.emit(camera_ok and model_ok)
 
-        if not model_ok:
-            # Создаем изображение с сообщением
-            error_image = np.zeros((480, 640, 3), dtype=np.uint8)
-            error_image.fill(51)  # Тот же фон #333 как в main.py (51,51,51)
+        while not model_ok and self.running:
+            self.emit_error_image()
 
-            # Используем PIL для корректного отображения русского текста
-            pil_img = Image.fromarray(cv2.cvtColor(error_image, cv2.COLOR_BGR2RGB))
-            draw = ImageDraw.Draw(pil_img)
+            # Кадры без модели не нужны
+            self.release_camera()
 
-            # Пробуем загрузить шрифт
-            try:
-                font = ImageFont.truetype("arial.ttf", 24)
-            except IOError:
-                # Если Arial недоступен, используем стандартный шрифт
-                font = ImageFont.load_default()
-
-            # Текст сообщения
-            text = "Модель не обнаружена!\nПройдите настройку модели!"
-
-            # Рассчитываем позицию для центрирования текста
-            bbox = draw.textbbox((0, 0), text, font=font)
-            text_width = bbox[2] - bbox[0]
-            text_height = bbox[3] - bbox[1]
-            text_x = (640 - text_width) // 2
-            text_y = (480 - text_height) // 2
-
-            # Рисуем текст белым цветом
-            draw.text((text_x, text_y), text, font=font, fill=(255, 255, 255))
-
-            # Конвертируем обратно в OpenCV формат
-            error_image = cv2.cvtColor(np.array(pil_img), cv2.COLOR_RGB2BGR)
-
-            # Конвертируем в QImage и отправляем
-            h, w, ch = error_image.shape
-            bytes_per_line = ch * w
-            qt_image = QImage(error_image.data, w, h, bytes_per_line, QImage.Format_BGR888)
-            self.frame_updated.emit(qt_image)
-
-            # Ожидаем завершения
-            while self.running:
-                pass
-            return
+            # Ждем новую модель после обучения или остановки потока
+            self.wait_for(lambda: not self.running or self.model_reload)
+            if not self.running:
+                return
+            self.take_model_reload()
+            camera_ok = self.init_camera()
+            model_ok = self.load_model()
+            self.tracker_ready.emit(camera_ok and model_ok)
 
         # Выход при ошибке инициализации
         if not camera_ok or not model_ok:
+            self.release_camera()
             self.running = False
             return
 
         # Инициализация Hands из MediaPipe
-        mp_hands = __import__('mediapipe').solutions.hands
-        self.hands = mp_hands.Hands(
-            static_image_mode=False,       # True - изображения отдельно,
-                                           # False - с учетом предыдущих кадров
-            min_detection_confidence=0.5,  # Мин порог доверия обнаружения
-            max_num_hands=1,               # Максимальное кол-во рук
-            min_tracking_confidence=0.5    # Мин порог доверия отслеживания
-        )
-
-        self.pixel_size = 9 # 8 сильный эффект
-                            # 0 нет эффекта
-        # TODO вынести в настройки
+        self.hands = self.prepared('hands', create_hands)
 
         try:
             while self.running:
-                if not self.running:
+                state = self.wait_until_needed()
+                if state is None:
                     break
+                if state == POWER_SUSPENDED:
+                    continue
+
+                # На паузе камера декодирует только кадры превью
+                self.camera.set_rate(0 if state == POWER_ACTIVE else self.idle_preview_fps())
 
-                ret, frame = self.cap.read()
-                # Зеркальное отображение (0 - обычное)
-                frame = cv2.flip(frame, 1)
-                if not ret or not self.running:
+                if self.take_model_reload():
+                    self.tracker_ready.emit(self.load_model())
+
+                if state == POWER_PREVIEW:
+                    # Превью на паузе - редкие кадры, между ними поток спит
+                    delay = self.next_preview_time - time.monotonic()
+                    if delay > 0:
+                        self.wait_for(lambda: not self.running or
+                                      self.power_state != POWER_PREVIEW, delay)
+                        continue
+                    self.next_preview_time = time.monotonic() + 1 / self.idle_preview_fps()
+
+                camera_frame = self.camera.read(0.5)
+                if camera_frame is None or not self.running:
                     continue
+                # Кадр не отражается: зеркалятся координаты рук и маленькое превью
+                frame = camera_frame.image
+
+                # Распознавание рук только во время игры
+                hands = None
+                if state == POWER_ACTIVE:
+                    hands = self.track_hands(frame, camera_frame.timestamp)
 
-                # Размеры кадра
-                H, W, _ = frame.shape
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
-                # Применение пиксельного эффекта
-                if self.pixel_size > 1:
-                    small = cv2.resize(
-                        frame,
-                        (frame.shape[1] // self.pixel_size,
-                         frame.shape[0] // self.pixel_size),
-                        interpolation=cv2.INTER_NEAREST
-                    )
-                    pixel_frame = cv2.resize(
-                        small,
-                        (frame.shape[1], frame.shape[0]),
-                        interpolation=cv2.INTER_NEAREST
-                    )
-                else:
-                    pixel_frame = frame
-
-                # Обнаружение руки
-                results = self.hands.process(frame_rgb)
-
-                if results.multi_hand_landmarks:
-                    self.landmarks_detected.emit(True)
-                    hand_landmarks = results.multi_hand_landmarks[0]
-
-                    # Центр руки (основание среднего пальца)
-                    cx = int(hand_landmarks.landmark[9].x * W)
-                    cy = int(hand_landmarks.landmark[9].y * H)
-
-                    # Нормализация позиции курсора
-                    norm_x = cx / W
-                    norm_y = cy / H
-
-                    # Подготовка данных для классификации
-                    x_ = [lm.x for lm in hand_landmarks.landmark]
-                    y_ = [lm.y for lm in hand_landmarks.landmark]
-                    min_x, min_y = min(x_), min(y_)
-                    max_x, max_y = max(x_), max(y_)
-
-                    # Нормализация координат точек рук
-                    data_aux = []
-                    for lm in hand_landmarks.landmark:
-                        if (max_x - min_x) > 0 and (max_y - min_y) > 0:
-                            data_aux.append((lm.x - min_x) / (max_x - min_x))
-                            data_aux.append((lm.y - min_y) / (max_y - min_y))
-                        else:
-                            data_aux.append(lm.x)
-                            data_aux.append(lm.y)
-
-                    # Классификация жеста
-                    try:
-                        if len(data_aux) == 42: # 21 точки, 2 координаты
-                            prediction = self.model.predict([np.asarray(data_aux)])
-                            gesture = int(prediction[0])
-                            self.last_gesture = gesture
-                    except Exception as e:
-                        print(f"Prediction error: {e}")
-                        gesture = self.last_gesture # Последний корректный жест
-
-                    # Отправка позиций и жеста
-                    self.position_updated.emit(norm_x, norm_y, gesture)
-
-                    # Отрисовка курсора
-                    circle_color = (0, 0, 255) if gesture == 0 else (0, 255, 0)  # red/green
-                    circle_size = 20 if gesture == 0 else 10  # red/green
-                    cv2.circle(pixel_frame, (cx, cy), circle_size, circle_color, -1)
-                else:
-                    self.landmarks_detected.emit(False)
-
-                # Конвертация и отправка кадра
-                h, w, ch = pixel_frame.shape
-                bytes_per_line = ch * w
-                qt_image = QImage(
-                    pixel_frame.data,
-                    w,
-                    h,
-                    bytes_per_line,
-                    QImage.Format_BGR888
-                )
+                # Превью во время игры - со своей частотой, реже распознавания
+                preview = None
+                if state != POWER_ACTIVE or self.preview_due():
+                    preview = self.make_preview(frame, hands)
+
+                # Один результат на кадр: руки и превью (если оно нужно) вместе
                 if self.running:
-                    self.frame_updated.emit(qt_image)
+                    self.post_result(camera_frame, hands, preview)
 
         except Exception as e:
-            print(f"Неожиданная ошибка в потоке трекера: {e}")
+            log.exception("Неожиданная ошибка в потоке трекера: %s", e)
         finally:
             # Гарантированное освобождение ресурсов
             try:
                 if hasattr(self, 'hands') and self.hands:
+                    self.hands.close()
                     self.hands = None
-                    print("Ресурсы MediaPipe освобождены")
+                    log.info("Ресурсы MediaPipe освобождены")
             except Exception as e:
-                print(f"Камера освобождена в блоке finally: {e}")
+                log.error("Ошибка при освобождении ресурсов MediaPipe: %s", e)
 
             try:
-                if hasattr(self, 'cap') and self.cap and self.cap.isOpened():
-                    self.cap.release()
-                    print("Ошибка при освобождении ресурсов MediaPipe")
+                self.release_camera()
             except Exception as e:
-                print(f"Ошибка при освобождении камеры в finally: {e}")
+                log.error("Ошибка при освобождении камеры в finally: %s", e)
+
+    def pixelate(self, frame):
+        """ Зеркальное превью камеры с пиксельным эффектом сразу в размере показа:
+        кадр уменьшается до сетки «пикселей», отражается и увеличивается без сглаживания """
+        H, W = frame.shape[:2]
+        scale = min(self.preview_size[0] / W, self.preview_size[1] / H)
+        width, height = max(int(W * scale), 1), max(int(H * scale), 1)
+        if self.pixel_size <= 1:
+            return cv2.flip(cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA), 1)
+        small = cv2.resize(
+            frame,
+            (max(width // self.pixel_size, 1),
+             max(height // self.pixel_size, 1)),
+            interpolation=cv2.INTER_NEAREST
+        )
+        return cv2.resize(
+            cv2.flip(small, 1),
+            (width, height),
+            interpolation=cv2.INTER_NEAREST
+        )
+
+    def idle_preview_fps(self):
+        """ Частота превью на паузе """
+        return max(get_settings()['idle_preview_fps'], 1)
+
+    def preview_due(self):
+        """ Пора ли строить превью во время игры (частота preview_fps) """
+        fps = get_settings()['preview_fps']
+        if fps <= 0:
+            return True
+        now = time.monotonic()
+        if now < self.next_active_preview:
+            return False
+        # Без накопления долга после пропусков кадров
+        self.next_active_preview = max(self.next_active_preview + 1 / fps, now)
+        return True
+
+    def make_preview(self, frame, hands):
+        """ Кадр превью с курсорами найденных рук """
+        preview = self.pixelate(frame)
+        height, width = preview.shape[:2]
+        scale = width / frame.shape[1]
+        for _, x, y, gesture in hands or ():
+            # Отрисовка курсора
+            circle_color = (0, 0, 255) if gesture == 0 else (0, 255, 0)  # red/green
+            circle_size = 20 if gesture == 0 else 10  # red/green
+            cv2.circle(preview, (int(x * width), int(y * height)),
+                       max(int(circle_size * scale), 1), circle_color, -1)
+        return preview
+
+    def track_hands(self, frame, captured):
+        """ Поиск рук и классификация жестов (captured - время захвата кадра
+        для замера задержки). Возвращает список HandState по слотам рук """
+        # Размеры кадра
+        H, W, _ = frame.shape
+        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+        # Обнаружение рук: точки всех рук (руки, 21, 2)
+        points = self.hands.detect(frame_rgb, captured)
+
+        if not len(points):
+            self.hand_slots.clear()
+            return []
+
+        # Зеркальное отображение в координатах точек (как у отраженного кадра)
+        points = mirror_points(points)
+
+        # Позиции курсоров (основание среднего пальца)
+        centers = [(int(x * W) / W, int(y * H) / H) for x, y in points[:, CENTER_LANDMARK]]
+        slots = self.hand_slots.assign(centers)
+
+        # Классификация жестов всех рук одним вызовом модели
+        gestures = [self.last_gestures.get(slot, 0) for slot in slots]
+        try:
+            gestures = [int(gesture) for gesture in self.model.predict(hand_features(points))]
+        except Exception as e:
+            log.warning("Prediction error: %s", e)  # Последние корректные жесты
+        self.last_gestures = dict(zip(slots, gestures))
+
+        LatencyProbe.instance().mark(captured, 'tracked')
+
+        return [HandState(slot, x, y, gesture)
+                for (x, y), slot, gesture in sorted(zip(centers, slots, gestures),
+                                                    key=lambda hand: hand[1])]
+
+    def post_result(self, camera_frame, hands, image):
+        """ Результат кадра в почтовый ящик интерфейса (заменяет непрочитанный).
+        hands - найденные руки или None, если кадр не распознавался """
+        if hands is None:
+            detected, x, y, gesture, hands = None, None, None, None, ()
+        elif hands:
+            detected, (_, x, y, gesture) = True, hands[0]
+        else:
+            detected, x, y, gesture = False, None, None, None
+        self.mailbox.post(TrackerResult(
+            camera_frame.index, camera_frame.timestamp, detected, x, y, gesture, image, tuple(hands)
+        ))
+
+    def emit_error_image(self):
+        """ Кадр с сообщением об отсутствии модели """
+        from PIL import Image, ImageDraw, ImageFont
+
+        # Создаем изображение с сообщением
+        error_image = np.zeros((480, 640, 3), dtype=np.uint8)
+        error_image.fill(51)  # Тот же фон #333 как в main.py (51,51,51)
+
+        # Используем PIL для корректного отображения русского текста
+        pil_img = Image.fromarray(cv2.cvtColor(error_image, cv2.COLOR_BGR2RGB))
+        draw = ImageDraw.Draw(pil_img)
+
+        # Пробуем загрузить шрифт
+        try:
+            font = ImageFont.truetype("arial.ttf", 24)
+        except IOError:
+            # Если Arial недоступен, используем стандартный шрифт
+            font = ImageFont.load_default()
+
+        # Текст сообщения
+        text = "Модель не обнаружена!\nПройдите настройку модели!"
+
+        # Рассчитываем позицию для центрирования текста
+        bbox = draw.textbbox((0, 0), text, font=font)
+        text_width = bbox[2] - bbox[0]
+        text_height = bbox[3] - bbox[1]
+        text_x = (640 - text_width) // 2
+        text_y = (480 - text_height) // 2
+
+        # Рисуем текст белым цветом
+        draw.text((text_x, text_y), text, font=font, fill=(255, 255, 255))
+
+        # Конвертируем обратно в OpenCV формат
+        error_image = cv2.cvtColor(np.array(pil_img), cv2.COLOR_RGB2BGR)
+
+        # Отправляем как кадр превью
+        self.mailbox.post(TrackerResult(-1, None, None, None, None, None, error_image))
 
     def stop(self):
         """ Остановка потока трекера руки """
-        self.running = False
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
         if self.isRunning():
             self.wait(1000)
\ No newline at end of file
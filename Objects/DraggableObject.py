@@ -1,6 +1,5 @@
-from PyQt5.QtCore import QPointF
-
 from Objects.GameObject import GameObject
+from Rendering.Sprite import Sprite
 
 class DraggableObject(GameObject):
     """ Базовый класс для перетаскиваемых объектов"""
@@ -17,4 +16,14 @@ class DraggableObject(GameObject):
                 self.y <= point_y <= self.y + self.size)
 
     def get_center(self):
-        return QPointF(self.x + self.size / 2, self.y + self.size / 2)
\ No newline at end of file
+        return self.x + self.size / 2, self.y + self.size / 2
+
+    def get_box(self):
+        """ Прямоугольник объекта (x, y, w, h) """
+        return self.x, self.y, self.size, self.size
+
+    def get_sprite(self):
+        """ Спрайт для отрисовки (None - объект без текстуры) """
+        if self.texture_key is None:
+            return None
+        return Sprite(self.texture_key, self.x, self.y, self.size, self.size)
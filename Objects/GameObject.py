@@ -1,15 +1,15 @@
-from PyQt5.QtCore import QPointF
-
 class GameObject:
     """ Базовый класс для всех объектов"""
 
     def __init__(self, x, y, color):
         self.x = x
         self.y = y
-        self.color = color
+        self.color = color  # (r, g, b) - для отрисовки без текстуры
+        self.texture_key = None  # Ключ текстуры для TextureManager
 
     def get_center(self):
-        return QPointF(self.x, self.y)
+        return self.x, self.y
 
-    def draw(self, painter):
-        pass
\ No newline at end of file
+    def get_sprite(self):
+        """ Спрайт для отрисовки (None - объект без текстуры) """
+        return None
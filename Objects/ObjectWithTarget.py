@@ -1,8 +1,9 @@
-from PyQt5.QtCore import Qt, QPointF
-from PyQt5.QtGui import QBrush, QPixmap, QPolygonF
-import os
+import math
 
 from Objects.DraggableObject import DraggableObject
+from Rendering.Sprite import Sprite, rotation_frame, rotation_key, texture_key
+
+ROTATION_FRAMES = 32  # Заранее повернутых кадров текстуры (шаг 11.25 градуса)
 
 
 class ObjectWithTarget(DraggableObject):
@@ -12,71 +13,62 @@ class ObjectWithTarget(DraggableObject):
         super().__init__(x, y, size, color)
         self.speed = 1     # Скорость движения
         self.target = None # Цель движения
+        self.angle = 0.0   # Угол поворота текстуры, градусы (только для отрисовки)
+
+        # Текстура из общего кэша (масштабируется один раз)
+        self.texture_path = 'Images/pix-stone.png'
+        self.texture_key = texture_key(self.texture_path, size, size)
+
+    def roll(self, dx, dy):
+        """ Поворот камня, катящегося на (dx, dy): по часовой стрелке вправо """
+        distance = math.hypot(dx, dy)
+        direction = 1 if dx >= 0 else -1
+        self.angle = (self.angle + direction * math.degrees(distance / (self.size / 2))) % 360
 
-        # Загрузка текстуры из файла
-        texture_path = os.path.join('Images/pix-stone.png')
-        self.texture = QPixmap()
-
-        if not self.texture.load(texture_path):
-            print(f"Error loading texture: {texture_path}")
-            self.texture = None
-        else:
-            # Масштабируем изображение под размер объекта
-            self.texture = self.texture.scaled(
-                size, size,
-                Qt.IgnoreAspectRatio,
-                Qt.SmoothTransformation
-            )
+    def get_sprite(self):
+        """ Спрайт с кадром поворота, ближайшим к углу камня """
+        if self.texture_key is None:
+            return None
+        key = rotation_key(self.texture_path, self.size, self.size,
+                           rotation_frame(self.angle, ROTATION_FRAMES), ROTATION_FRAMES)
+        return Sprite(key, self.x, self.y, self.size, self.size)
 
     def set_target(self, target):
         """ Установка цели для движения """
         self.target = target
 
-    def move_towards_target(self):
-        """ Движение к цели """
+    def get_step(self):
+        """ Смещение к цели за один шаг (None - объект стоит на месте) """
 
         # Не двигается если нет цели или если цель перетаскивается
         if self.target is None or self.dragging:
-            return False
+            return None
 
         # Расчет вектора к цели
-        object_center = self.get_center()
-        target_center = self.target.get_center()
-        dx = target_center.x() - object_center.x()
-        dy = target_center.y() - object_center.y()
+        object_x, object_y = self.get_center()
+        target_x, target_y = self.target.get_center()
+        dx = target_x - object_x
+        dy = target_y - object_y
         distance = (dx ** 2 + dy ** 2) ** 0.5 # Пифагор Пифагорыч
 
         # Если расстояние небольшое - не двигаемся
         if distance < 10:
-            return False
+            return None
 
         # Нормализация вектора направления
         if distance > 0:
             dx /= distance
             dy /= distance
 
-        # Перемещение с учетом скорости
-        self.x += dx * self.speed
-        self.y += dy * self.speed
-        return True
+        # Смещение с учетом скорости
+        return dx * self.speed, dy * self.speed
 
+    def move_towards_target(self):
+        """ Движение к цели """
+        step = self.get_step()
+        if step is None:
+            return False
 
-    def draw(self, painter):
-        """ Отрисовка объекта """
-        if self.texture:
-            # Рисуем текстуру
-            painter.drawPixmap(
-                int(self.x),
-                int(self.y),
-                self.texture
-            )
-        else:
-            # Текстуры нет - заливаем цветом (треугольник)
-            color = self.color.lighter(150) if self.dragging else self.color
-            painter.setBrush(QBrush(color))
-            points = [
-                QPointF(self.x + self.size / 2, self.y),
-                QPointF(self.x, self.y + self.size),
-                QPointF(self.x + self.size, self.y + self.size)
-            ]
-            painter.drawPolygon(QPolygonF(points))
\ No newline at end of file
+        self.x += step[0]
+        self.y += step[1]
+        return True
@@ -1,8 +1,5 @@
-from PyQt5.QtCore import QPointF, Qt, QRectF
-from PyQt5.QtGui import QBrush, QPixmap, QColor, QPainter
-import os
-
 from Objects.GameObject import GameObject
+from Rendering.Sprite import Sprite, texture_key
 
 class StaticCircle(GameObject):
     """ Класс статичного круга (цели)"""
@@ -11,42 +8,22 @@ class StaticCircle(GameObject):
         super().__init__(x, y, color)
         self.radius = radius
         self.default_texture = 'Images/pix-earth.png'
-        self.load_texture(self.default_texture)
+        self.set_texture(self.default_texture)
 
-    def load_texture(self, texture_path):
-        """ Загрузка или смена текстуры """
-        self.texture = QPixmap()
-        if not self.texture.load(texture_path):
-            print(f"Error loading texture: {texture_path}")
-            self.texture = None
-        else:
-            self.texture = self.texture.scaled(
-                2 * self.radius,
-                2 * self.radius,
-                Qt.IgnoreAspectRatio,
-                Qt.SmoothTransformation
-            )
+    def set_texture(self, texture_path):
+        """ Смена текстуры (сама текстура берется из общего кэша) """
+        self.texture_key = texture_key(texture_path, 2 * self.radius, 2 * self.radius)
 
     def set_explosion(self):
         """ Установка текстуры взрыва """
-        self.load_texture('Images/pix-explosion.png')
+        self.set_texture('Images/pix-explosion.png')
 
     def reset_texture(self):
         """ Восстановление исходной текстуры """
-        self.load_texture(self.default_texture)
+        self.set_texture(self.default_texture)
 
-    def draw(self, painter):
-        """ Отрисовка фигуры """
-        if self.texture:
-            painter.drawPixmap(
-                int(self.x - self.radius),
-                int(self.y - self.radius),
-                self.texture
-            )
-        else:
-            painter.setBrush(QBrush(self.color))
-            painter.drawEllipse(
-                QPointF(self.x, self.y),
-                self.radius,
-                self.radius
-            )
\ No newline at end of file
+    def get_sprite(self):
+        """ Спрайт для отрисовки """
+        return Sprite(self.texture_key,
+                      self.x - self.radius, self.y - self.radius,
+                      2 * self.radius, 2 * self.radius)
@@ -0,0 +1,139 @@
+# Непрерывная проверка столкновений (swept-тесты) без зависимостей от Qt.
+# Прямоугольники - кортежи (x, y, w, h), точки и смещения - (x, y).
+# Время касания t - доля смещения за шаг (0..1).
+
+EPSILON = 1e-9
+
+
+def aabb_overlap(box1, box2):
+    """ Пересекаются ли два прямоугольника (строго, как check_collision) """
+    x1, y1, w1, h1 = box1
+    x2, y2, w2, h2 = box2
+    return x1 < x2 + w2 and x1 + w1 > x2 and y1 < y2 + h2 and y1 + h1 > y2
+
+
+def sweep_aabb(box, delta, other):
+    """ Время касания движущегося прямоугольника box с неподвижным other.
+    0.0 - уже пересекаются, None - за шаг не касаются """
+    x, y, w, h = box
+    dx, dy = delta
+    ox, oy, ow, oh = other
+
+    # Сумма Минковского: угол box движется как точка относительно
+    # прямоугольника other, расширенного на размеры box
+    t_enter, t_exit = 0.0, 1.0
+    for position, direction, low, high in ((x, dx, ox - w, ox + ow),
+                                           (y, dy, oy - h, oy + oh)):
+        if abs(direction) < EPSILON:
+            if not (low < position < high):
+                return None
+            continue
+        t0 = (low - position) / direction
+        t1 = (high - position) / direction
+        if t0 > t1:
+            t0, t1 = t1, t0
+        t_enter = max(t_enter, t0)
+        t_exit = min(t_exit, t1)
+        if t_enter >= t_exit:
+            return None
+    return t_enter
+
+
+def sweep_circle(center, delta, radius, other_center, other_radius):
+    """ Время касания движущегося круга с неподвижным кругом.
+    0.0 - уже пересекаются, None - за шаг не касаются """
+    px = center[0] - other_center[0]
+    py = center[1] - other_center[1]
+    dx, dy = delta
+    reach = radius + other_radius
+
+    # |p + t * d| = reach -> a t^2 + 2 b t + c = 0
+    c = px * px + py * py - reach * reach
+    if c < 0:
+        return 0.0
+    a = dx * dx + dy * dy
+    b = px * dx + py * dy
+    if a < EPSILON or b >= 0:
+        return None  # Не движется или удаляется
+
+    discriminant = b * b - a * c
+    if discriminant < 0:
+        return None
+    t = (-b - discriminant ** 0.5) / a
+    return t if t <= 1.0 else None
+
+
+def first_overlap(box, delta, obstacle, t_start, overlaps, samples=16, iterations=4):
+    """ Уточнение касания по форме: первое время от t_start, при котором
+    overlaps(dx, dy) (box, сдвинутый на (dx, dy), задевает obstacle по форме).
+    Проверяется только участок пути, где прямоугольники пересекаются: samples
+    равномерных точек, затем бисекция по t из iterations шагов. Участок не
+    длиннее суммы размеров box и obstacle (со стороной 80 - до ~230 пикселей,
+    шаг точек - до 15, после бисекции - до 1), поэтому стоимость
+    не зависит от скорости. None - формы разошлись, не коснувшись """
+    dx, dy = delta
+    x, y, w, h = box
+
+    # Выход из прямоугольника препятствия - касание обратного движения из конца пути
+    t_back = sweep_aabb((x + dx, y + dy, w, h), (-dx, -dy), obstacle)
+    t_end = 1.0 - t_back if t_back is not None else 1.0
+    if t_end < t_start:
+        t_end = t_start
+
+    if overlaps(dx * t_start, dy * t_start):
+        return t_start
+    low = t_start
+    for i in range(1, samples):
+        t = t_start + (t_end - t_start) * i / (samples - 1)
+        if overlaps(dx * t, dy * t):
+            # Формы касаются между low и t - бисекция
+            high = t
+            for _ in range(iterations):
+                middle = (low + high) / 2
+                if overlaps(dx * middle, dy * middle):
+                    high = middle
+                else:
+                    low = middle
+            return high
+        low = t
+    return None
+
+
+def clamp_motion(box, delta, obstacles, max_penetration, overlaps=None):
+    """ Ограничение смещения box по первому касанию с препятствиями.
+
+    После касания объект может продвинуться не более чем на max_penetration,
+    дальше перекрытие разрешает обычное расталкивание. Если box уже
+    пересекается с препятствием, ограничение действует только при движении
+    к его центру - так объект не проходит препятствие насквозь за несколько шагов.
+    overlaps(index, dx, dy) - точная проверка формы (маски): касанием считается
+    первое пересечение форм на пути после касания прямоугольников.
+    Возвращает (доля смещения 0..1, индекс препятствия или None) """
+    dx, dy = delta
+    distance = (dx * dx + dy * dy) ** 0.5
+    if distance < EPSILON:
+        return 1.0, None
+
+    x, y, w, h = box
+    first_t, first_index = None, None
+    for index, obstacle in enumerate(obstacles):
+        if aabb_overlap(box, obstacle):
+            ox, oy, ow, oh = obstacle
+            to_center_x = (ox + ow / 2) - (x + w / 2)
+            to_center_y = (oy + oh / 2) - (y + h / 2)
+            if dx * to_center_x + dy * to_center_y <= 0:
+                continue  # Выходит из препятствия
+            t = 0.0
+        else:
+            t = sweep_aabb(box, delta, obstacle)
+        if t is not None and overlaps is not None:
+            t = first_overlap(box, delta, obstacle, t,
+                              lambda dx, dy: overlaps(index, dx, dy))
+        if t is not None and (first_t is None or t < first_t):
+            first_t, first_index = t, index
+
+    if first_t is None:
+        return 1.0, None
+
+    allowed = first_t * distance + max_penetration
+    return min(1.0, allowed / distance), first_index
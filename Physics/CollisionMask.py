@@ -0,0 +1,102 @@
+import cv2
+import numpy as np
+
+# Маски столкновений по альфа-каналу текстур (без зависимостей от Qt).
+# Маска - булев массив (высота, ширина): True - непрозрачный пиксель.
+# Позиции масок - левые верхние углы объектов в пикселях игрового поля.
+
+ALPHA_THRESHOLD = 128  # Пиксель с альфой не ниже порога - часть формы
+
+
+class CollisionMasks:
+    """ Кэш масок: файл читается один раз, маска каждого размера
+    строится один раз (как текстуры в Rendering.TextureManager).
+    Маски кадров поворота строятся всем листом, как и их текстуры """
+
+    _instance = None
+
+    def __init__(self):
+        self._alphas = {}  # путь -> альфа-канал исходного файла (None - маски нет)
+        self._masks = {}   # (путь, ширина, высота[, кадр, кадров]) -> маска
+
+    @classmethod
+    def instance(cls):
+        """ Общий экземпляр кэша масок """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def source_alpha(self, path):
+        """ Альфа-канал файла (None, если файла нет или он без прозрачности) """
+        if path not in self._alphas:
+            image = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+            has_alpha = image is not None and image.ndim == 3 and image.shape[2] == 4
+            self._alphas[path] = image[:, :, 3] if has_alpha else None
+        return self._alphas[path]
+
+    def mask(self, path, width, height):
+        """ Маска текстуры path, растянутой до width x height (None - нет маски) """
+        key = (path, int(width), int(height))
+        if key not in self._masks:
+            alpha = self.source_alpha(path)
+            if alpha is None:
+                self._masks[key] = None
+            else:
+                scaled = cv2.resize(alpha, key[1:], interpolation=cv2.INTER_AREA)
+                self._masks[key] = scaled >= ALPHA_THRESHOLD
+        return self._masks[key]
+
+    def rotated_mask(self, path, width, height, frame, frames):
+        """ Маска кадра frame из frames заранее повернутых кадров текстуры
+        (тот же кадр, что рисует Rendering.TextureManager) """
+        key = (path, int(width), int(height), int(frame) % frames, frames)
+        if key not in self._masks:
+            self._render_rotations(path, int(width), int(height), frames)
+        return self._masks[key]
+
+    def _render_rotations(self, path, width, height, frames):
+        """ Маски всех кадров поворота: маска размера поворачивается вокруг
+        центра без сглаживания - как пиксельная текстура кадра """
+        mask = self.mask(path, width, height)
+        # Поворот вокруг центра маски: при четных размерах (у всех объектов игры)
+        # кадр совпадает с текстурой попиксельно, при нечетных - до полупикселя
+        center = ((width - 1) / 2, (height - 1) / 2)
+        for frame in range(frames):
+            key = (path, width, height, frame, frames)
+            if mask is None:
+                self._masks[key] = None
+                continue
+            # QPainter.rotate поворачивает по часовой стрелке, cv2 - против
+            matrix = cv2.getRotationMatrix2D(center, -360.0 * frame / frames, 1.0)
+            rotated = cv2.warpAffine(mask.view(np.uint8), matrix, (width, height),
+                                     flags=cv2.INTER_NEAREST)
+            self._masks[key] = rotated > 0
+
+
+def masks_overlap(mask1, x1, y1, mask2, x2, y2):
+    """ Пересекаются ли непрозрачные пиксели двух масок """
+    dx, dy = int(round(x2 - x1)), int(round(y2 - y1))
+    h1, w1 = mask1.shape
+    h2, w2 = mask2.shape
+    left, top = max(0, dx), max(0, dy)
+    right, bottom = min(w1, dx + w2), min(h1, dy + h2)
+    if left >= right or top >= bottom:
+        return False
+    return bool((mask1[top:bottom, left:right] &
+                 mask2[top - dy:bottom - dy, left - dx:right - dx]).any())
+
+
+def mask_circle_overlap(mask, x, y, center_x, center_y, radius):
+    """ Есть ли непрозрачный пиксель маски внутри круга """
+    h, w = mask.shape
+    left = max(0, int(center_x - radius - x))
+    top = max(0, int(center_y - radius - y))
+    right = min(w, int(np.ceil(center_x + radius - x)) + 1)
+    bottom = min(h, int(np.ceil(center_y + radius - y)) + 1)
+    if left >= right or top >= bottom:
+        return False
+    # Центры пикселей окна относительно центра круга
+    rows = np.arange(top, bottom)[:, None] + 0.5 + y - center_y
+    columns = np.arange(left, right)[None, :] + 0.5 + x - center_x
+    inside = rows ** 2 + columns ** 2 < radius ** 2
+    return bool((mask[top:bottom, left:right] & inside).any())
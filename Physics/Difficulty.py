@@ -0,0 +1,49 @@
+import math
+
+
+def linear(progress):
+    return progress
+
+
+def smoothstep(progress):
+    """ Плавный старт и плавный выход на максимум """
+    return progress * progress * (3 - 2 * progress)
+
+
+def exponential(progress):
+    """ Быстрый рост в начале, медленный у максимума """
+    return (1 - math.exp(-4 * progress)) / (1 - math.exp(-4))
+
+
+CURVES = {
+    'linear': linear,
+    'smoothstep': smoothstep,
+    'exponential': exponential,
+}
+
+
+class DifficultyCurve:
+    """ Скорость врагов как непрерывная функция активного времени:
+    от start_speed до max_speed за ramp_seconds по кривой curve """
+
+    def __init__(self, start_speed=1.0, max_speed=10.0, ramp_seconds=45.0, curve='linear'):
+        if curve not in CURVES:
+            raise ValueError(f"Unknown difficulty curve: {curve}")
+        self.start_speed = start_speed
+        self.max_speed = max_speed
+        self.ramp_seconds = ramp_seconds
+        self.curve_name = curve
+        self.curve = CURVES[curve]
+
+    @classmethod
+    def from_settings(cls, settings):
+        """ Кривая из настроек (ключи difficulty_*) """
+        return cls(settings['difficulty_start_speed'], settings['difficulty_max_speed'],
+                   settings['difficulty_ramp_seconds'], settings['difficulty_curve'])
+
+    def speed(self, active_time):
+        """ Скорость врагов через active_time секунд активной игры """
+        if self.ramp_seconds <= 0:
+            return self.max_speed
+        progress = min(max(active_time / self.ramp_seconds, 0.0), 1.0)
+        return self.start_speed + (self.max_speed - self.start_speed) * self.curve(progress)
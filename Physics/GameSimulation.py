@@ -0,0 +1,508 @@
+import hashlib
+import struct
+from collections import deque
+
+import numpy as np
+
+from Objects.DraggableSquare import DraggableSquare
+from Objects.ObjectWithTarget import ROTATION_FRAMES, ObjectWithTarget
+from Objects.StaticCircle import StaticCircle
+from Physics.Collision import clamp_motion, sweep_circle
+from Physics.CollisionMask import CollisionMasks, mask_circle_overlap, masks_overlap
+from Physics.Difficulty import DifficultyCurve
+from Physics.InputLog import InputLogWriter, quantize
+from Rendering.Sprite import rotation_frame
+
+
+class GameSimulation:
+    """ Игровая логика без Qt: объекты, столкновения, цели,
+    конец игры и рост скорости врагов.
+
+    Логика детерминирована: время задается длительностью каждого шага
+    (она пишется в журнал ввода), случайность берется только
+    из собственного генератора с зерном seed """
+
+    def __init__(self, width=800, height=800, seed=None, tick_seconds=1 / 30, difficulty=None,
+                 collision_masks=True):
+        """ Поле width x height в единицах мира (на экран его переносит
+        Rendering.Playfield.PlayfieldView),
+        tick_seconds - длительность шага по умолчанию,
+        difficulty - кривая скорости врагов (DifficultyCurve),
+        collision_masks - столкновения по непрозрачным пикселям текстур
+        (прямоугольники остаются быстрой предварительной проверкой;
+        False - только прямоугольники) """
+        self.width = width
+        self.height = height
+        self.tick_seconds = tick_seconds
+        self.difficulty = difficulty if difficulty is not None else DifficultyCurve()
+        self.collision_masks = collision_masks
+        self.recorder = None          # Запись ввода в журнал (InputLogWriter)
+        self.seed_random(seed)
+
+        # Начальные позиции объектов
+        self.initial_positions = {
+            'blue_square': (200, 100),
+            'pink_square': (500, 100),
+            'circle': (400, 100),
+            'beetle': (500, 600),
+            'beetle2': (200, 600)
+        }
+
+        # Создание объектов
+        blue_pos = self.initial_positions['blue_square']
+        pink_pos = self.initial_positions['pink_square']
+        beetle_pos = self.initial_positions['beetle']
+        beetle2_pos = self.initial_positions['beetle2']
+        circle_pos = self.initial_positions['circle']
+
+        self.pink_square = DraggableSquare(pink_pos[0], pink_pos[1], 80, (255, 105, 180))
+        self.beetle = ObjectWithTarget(beetle_pos[0], beetle_pos[1], 50, (0, 255, 0))
+        self.beetle2 = ObjectWithTarget(beetle2_pos[0], beetle2_pos[1], 50, (0, 255, 0))
+        self.orange_circle = StaticCircle(circle_pos[0], circle_pos[1], 70, (255, 165, 0))
+
+        self.squares = [
+            DraggableSquare(blue_pos[0], blue_pos[1], 80, (65, 105, 225)),
+            self.pink_square,
+            self.beetle,
+            self.beetle2
+        ]
+        self.enemies = [self.beetle, self.beetle2]
+
+        # Настройка целей для движущихся объектов
+        self.beetle.set_target(self.orange_circle)
+        self.beetle2.set_target(self.orange_circle)
+
+        # Непрерывная проверка столкновений: после первого касания объект
+        # продвигается не больше чем на половину самого маленького объекта
+        self.max_penetration = min(square.size for square in self.squares) / 2
+
+        self.drags = {}               # Перетаскиваемые объекты по слотам рук
+        self.events = deque(maxlen=64)  # События для эффектов: (имя, x, y), см. take_events
+        self.touching = set()         # Враги, упершиеся в препятствие на прошлом шаге
+        self.end_game = False         # Флаг завершения
+        self.speed = 1                # Текущая скорость врагов
+        self.active_time = 0.0        # Время активной игры (секунды, открытая ладонь)
+        self.set_speed(self.difficulty.speed(0.0))
+
+        # Счетчики для профилирования
+        self.tick = 0                 # Номер шага с начала партии
+        self.game_time = 0.0          # Время партии - сумма длительностей шагов, с
+        self.collisions = 0           # Разрешенных перекрытий объектов
+        self.swept_hits = 0           # Касаний, найденных swept-тестом
+        self.grabs = 0                # Захватов объектов курсором
+
+    def seed_random(self, seed=None):
+        """ Новый генератор случайных чисел (без зерна - случайное зерно) """
+        if seed is None:
+            seed = np.random.SeedSequence().entropy % 2 ** 64
+        self.seed = int(seed)
+        self.rng = np.random.default_rng(self.seed)
+
+    def reset(self, seed=None):
+        """ Сброс в начальное состояние (seed - зерно новой партии) """
+        self.stop_recording()
+        self.seed_random(seed)
+        self.tick = 0
+        self.game_time = 0.0
+
+        # Сброс позиций объектов
+        self.squares[0].x, self.squares[0].y = self.initial_positions['blue_square']
+        self.squares[1].x, self.squares[1].y = self.initial_positions['pink_square']
+        self.squares[2].x, self.squares[2].y = self.initial_positions['beetle']
+        self.orange_circle.x, self.orange_circle.y = self.initial_positions['circle']
+        self.beetle2.x, self.beetle2.y = self.initial_positions['beetle2']
+        self.orange_circle.reset_texture()
+        for enemy in self.enemies:
+            enemy.angle = 0.0
+
+        # Сброс состояния
+        self.release_drag()
+        self.events.clear()
+        self.touching.clear()
+        self.end_game = False
+        self.active_time = 0.0
+        if self.difficulty is not None:
+            self.set_speed(self.difficulty.speed(0.0))
+
+    def set_speed(self, speed):
+        """ Установка скорости врагов """
+        self.speed = speed
+        for enemy in self.enemies:
+            enemy.speed = speed
+
+    def start_recording(self, path):
+        """ Запись ввода партии в журнал для воспроизведения """
+        self.stop_recording()
+        self.recorder = InputLogWriter(path, self.seed, int(self.width), int(self.height),
+                                       self.tick_seconds, self.difficulty, self.collision_masks)
+
+    def stop_recording(self):
+        """ Завершение журнала хэшем текущего состояния """
+        if self.recorder is not None:
+            self.recorder.close(self.tick, self.state_digest())
+            self.recorder = None
+
+    def state_digest(self):
+        """ SHA-1 состояния игры - для побитовой сверки при воспроизведении """
+        values = [self.orange_circle.x, self.orange_circle.y, self.speed, self.active_time]
+        for square in self.squares:
+            values += [square.x, square.y]
+        values += [enemy.angle for enemy in self.enemies]  # Кадр поворота задает маску
+        digest = hashlib.sha1(struct.pack(f'<{len(values)}d', *values))
+        digest.update(struct.pack('<I??', self.tick, self.end_game, bool(self.drags)))
+        return digest.digest()
+
+    def take_events(self):
+        """ События с прошлого вызова (взрыв, удар, захват) - для эффектов
+        отрисовки, на игру не влияют """
+        events = list(self.events)
+        self.events.clear()
+        return events
+
+    @property
+    def dragging_square(self):
+        """ Объект, захваченный первой рукой (или None) """
+        return self.drags[min(self.drags)] if self.drags else None
+
+    def hand_lost(self):
+        """ Руки пропали из кадра - захваченные объекты отпускаются """
+        if self.recorder is not None:
+            self.recorder.write_hand_lost(self.tick)
+        self.release_drag()
+
+    def release_drag(self, slot=None):
+        """ Отпускание объекта руки slot (None - всех рук) """
+        for drag_slot in list(self.drags):
+            if slot is None or drag_slot == slot:
+                self.drags.pop(drag_slot).dragging = False
+
+    def step(self, x, y, gesture, dt=None):
+        """ Один тик игры с одной рукой: курсор в (x, y) (нормализованные
+        координаты), жест (0: ладонь, 1: кулак), dt - длительность шага
+        в секундах (по умолчанию tick_seconds) """
+        self.step_hands([(0, x, y, gesture)], dt)
+
+    def step_hands(self, hands, dt=None):
+        """ Один тик игры: hands - руки (слот, x, y, жест), у каждой руки
+        свой курсор и свой захваченный объект. Враги стоят, пока все руки
+        сжаты в кулак """
+        if self.end_game:
+            return
+
+        # Координаты и время с точностью журнала - запись и живая игра совпадают
+        hands = [(slot, quantize(x), quantize(y), gesture) for slot, x, y, gesture in hands]
+        dt = quantize(self.tick_seconds if dt is None else dt)
+        if self.recorder is not None:
+            self.recorder.write_step(self.tick, hands, dt)
+        self.tick += 1
+        self.game_time += dt
+
+        # Время активной игры и скорость врагов
+        active = any(gesture == 0 for _, _, _, gesture in hands)
+        if active:
+            self.update_difficulty(dt)
+
+        # Центры врагов в начале шага - для проверки всего пути до цели
+        enemy_starts = [(enemy, enemy.get_center()) for enemy in self.enemies]
+
+        # Проверка столкновений и отталкивание квадратов
+        self.resolve_collisions()
+
+        # Руки, пропавшие из кадра, отпускают свои объекты
+        present = {slot for slot, _, _, _ in hands}
+        for slot in [slot for slot in self.drags if slot not in present]:
+            self.release_drag(slot)
+
+        # Перетаскивание объектов
+        for slot, x, y, gesture in hands:
+            if gesture == 1:  # Кулак (зажатие)
+                self.drag(slot, x * self.width, y * self.height)
+            else:  # Ладонь (разжатие)
+                self.release_drag(slot)
+
+        # Движение врагов, пока хотя бы одна ладонь открыта. Скорость задана
+        # за шаг tick_seconds - путь за секунду не зависит от частоты кадров
+        if active:
+            for enemy in self.enemies:
+                self.move_enemy(enemy, dt / self.tick_seconds)
+
+        # Проверка на конец игры (по всему пути врага за шаг)
+        if any(self.check_circle_collision(enemy, self.orange_circle, start)
+               for enemy, start in enemy_starts):
+            self.end_game = True
+            self.release_drag()
+            self.orange_circle.set_explosion()
+            self.events.append(('explosion',) + self.orange_circle.get_center())
+
+        # Обрабатываем столкновения со стенами
+        self.resolve_wall_collisions()
+
+    def drag(self, slot, abs_x, abs_y):
+        """ Кулак руки slot в точке (abs_x, abs_y): перетаскивание
+        захваченного объекта или захват объекта под курсором """
+        square = self.drags.get(slot)
+        if square is not None:
+            # Продолжаем перетаскивание текущего квадрата
+            self.move_dragged_square(square, abs_x, abs_y)
+
+            # Гарантируем, что перетаскиваемый квадрат остается в пределах
+            self.ensure_square_in_bounds(square)
+            return
+
+        # Проверяем, находится ли курсор над свободным квадратом
+        for square in self.squares:
+            if not square.dragging and square.contains_point(abs_x, abs_y):
+                # Начинаем перетаскивание этого квадрата
+                self.drags[slot] = square
+                square.dragging = True
+                self.grabs += 1
+                self.events.append(('grab', abs_x, abs_y))
+                # Центрируем квадрат относительно курсора
+                square.x = abs_x - square.size // 2
+                square.y = abs_y - square.size // 2
+                break
+
+    def update_difficulty(self, dt):
+        """ Учет активного времени и скорость врагов по кривой сложности """
+        self.active_time += dt
+        if self.difficulty is not None:
+            self.set_speed(self.difficulty.speed(self.active_time))
+
+    def get_obstacles(self, square):
+        """ Объекты, с которыми может столкнуться square """
+        return [other for other in self.squares
+                if other is not square and not (isinstance(square, ObjectWithTarget)
+                                                and isinstance(other, ObjectWithTarget))]
+
+    def collision_mask(self, obj):
+        """ Маска формы объекта (None - столкновения по прямоугольнику) """
+        if not self.collision_masks or getattr(obj, 'texture_path', None) is None:
+            return None
+        masks = CollisionMasks.instance()
+        if isinstance(obj, ObjectWithTarget):
+            # Форма того кадра поворота, который виден на экране
+            return masks.rotated_mask(obj.texture_path, obj.size, obj.size,
+                                      rotation_frame(obj.angle, ROTATION_FRAMES), ROTATION_FRAMES)
+        return masks.mask(obj.texture_path, obj.size, obj.size)
+
+    def shapes_overlap(self, square1, square2, dx=0.0, dy=0.0):
+        """ Точная проверка форм (square1 сдвинут на (dx, dy)) для объектов,
+        чьи прямоугольники уже пересекаются """
+        mask1, mask2 = self.collision_mask(square1), self.collision_mask(square2)
+        if mask1 is None or mask2 is None:
+            return True
+        return masks_overlap(mask1, square1.x + dx, square1.y + dy, mask2, square2.x, square2.y)
+
+    def sweep_square(self, square, dx, dy):
+        """ Перемещение square на (dx, dy) с остановкой после первого касания.
+        Возвращает препятствие, которого коснулся square (или None) """
+        others = self.get_obstacles(square)
+        obstacles = [other.get_box() for other in others]
+        overlaps = None
+        if self.collision_masks:
+            def overlaps(index, move_x, move_y):
+                return self.shapes_overlap(square, others[index], move_x, move_y)
+        fraction, hit = clamp_motion(square.get_box(), (dx, dy), obstacles,
+                                     self.max_penetration, overlaps)
+        if hit is not None:
+            self.swept_hits += 1
+
+        square.x += dx * fraction
+        square.y += dy * fraction
+        return others[hit] if hit is not None else None
+
+    def move_dragged_square(self, square, cursor_x, cursor_y):
+        """ Перемещение захваченного объекта к курсору """
+        # Курсор может перескочить далеко между кадрами трекера -
+        # объект не должен проскочить сквозь препятствие
+        self.sweep_square(square,
+                          cursor_x - square.size // 2 - square.x,
+                          cursor_y - square.size // 2 - square.y)
+
+    def move_enemy(self, enemy, scale=1.0):
+        """ Движение врага к цели с проверкой касаний по пути,
+        scale - длительность шага в шагах tick_seconds """
+        step = enemy.get_step()
+        if step is None:
+            return
+        start_x, start_y = enemy.x, enemy.y
+        obstacle = self.sweep_square(enemy, step[0] * scale, step[1] * scale)
+        enemy.roll(enemy.x - start_x, enemy.y - start_y)
+
+        # Удар - только первое касание, а не каждый шаг упора в препятствие
+        if obstacle is None:
+            self.touching.discard(enemy)
+        elif enemy not in self.touching:
+            self.touching.add(enemy)
+            (x1, y1), (x2, y2) = enemy.get_center(), obstacle.get_center()
+            self.events.append(('impact', (x1 + x2) / 2, (y1 + y2) / 2))
+
+    def ensure_square_in_bounds(self, square):
+        """ Проверка нахождения объектов в пределах границ """
+
+        # TODO оптимизировать
+
+        # Левая граница
+        if square.x < 0:
+            square.x = 0
+
+        # Верхняя граница
+        if square.y < 0:
+            square.y = 0
+
+        # Правая граница
+        if square.x + square.size > self.width:
+            square.x = self.width - square.size
+
+        # Нижняя граница
+        if square.y + square.size > self.height:
+            square.y = self.height - square.size
+
+    def resolve_wall_collisions(self):
+        """ Обработка столкновений объектов со стенами """
+        for square in self.squares:
+            self.ensure_square_in_bounds(square)
+
+    def resolve_collisions(self):
+        """ Обработка столкновений объектов"""
+
+        # Проверяем все пары объектов
+        for i in range(len(self.squares)):
+            for j in range(i + 1, len(self.squares)):
+                obj1 = self.squares[i]
+                obj2 = self.squares[j]
+
+                # Пропуск столкновений между врагами
+                if (isinstance(obj1, ObjectWithTarget)
+                        and isinstance(obj2, ObjectWithTarget)):
+                    continue
+
+                if self.check_collision(obj1, obj2):
+                    self.collisions += 1
+                    self.push_objects_apart(obj1, obj2)
+
+        # Проверяем столкновения квадратов с кругом
+        for square in self.squares:
+            if not isinstance(square, ObjectWithTarget):  # Не враги
+                if self.check_square_circle_collision(square, self.orange_circle):
+                    self.push_square_from_circle(square, self.orange_circle)
+
+    def check_collision(self, square1, square2):
+        """ Проверка столкновения двух квадратов """
+        # Проверяем пересечение по осям X и Y
+        boxes_overlap = (square1.x < square2.x + square2.size and
+                         square1.x + square1.size > square2.x and
+                         square1.y < square2.y + square2.size and
+                         square1.y + square1.size > square2.y)
+        # Формы сравниваются только для пересекающихся прямоугольников
+        return boxes_overlap and (not self.collision_masks or self.shapes_overlap(square1, square2))
+
+    def check_square_circle_collision(self, square, circle):
+        """Проверяет столкновение квадрата и круга"""
+        # Находим ближайшую точку на квадрате к центру круга
+        closest_x = max(square.x, min(circle.x, square.x + square.size))
+        closest_y = max(square.y, min(circle.y, square.y + square.size))
+
+        # Расстояние между ближайшей точкой и центром круга
+        distance = ((circle.x - closest_x) ** 2 + (circle.y - closest_y) ** 2) ** 0.5
+        if distance >= circle.radius:
+            return False
+
+        mask = self.collision_mask(square)
+        return mask is None or mask_circle_overlap(mask, square.x, square.y,
+                                                   circle.x, circle.y, circle.radius)
+
+    def push_square_from_circle(self, square, circle):
+        """ Отталкивает квадрат от круга """
+        if square.dragging:
+            return  # Не отталкиваем перетаскиваемый квадрат
+
+        # Вектор от центра круга к центру квадрата
+        square_x, square_y = square.get_center()
+        circle_x, circle_y = circle.get_center()
+
+        dx = square_x - circle_x
+        dy = square_y - circle_y
+
+        # Если центры совпадают, добавляем случайное смещение
+        if abs(dx) < 1e-5 and abs(dy) < 1e-5:
+            dx = (self.rng.random() - 0.5) * 10
+            dy = (self.rng.random() - 0.5) * 10
+
+        # Нормализуем вектор
+        length = max(1e-5, (dx ** 2 + dy ** 2) ** 0.5)
+        dx /= length
+        dy /= length
+
+        # Минимальное расстояние (радиус круга + половина диагонали квадрата)
+        min_distance = circle.radius + (square.size * 0.7)
+
+        # Текущее расстояние между центрами
+        current_distance = ((square_x - circle_x) ** 2 +
+                            (square_y - circle_y) ** 2) ** 0.5
+
+        # Если объекты пересекаются, отталкиваем квадрат
+        if current_distance < min_distance:
+            # Сила отталкивания
+            force = (min_distance - current_distance) * 0.7
+
+            # Смещаем квадрат от круга
+            square.x += dx * force
+            square.y += dy * force
+
+    def check_circle_collision(self, beetle, circle, start=None):
+        """ Проверка столкновения врага с кругом.
+        start - центр врага в начале шага: проверяется весь путь от него """
+        beetle_x, beetle_y = beetle.get_center()
+        if start is None:
+            start = beetle_x, beetle_y
+
+        # Сумма радиусов (для жука берем половину размера как радиус)
+        t = sweep_circle(
+            start,
+            (beetle_x - start[0], beetle_y - start[1]),
+            beetle.size / 2,
+            circle.get_center(),
+            circle.radius
+        )
+        return t is not None
+
+    def push_objects_apart(self, square1, square2):
+        """ Отталкивание объектов друг от друга"""
+
+        # Рассчитываем вектор между центрами
+        x1, y1 = square1.get_center()
+        x2, y2 = square2.get_center()
+
+        dx = x2 - x1
+        dy = y2 - y1
+
+        # Если квадраты находятся точно друг на друге, добавляем случайное смещение
+        if abs(dx) < 1e-5 and abs(dy) < 1e-5:
+            dx = (self.rng.random() - 0.5) * 10
+            dy = (self.rng.random() - 0.5) * 10
+
+        # Нормализуем вектор
+        length = max(1e-5, (dx ** 2 + dy ** 2) ** 0.5)
+        dx /= length
+        dy /= length
+
+        # Минимальное расстояние между центрами (диагональ квадратов)
+        min_distance = (square1.size + square2.size) * 0.7
+
+        # Текущее расстояние
+        current_distance = ((x2 - x1) ** 2 + (y2 - y1) ** 2) ** 0.5
+
+        # Если квадраты пересекаются, отталкиваем их
+        if current_distance < min_distance:
+            # Сила отталкивания
+            force = (min_distance - current_distance) * 0.5
+
+            # Смещаем квадраты в противоположных направлениях
+            if not square1.dragging:
+                square1.x -= dx * force
+                square1.y -= dy * force
+
+            if not square2.dragging:
+                square2.x += dx * force
+                square2.y += dy * force
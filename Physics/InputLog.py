@@ -0,0 +1,139 @@
+import struct
+
+from Physics.Difficulty import CURVES, DifficultyCurve
+
+# Формат журнала ввода (little-endian):
+#   заголовок: магия, версия, зерно, ширина и высота поля, длительность тика
+#   сложность: начальная и максимальная скорость, время разгона, номер кривой
+#   физика:    флаги PHYSICS_*
+#   записи:    байт типа + данные записи; руки шага, кроме первой,
+#              пишутся перед шагом записями RECORD_HAND
+#   конец:     тик и SHA-1 состояния игры - для проверки воспроизведения
+# Читается только текущая версия формата
+MAGIC = b'HDIL'
+VERSION = 2  # 2: путь врагов за шаг пропорционален длительности шага
+HEADER = struct.Struct('<4sHQHHd')
+DIFFICULTY = struct.Struct('<dddB')
+PHYSICS = struct.Struct('<B')
+PHYSICS_COLLISION_MASKS = 1  # Столкновения по маскам текстур
+CURVE_NAMES = tuple(CURVES)
+
+RECORD_STEP = 0       # Шаг: тик, x, y, жест, длительность шага, слот первой руки
+RECORD_HAND_LOST = 1  # Потеря всех рук: тик
+RECORD_END = 2        # Конец журнала: тик, хэш состояния
+RECORD_HAND = 3       # Еще одна рука шага: тик, слот, x, y, жест
+
+RECORD_FORMATS = {
+    RECORD_STEP: struct.Struct('<IffBfB'),
+    RECORD_HAND_LOST: struct.Struct('<I'),
+    RECORD_END: struct.Struct('<I20s'),
+    RECORD_HAND: struct.Struct('<IBffB'),
+}
+
+
+class InputLogWriter:
+    """ Запись ввода игры в компактный двоичный журнал """
+
+    def __init__(self, path, seed, width, height, tick_seconds, difficulty=None,
+                 collision_masks=True):
+        self.path = path
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, seed, width, height, tick_seconds))
+        difficulty = difficulty or DifficultyCurve()
+        self.file.write(DIFFICULTY.pack(difficulty.start_speed, difficulty.max_speed,
+                                        difficulty.ramp_seconds,
+                                        CURVE_NAMES.index(difficulty.curve_name)))
+        self.file.write(PHYSICS.pack(PHYSICS_COLLISION_MASKS if collision_masks else 0))
+        self.records = 0
+
+    def write_step(self, tick, hands, dt):
+        """ Шаг с руками hands [(слот, x, y, жест)] """
+        for slot, x, y, gesture in hands[1:]:
+            self._write(RECORD_HAND, tick, slot, x, y, gesture)
+        slot, x, y, gesture = hands[0]
+        self._write(RECORD_STEP, tick, x, y, gesture, dt, slot)
+
+    def write_hand_lost(self, tick):
+        self._write(RECORD_HAND_LOST, tick)
+
+    def close(self, tick, digest):
+        """ Запись хэша конечного состояния и закрытие файла """
+        if self.file is None:
+            return
+        self._write(RECORD_END, tick, digest)
+        self.file.close()
+        self.file = None
+
+    def _write(self, kind, *values):
+        self.file.write(bytes((kind,)))
+        self.file.write(RECORD_FORMATS[kind].pack(*values))
+        self.records += 1
+
+
+def read_input_log(path):
+    """ Чтение журнала: (заголовок, список записей (тип, значения...)).
+    Журнал, оборванный при аварийном завершении, читается до последней
+    целой записи - без записи конца """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    offset = HEADER.size + DIFFICULTY.size + PHYSICS.size
+    if len(data) < offset:
+        raise ValueError(f"Unsupported input log: {path}")
+    magic, version, seed, width, height, tick_seconds = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Unsupported input log: {path}")
+    start_speed, max_speed, ramp_seconds, curve = DIFFICULTY.unpack_from(data, HEADER.size)
+    flags, = PHYSICS.unpack_from(data, HEADER.size + DIFFICULTY.size)
+    header = {
+        'seed': seed, 'width': width, 'height': height, 'tick_seconds': tick_seconds,
+        'difficulty': DifficultyCurve(start_speed, max_speed, ramp_seconds, CURVE_NAMES[curve]),
+        'collision_masks': bool(flags & PHYSICS_COLLISION_MASKS),
+    }
+
+    records = []
+    while offset < len(data):
+        kind = data[offset]
+        record_format = RECORD_FORMATS.get(kind)
+        if record_format is None or offset + 1 + record_format.size > len(data):
+            break  # Оборванный хвост или мусор вместо записи
+        record = (kind,) + record_format.unpack_from(data, offset + 1)
+        records.append(record)
+        offset += 1 + record_format.size
+    return header, records
+
+
+def quantize(value):
+    """ Округление до float32 - так координаты и время хранятся в журнале """
+    return struct.unpack('<f', struct.pack('<f', value))[0]
+
+
+def replay(path):
+    """ Воспроизведение журнала без графики.
+    Возвращает (симуляция, совпал ли хэш состояния с записанным или None) """
+    # Импорт здесь: GameSimulation сам использует этот модуль для записи
+    from Physics.GameSimulation import GameSimulation
+
+    header, records = read_input_log(path)
+    simulation = GameSimulation(header['width'], header['height'],
+                                seed=header['seed'], tick_seconds=header['tick_seconds'],
+                                difficulty=header['difficulty'],
+                                collision_masks=header['collision_masks'])
+    matched = None
+    extra_hands = []  # Руки шага, записанные перед ним
+    for record in records:
+        kind, tick = record[0], record[1]
+        if kind == RECORD_END:
+            matched = tick == simulation.tick and record[2] == simulation.state_digest()
+            break
+        if tick != simulation.tick:
+            raise ValueError(f"Input log out of sync at tick {simulation.tick}: {record}")
+        if kind == RECORD_HAND:
+            extra_hands.append(record[2:])
+        elif kind == RECORD_STEP:
+            hands = [(record[6], record[2], record[3], record[4])] + extra_hands
+            simulation.step_hands(hands, record[5])
+            extra_hands = []
+        elif kind == RECORD_HAND_LOST:
+            simulation.hand_lost()
+    return simulation, matched
@@ -0,0 +1,55 @@
+import numpy as np
+from sklearn.neighbors import KDTree
+
+
+def prune_near_duplicates(data, labels, radius):
+    """ Удаление почти одинаковых строк (соседние кадры одной позы):
+    в каждом классе строка остается, только если в радиусе radius нет
+    уже оставленной. Возвращает индексы оставленных строк """
+    keep = []
+    for label in np.unique(labels):
+        indices = np.flatnonzero(labels == label)
+        neighbours = KDTree(data[indices]).query_radius(data[indices], radius)
+        removed = np.zeros(len(indices), dtype=bool)
+        for i, near in enumerate(neighbours):
+            if removed[i]:
+                continue
+            keep.append(indices[i])
+            removed[near] = True
+    return np.sort(np.array(keep, dtype=int))
+
+
+def farthest_points(data, count, rng):
+    """ count строк, покрывающих data: каждая следующая - самая далекая
+    от уже выбранных (жадный k-center) """
+    chosen = [int(rng.integers(len(data)))]
+    distances = np.linalg.norm(data - data[chosen[0]], axis=1)
+    for _ in range(min(count, len(data)) - 1):
+        chosen.append(int(np.argmax(distances)))
+        distances = np.minimum(distances, np.linalg.norm(data - data[chosen[-1]], axis=1))
+    return np.array(chosen, dtype=int)
+
+
+def select_coreset(data, labels, size, seed=0):
+    """ Сбалансированное по классам подмножество не больше size строк:
+    поровну на класс, внутри класса - строки, покрывающие все позы.
+    Возвращает индексы выбранных строк """
+    rng = np.random.default_rng(seed)
+    classes = np.unique(labels)
+    quota = max(size // len(classes), 1)
+    chosen = []
+    for label in classes:
+        indices = np.flatnonzero(labels == label)
+        chosen.append(indices[farthest_points(data[indices], quota, rng)])
+    return np.sort(np.concatenate(chosen))
+
+
+def reduce_dataset(data, labels, radius=0.0, coreset_size=0):
+    """ Сокращение обучающих данных: удаление дубликатов (radius > 0),
+    затем ядро из coreset_size строк (0 - без него). Возвращает индексы строк """
+    indices = np.arange(len(data))
+    if radius > 0:
+        indices = indices[prune_near_duplicates(data[indices], labels[indices], radius)]
+    if 0 < coreset_size < len(indices):
+        indices = indices[select_coreset(data[indices], labels[indices], coreset_size)]
+    return indices
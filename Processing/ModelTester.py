@@ -0,0 +1,125 @@
+import time
+from collections import deque, namedtuple
+
+import cv2
+import numpy as np
+
+from Camera.CameraService import CameraService
+from HandTrackerThread import HandTrackerThread, create_hands
+from Tracking.HandFeatures import CENTER_LANDMARK, hand_features, mirror_points
+
+# Этапы обработки кадра при проверке модели
+STAGES = ('camera', 'detect', 'classify', 'preview')
+
+# Результат проверки одного кадра:
+#   gesture    - предсказанный жест первой руки или None, если руки нет
+#   confidence - вероятность предсказанного жеста (None, если модель ее не дает)
+#   timings    - длительность этапов STAGES, с
+#   frame      - кадр превью BGR
+TestResult = namedtuple('TestResult', ['index', 'captured', 'gesture', 'confidence', 'timings', 'frame'])
+
+
+class RollingConfusion:
+    """ Матрица ошибок по последним window кадрам с известным жестом """
+
+    def __init__(self, labels, window=300):
+        self.labels = labels  # Номер жеста -> название
+        self.samples = deque(maxlen=window)  # (истинный жест, предсказанный)
+
+    def add(self, truth, predicted):
+        self.samples.append((truth, predicted))
+
+    def clear(self):
+        self.samples.clear()
+
+    def matrix(self):
+        """ Матрица: строки - истинный жест, столбцы - предсказанный """
+        size = len(self.labels)
+        matrix = np.zeros((size, size), dtype=int)
+        for truth, predicted in self.samples:
+            matrix[truth, predicted] += 1
+        return matrix
+
+    def accuracy(self):
+        if not self.samples:
+            return None
+        return np.trace(self.matrix()) / len(self.samples)
+
+
+class ModelTesterThread(HandTrackerThread):
+    """ Проверка модели жестов на живой камере тем же путем, что и в игре:
+    поиск рук в режиме слежения (не отдельными изображениями), признаки
+    и классификатор трекера. Результаты - в почтовый ящик, как у трекера """
+
+    def __init__(self):
+        super().__init__()
+        self.hands = None
+        self.fps = 0.0  # Частота обработанных кадров (сглаженная)
+
+    def init_camera(self):
+        self.camera = CameraService.instance().subscribe('model test')
+        return self.camera is not None
+
+    def run(self):
+        try:
+            if not self.init_camera() or not self.load_model():
+                self.tracker_ready.emit(False)
+                return
+            # Первое создание графа MediaPipe занимает секунды - поток
+            # могут остановить раньше, тогда цикл не начнется
+            self.hands = create_hands()
+            self.tracker_ready.emit(True)
+            self.test_loop()
+        finally:
+            if self.hands is not None:
+                self.hands.close()
+                self.hands = None
+            self.release_camera()
+
+    def test_loop(self):
+        """ Проверка кадров, пока поток не остановят """
+        last_frame = None
+        while self.running:
+            start = time.perf_counter()
+            camera_frame = self.camera.read(0.5)
+            if camera_frame is None or not self.running:
+                continue
+            result = self.test_frame(camera_frame, time.perf_counter() - start)
+
+            now = time.perf_counter()
+            if last_frame is not None:
+                self.fps += 0.1 * (1 / max(now - last_frame, 1e-6) - self.fps)
+            last_frame = now
+            self.mailbox.post(result)
+
+    def test_frame(self, camera_frame, camera_time):
+        """ Распознавание жеста первой руки кадра с замером этапов """
+        timings = {'camera': camera_time}
+        frame = camera_frame.image
+
+        start = time.perf_counter()
+        points = self.hands.detect(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB), camera_frame.timestamp)
+        timings['detect'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        gesture, confidence, hands = None, None, ()
+        if len(points):
+            points = mirror_points(points[:1])
+            gesture, confidence = self.classify(hand_features(points))
+            x, y = points[0, CENTER_LANDMARK]
+            hands = [(0, x, y, gesture)]
+        timings['classify'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        preview = self.make_preview(frame, hands)
+        timings['preview'] = time.perf_counter() - start
+        return TestResult(camera_frame.index, camera_frame.timestamp,
+                          gesture, confidence, timings, preview)
+
+    def classify(self, features):
+        """ (жест, вероятность) по признакам одной руки """
+        if not hasattr(self.model, 'predict_proba'):
+            return int(self.model.predict(features)[0]), None
+        probabilities = self.model.predict_proba(features)[0]
+        best = int(np.argmax(probabilities))
+        return int(self.model.classes_[best]), float(probabilities[best])
@@ -10,20 +10,60 @@ from sklearn.metrics import accuracy_score
 
 from PIL import ImageFont, ImageDraw, Image
 import shutil
+import time
+
+from Camera.CameraService import CameraService
+from Diagnostics.Log import get_logger
+from Processing.Coreset import reduce_dataset
+from Processing.SmartCollection import NoveltySelector
+from Settings import get_settings
+from Tracking.HandBackends import create_hand_backend
+from Tracking.HandFeatures import hand_features
+
+log = get_logger('processing')
+
+
+def load_provisional_model():
+    """ Уже обученная модель для отбора кадров, на которых она не уверена (или None) """
+    from HandTrackerThread import load_gesture_model
+    try:
+        return load_gesture_model()
+    except Exception:
+        return None
+
+
+def create_selector(settings, gesture, model):
+    """ Отбор новых кадров при collection_mode = 'smart' """
+    return NoveltySelector(
+        threshold=settings['collection_novelty'],
+        patience=settings['collection_patience'],
+        min_samples=settings['collection_min_samples'],
+        max_samples=settings['collection_max_samples'],
+        model=model,
+        gesture=gesture,
+        uncertainty=settings['collection_uncertainty'],
+    )
+
+
+def collection_done(counter, dataset_size, selector):
+    """ Конец сбора класса: без отбора - dataset_size снимков,
+    с отбором - новые позы перестали появляться """
+    if selector is None:
+        return counter >= dataset_size
+    return selector.saturated
 
 
 def collect_data():
-    """Сбор датасета жестов пользователя с помощью камеры """
+    """Сбор датасета жестов пользователя с помощью камеры.
+    collection_mode = 'fixed': dataset_size кадров с интервалом wait;
+    'smart': точки руки ищутся на лету и сохраняются только новые позы,
+    сбор класса заканчивается, когда новые позы перестают появляться """
 
+    camera = None
+    hands = None
     try:
-        try:
-            temp_cap = cv2.VideoCapture(0)
-            if temp_cap.isOpened():
-                temp_cap.release()
-                print("Pre-release camera before collection")
-            cv2.destroyAllWindows()
-        except Exception as e:
-            print(f"Pre-release error: {e}")
+        settings = get_settings()
+        smart = settings['collection_mode'] == 'smart'
 
         DATA_DIR = 'data'
         if not os.path.exists(DATA_DIR):
@@ -33,19 +73,31 @@ def collect_data():
         dataset_size = 200    # Количество изображений для одного класса
         wait = 100            # Задержка между кадрами (мс)
 
-        cap = cv2.VideoCapture(0) # Захват камеры
+        # Кадры общей камеры (устройство уже открыто CameraService)
+        camera = CameraService.instance().subscribe('collection')
+        if camera is None:
+            raise RuntimeError("Не удалось открыть камеру")
+
+        model = None
+        if smart:
+            hands = create_hand_backend(settings)  # Режим слежения, как в игре
+            model = load_provisional_model()
+            if model is not None:
+                log.info("Предварительная модель найдена: приоритет кадрам, где она не уверена")
 
         for j in range(number_of_classes):
             class_dir = os.path.join(DATA_DIR, str(j))
             if not os.path.exists(class_dir):
                 os.makedirs(class_dir)
 
-            print(f'Сбор данных для класса {j}')
+            log.info("Сбор данных для класса %d", j)
 
             # Ожидание готовности пользователя
             while True:
-                ret, frame = cap.read()
-                frame = cv2.flip(frame, 1)  # Зеркальное отражение
+                camera_frame = camera.read()
+                if camera_frame is None:
+                    continue
+                frame = cv2.flip(camera_frame.image, 1)  # Зеркальное отражение
 
                 # Определение текста в зависимости от значения j
                 if j == 0:
@@ -72,45 +124,59 @@ def collect_data():
 
             # Сбор изображений
             counter = 0
-            while counter < dataset_size:
-                ret, frame = cap.read()
-                frame = cv2.flip(frame, 1)  # Зеркальное отражение
+            selector = create_selector(settings, j, model) if smart else None
+            start = time.monotonic()
+            while not collection_done(counter, dataset_size, selector):
+                camera_frame = camera.read()
+                if camera_frame is None:
+                    continue
+                frame = cv2.flip(camera_frame.image, 1)  # Зеркальное отражение
+
+                keep = True
+                if selector is None:
+                    progress = int((counter / dataset_size) * 100)
+                    progress_text = f'Progress: {progress}%'
+                else:
+                    # Точки руки на отраженном кадре - как при разметке сохраненного файла
+                    points = hands.detect(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB), camera_frame.timestamp)
+                    keep = len(points) > 0 and selector.consider(hand_features(points[:1])[0])[0]
+                    progress_text = f'Saved: {counter}  no new: {selector.since_kept}/{selector.patience}'
 
-                progress = int((counter / dataset_size) * 100)
-                progress_text = f'Progress: {progress}%'
+                # Надпись только на показываемом кадре
+                shown = frame.copy()
                 cv2.putText(
-                    frame, progress_text, (100, 100),
+                    shown, progress_text, (100, 100),
                     cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 165, 255), 2, cv2.LINE_AA
                 )
 
-                cv2.imshow('frame', frame)
-
-                cv2.imshow('frame', frame)
-                cv2.waitKey(wait)
+                cv2.imshow('frame', shown)
+                cv2.waitKey(wait if selector is None else 1)
 
                 # Сохранение изображения
-                img_path = os.path.join(class_dir, f'{counter}.jpg')
-                cv2.imwrite(img_path, frame)
-                counter += 1
+                if keep:
+                    img_path = os.path.join(class_dir, f'{counter}.jpg')
+                    cv2.imwrite(img_path, frame)
+                    counter += 1
+
+            if selector is not None:
+                log.info("Класс %d: сохранено %d из %d кадров с рукой за %.1f с",
+                         j, counter, selector.considered, time.monotonic() - start)
 
-        cap.release()
         cv2.destroyAllWindows()
-        print("Сбор данных завершен!")
+        log.info("Сбор данных завершен!")
 
     except Exception as e:
-        print(f"Критическая ошибка в collect_data: {str(e)}")
+        log.error("Критическая ошибка в collect_data: %s", e)
         # Дополнительная обработка для Access Violation
         if "access violation" in str(e).lower() or "0xC0000005" in str(e):
-            print("Обнаружено нарушение доступа к памяти. Попробуйте перезапустить приложение.")
+            log.error("Обнаружено нарушение доступа к памяти. Попробуйте перезапустить приложение.")
         raise  # Перебрасываем исключение для обработки в вызывающем коде
 
     finally:
-        try:
-            if 'cap' in locals() and cap.isOpened():
-                cap.release()
-                print("Камера явно освобождена")
-        except:
-            pass
+        if hands is not None:
+            hands.close()
+        if camera is not None:
+            camera.close()
         cv2.destroyAllWindows()
 
 
@@ -145,7 +211,7 @@ def create_dataset():
 
             # Проверка загрузки изображения
             if img is None:
-                print(f"Ошибка загрузки: {img_path}")
+                log.warning("Ошибка загрузки: %s", img_path)
                 skipped_files.append(img_path)
                 continue
 
@@ -163,7 +229,7 @@ def create_dataset():
 
             if not results.multi_hand_landmarks:
                 skipped_files.append(img_path)
-                print(f"Рука не обнаружена: {img_path}")
+                log.info("Рука не обнаружена: %s", img_path)
                 continue
 
             # Обработка только первой обнаруженной руки
@@ -188,17 +254,15 @@ def create_dataset():
     if data:
         with open('data.pickle', 'wb') as f:
             pickle.dump({'data': data, 'labels': labels}, f)
-        print(f"Успешно обработано: {len(data)} изображений")
+        log.info("Успешно обработано: %d изображений", len(data))
     else:
-        print("Данные для сохранения отсутствуют!")
+        log.warning("Данные для сохранения отсутствуют!")
 
     # Отчет о пропущенных файлах
     if skipped_files:
-        print(f"\nПропущено {len(skipped_files)} изображений:")
-        for i, path in enumerate(skipped_files[:5]):  # Первые 5 для примера
-            print(f"  {i + 1}. {path}")
-        if len(skipped_files) > 5:
-            print(f"  ...и еще {len(skipped_files) - 5}")
+        examples = ', '.join(skipped_files[:5])  # Первые 5 для примера
+        more = f" и еще {len(skipped_files) - 5}" if len(skipped_files) > 5 else ""
+        log.info("Пропущено %d изображений: %s%s", len(skipped_files), examples, more)
 
 
 def train_model():
@@ -213,14 +277,29 @@ def train_model():
         data, labels, test_size=0.2, shuffle=True, stratify=labels
     )
 
+    # Сокращение только обучающей выборки: тестовая остается полной
+    settings = get_settings()
+    kept = reduce_dataset(x_train, y_train, settings['dataset_dedup_radius'],
+                          settings['dataset_coreset_size'])
+    log.info("Обучающих строк: %d из %d (%s)", len(kept), len(x_train),
+             ', '.join(f"{label}: {count}" for label, count in
+                       zip(*np.unique(y_train[kept], return_counts=True))))
+    x_train, y_train = x_train[kept], y_train[kept]
+
     # Создание и обучение модели
     model = RandomForestClassifier()
+    start = time.perf_counter()
     model.fit(x_train, y_train)
+    train_time = time.perf_counter() - start
 
-    # Оценка точности модели
+    # Оценка точности модели и задержки предсказания одного кадра
     y_predict = model.predict(x_test)
     score = accuracy_score(y_predict, y_test)
-    print(f'Точность модели: {score * 100:.2f}%')
+    start = time.perf_counter()
+    model.predict(x_test[:1])
+    predict_time = time.perf_counter() - start
+    log.info("Точность модели: %.2f%%, обучение %.2f с, предсказание кадра %.1f мс",
+             score * 100, train_time, predict_time * 1000)
 
     # Сохранение обученной модели
     model_dir = os.path.join(os.path.dirname(__file__), '..', 'Model')
@@ -230,7 +309,7 @@ def train_model():
 
     with open(model_path, 'wb') as f:
         pickle.dump({'model': model}, f)
-    print(f"Модель сохранена в {model_path}")
+    log.info("Модель сохранена в %s (%d КБ)", model_path, os.path.getsize(model_path) // 1024)
 
     # Удаление временных данных после обучения
     try:
@@ -240,121 +319,19 @@ def train_model():
             dir_path = os.path.join(data_dir, class_dir)
             if os.path.exists(dir_path):
                 shutil.rmtree(dir_path)
-                print(f"Удалена папка: {dir_path}")
+                log.info("Удалена папка: %s", dir_path)
 
         # Удаление папки data
         if os.path.exists(data_dir):
             shutil.rmtree(data_dir)
-            print(f"Удалена папка: {data_dir}")
+            log.info("Удалена папка: %s", data_dir)
 
         # Удаление файла data.pickle
         pickle_path = 'data.pickle'
         if os.path.exists(pickle_path):
             os.remove(pickle_path)
-            print(f"Удален файл: {pickle_path}")
+            log.info("Удален файл: %s", pickle_path)
 
     except Exception as e:
-        print(f"Ошибка при удалении временных данных: {e}")
-
-
-def test_model():
-    """ Тестирование модели в реальном времени с помощью камеры """
-    # Загрузка обученной модели
-    model_dir = os.path.join(os.path.dirname(__file__), '..', 'Model')
-    model_path = os.path.join(model_dir, 'model.p')
-
-    model_dict = pickle.load(open(model_path, 'rb'))
-    model = model_dict['model']
-
-    cap = cv2.VideoCapture(0)
-    if not cap.isOpened():
-        print("Ошибка: Не удалось открыть камеру.")
-        return
-
-    # Инициализация MediaPipe
-    mp_hands = mp.solutions.hands
-    mp_drawing = mp.solutions.drawing_utils
-    mp_drawing_styles = mp.solutions.drawing_styles
-
-    hands = mp_hands.Hands(
-        static_image_mode=True,
-        min_detection_confidence=0.5,
-        max_num_hands=1,
-        min_tracking_confidence=0.5
-    )
-
-    labels_dict = {0: 'palm', 1: 'fist'}  # Словарь жестов
-
-    print("Запуск распознавания жестов. Нажмите 'q' для выхода.")
-
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            continue
-
-        H, W, _ = frame.shape
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = hands.process(frame_rgb)
-
-        if results.multi_hand_landmarks:
-            # Обработка первой обнаруженной руки
-            hand_landmarks = results.multi_hand_landmarks[0]
-
-            # Отрисовка landmarks
-            mp_drawing.draw_landmarks(
-                frame,
-                hand_landmarks,
-                mp_hands.HAND_CONNECTIONS,
-                mp_drawing_styles.get_default_hand_landmarks_style(),
-                mp_drawing_styles.get_default_hand_connections_style()
-            )
-
-            # Сбор координат
-            x_ = [lm.x for lm in hand_landmarks.landmark]
-            y_ = [lm.y for lm in hand_landmarks.landmark]
-
-            # Нормализация координат
-            min_x, min_y = min(x_), min(y_)
-            max_x, max_y = max(x_), max(y_)
-
-            data_aux = []
-            for lm in hand_landmarks.landmark:
-                # Нормализация как при обучении
-                if (max_x - min_x) > 0 and (max_y - min_y) > 0:
-                    data_aux.append((lm.x - min_x) / (max_x - min_x))
-                    data_aux.append((lm.y - min_y) / (max_y - min_y))
-                else:
-                    # Запасной вариант
-                    data_aux.append(lm.x)
-                    data_aux.append(lm.y)
-
-            # Преобразование в numpy массив
-            data_aux = np.asarray(data_aux).reshape(1, -1)
-
-            # Проверка количества признаков
-            if data_aux.shape[1] != 42:
-                print(f"Предупреждение: получено {data_aux.shape[1]} признаков вместо 42")
-                continue
-
-            # Предсказание жеста
-            prediction = model.predict(data_aux)
-            predicted_gesture = labels_dict[int(prediction[0])]
-
-            # Отображение результатов
-            x1 = int(min_x * W) - 10
-            y1 = int(min_y * H) - 10
-            x2 = int(max_x * W) + 10
-            y2 = int(max_y * H) + 10
-
-            cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 0, 0), 4)
-            cv2.putText(
-                frame, predicted_gesture, (x1, y1 - 10),
-                cv2.FONT_HERSHEY_SIMPLEX, 1.3, (0, 0, 0), 3, cv2.LINE_AA
-            )
-
-        cv2.imshow('Распознавание жестов', frame)
-        if cv2.waitKey(1) & 0xFF == ord('q'):
-            break
+        log.error("Ошибка при удалении временных данных: %s", e)
 
-    cap.release()
-    cv2.destroyAllWindows()
\ No newline at end of file
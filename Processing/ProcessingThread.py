@@ -1,6 +1,8 @@
 from PyQt5.QtCore import QThread, pyqtSignal
 
-from Processing.Processing import collect_data, create_dataset, train_model
+from Diagnostics.Log import CallbackHandler, add_sink, flush_logging, get_logger, remove_sink, report_suppressed
+
+log = get_logger('processing')
 
 
 class ProcessingThread(QThread):
@@ -16,52 +18,64 @@ class ProcessingThread(QThread):
 
     def run(self):
         """Основной метод потока"""
+        # Журнал окна - те же записи, что идут в консоль (с ограничением частоты)
+        sink = CallbackHandler(self.log_message.emit, log.name)
+        add_sink(sink)
         try:
+            # MediaPipe, sklearn и PIL загружаются только при обучении
+            from Processing.Processing import collect_data, create_dataset, train_model
+
             # Шаг 1: Сбор данных
             if self.start_step <= 0 and not self.cancel_requested:
-                self.log_message.emit("Начало сбора данных...")
+                log.info("Начало сбора данных...")
                 self.progress_updated.emit(0)
 
                 collect_data()
 
-                self.log_message.emit("Сбор данных завершен!")
+                log.info("Сбор данных завершен!")
                 self.progress_updated.emit(25)
+                report_suppressed(log)
                 self.step_completed.emit(True)
 
             # Шаг 2: Разметка данных
             if self.start_step <= 1 and not self.cancel_requested:
-                self.log_message.emit("Начало разметки данных...")
+                log.info("Начало разметки данных...")
                 self.progress_updated.emit(50)
 
                 create_dataset()
 
-                self.log_message.emit("Разметка данных завершена!")
+                log.info("Разметка данных завершена!")
                 self.progress_updated.emit(75)
+                report_suppressed(log)
                 self.step_completed.emit(True)
 
             # Шаг 3: Обучение модели
             if self.start_step <= 2 and not self.cancel_requested:
-                self.log_message.emit("Начало обучения модели...")
+                log.info("Начало обучения модели...")
                 self.progress_updated.emit(75)
 
                 train_model()
 
-                self.log_message.emit("Обучение модели завершено!")
+                log.info("Обучение модели завершено!")
                 self.progress_updated.emit(100)
+                report_suppressed(log)
                 self.step_completed.emit(True)
 
             # Все шаги выполнены
             if not self.cancel_requested:
-                self.log_message.emit("Все этапы обработки успешно завершены!")
+                log.info("Все этапы обработки успешно завершены!")
                 self.progress_updated.emit(100)  # После всех шагов - 100%
 
         except Exception as e:
-            error_msg = f"Критическая ошибка: {str(e)}"
-            self.log_message.emit(error_msg)
+            log.error("Критическая ошибка: %s", e)
 
             if "access violation" in str(e).lower() or "0xC0000005" in str(e):
-                self.log_message.emit("Ошибка с доступом к камере!")
+                log.error("Ошибка с доступом к камере!")
+            report_suppressed(log)
             self.step_completed.emit(False)
+        finally:
+            flush_logging()
+            remove_sink(sink)
 
     def cancel(self):
         """Запрос отмены обработки"""
@@ -1,8 +1,13 @@
-from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QLabel, QPushButton,
-                             QProgressBar, QHBoxLayout, QGroupBox, QTextEdit)
-from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QLabel, QPushButton, QWidget,
+                             QProgressBar, QHBoxLayout, QGroupBox, QTextEdit, QStackedWidget)
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from PyQt5.QtGui import QImage, QPixmap
 
 from Processing.ProcessingThread import ProcessingThread
+from Processing.ModelTester import STAGES, ModelTesterThread, RollingConfusion
+
+# Клавиши разметки при проверке модели: клавиша -> жест
+TRUTH_KEYS = {Qt.Key_0: 0, Qt.Key_1: 1}
 
 class ProcessingWindow(QDialog):
     """Окно для обработки данных и обучения модели"""
@@ -14,8 +19,16 @@ class ProcessingWindow(QDialog):
         self.setWindowFlags(Qt.Window | Qt.FramelessWindowHint)
         self.setFixedSize(600, 500)
 
+        # Страницы окна: обработка данных и проверка модели
+        self.pages = QStackedWidget()
+        processing_page = QWidget()
+        window_layout = QVBoxLayout()
+        window_layout.addWidget(self.pages)
+        self.setLayout(window_layout)
+
         # Основной layout
         layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
 
         # Группа для отображения текущего шага
         self.step_group = QGroupBox("Текущий шаг")
@@ -46,6 +59,10 @@ class ProcessingWindow(QDialog):
         self.start_button.clicked.connect(self.start_processing)
         btn_layout.addWidget(self.start_button)
 
+        self.test_button = QPushButton("Проверить модель")
+        self.test_button.clicked.connect(self.open_model_test)
+        btn_layout.addWidget(self.test_button)
+
         self.cancel_button = QPushButton("Назад")
         self.cancel_button.clicked.connect(self.reject)
         btn_layout.addWidget(self.cancel_button)
@@ -57,13 +74,181 @@ class ProcessingWindow(QDialog):
         self.log_text.setReadOnly(True)
         layout.addWidget(self.log_text)
 
-        self.setLayout(layout)
+        processing_page.setLayout(layout)
+        self.pages.addWidget(processing_page)
+        self.pages.addWidget(self.create_test_page())
 
         # Состояние обработки
         self.current_step = 0
         self.processing_thread = None
         self.update_step_info()
 
+        # Проверка модели: поток, разметка с клавиатуры и статистика
+        self.tester_thread = None
+        self.stopping_testers = set()  # Остановленные проверки, которые еще не завершились
+        self.labels = {0: 'palm', 1: 'fist'}
+        self.confusion = RollingConfusion(self.labels)
+        self.truth = None         # Жест, который сейчас показывает пользователь
+        self.stage_times = {}     # Сглаженное время этапов, с
+        self.test_timer = QTimer(self)
+        self.test_timer.setInterval(16)  # Опрос результата примерно раз в кадр экрана
+        self.test_timer.timeout.connect(self.poll_tester)
+
+    def create_test_page(self):
+        """ Страница проверки модели: превью, скорость, уверенность и матрица ошибок """
+        page = QWidget()
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        top_layout = QHBoxLayout()
+        self.test_preview = QLabel("Запуск камеры...")
+        self.test_preview.setFixedSize(320, 240)
+        self.test_preview.setAlignment(Qt.AlignCenter)
+        self.test_preview.setStyleSheet("background-color: #333; color: white;")
+        top_layout.addWidget(self.test_preview)
+
+        self.test_stats_label = QLabel("")
+        self.test_stats_label.setAlignment(Qt.AlignTop | Qt.AlignLeft)
+        self.test_stats_label.setStyleSheet("font-family: monospace; font-size: 10pt;")
+        top_layout.addWidget(self.test_stats_label)
+        layout.addLayout(top_layout)
+
+        self.truth_label = QLabel("")
+        self.truth_label.setWordWrap(True)
+        self.truth_label.setStyleSheet("font-size: 11pt;")
+        layout.addWidget(self.truth_label)
+
+        self.confusion_label = QLabel("")
+        self.confusion_label.setStyleSheet("font-family: monospace; font-size: 10pt;")
+        layout.addWidget(self.confusion_label)
+        layout.addStretch()
+
+        btn_layout = QHBoxLayout()
+        # Кнопки без фокуса: пробел и цифры нужны для разметки
+        reset_button = QPushButton("Сбросить статистику")
+        reset_button.setFocusPolicy(Qt.NoFocus)
+        reset_button.clicked.connect(self.reset_test_stats)
+        btn_layout.addWidget(reset_button)
+
+        back_button = QPushButton("Назад")
+        back_button.setFocusPolicy(Qt.NoFocus)
+        back_button.clicked.connect(self.close_model_test)
+        btn_layout.addWidget(back_button)
+        layout.addLayout(btn_layout)
+
+        page.setLayout(layout)
+        return page
+
+    def open_model_test(self):
+        """ Переход к проверке модели на живой камере """
+        if self.processing_thread is not None and self.processing_thread.isRunning():
+            return
+        self.reset_test_stats()
+        self.set_truth(None)
+        self.test_preview.setText("Запуск камеры...")
+        self.pages.setCurrentIndex(1)
+        self.setFocus()
+
+        self.tester_thread = ModelTesterThread()
+        self.tester_thread.set_preview_size(self.test_preview.width(), self.test_preview.height())
+        self.tester_thread.tracker_ready.connect(self.on_tester_ready)
+        self.tester_thread.start()
+        self.test_timer.start()
+
+    def close_model_test(self):
+        """ Возврат к обработке данных """
+        self.stop_model_test()
+        self.pages.setCurrentIndex(0)
+
+    def stop_model_test(self):
+        self.test_timer.stop()
+        if self.tester_thread is None:
+            return
+        thread, self.tester_thread = self.tester_thread, None
+        thread.stop()
+        if thread.isRunning():
+            # Поток еще создает MediaPipe: ссылка живет до finished,
+            # иначе Qt уничтожит работающий QThread
+            self.stopping_testers.add(thread)
+            thread.finished.connect(self.on_tester_finished)
+
+    def on_tester_finished(self):
+        """ Остановленная проверка завершилась (finished уже испущен -
+        wait возвращается сразу) """
+        thread = self.sender()
+        thread.wait()
+        self.stopping_testers.discard(thread)
+
+    def on_tester_ready(self, ready):
+        if not ready:
+            self.test_preview.setText("Нет камеры или модели")
+
+    def reset_test_stats(self):
+        self.confusion.clear()
+        self.stage_times = {}
+        self.update_confusion()
+
+    def set_truth(self, truth):
+        """ Жест, который показывает пользователь (None - кадры не учитываются) """
+        self.truth = truth
+        current = "не задан" if truth is None else self.labels[truth]
+        keys = ", ".join(f"{gesture} - {name}" for gesture, name in self.labels.items())
+        self.truth_label.setText(
+            f"Показываемый жест: {current}\n"
+            f"Нажмите клавишу жеста ({keys}) и показывайте его; пробел - пауза разметки")
+
+    def keyPressEvent(self, event):
+        if self.pages.currentIndex() == 1:
+            if event.key() in TRUTH_KEYS:
+                self.set_truth(TRUTH_KEYS[event.key()])
+                return
+            if event.key() == Qt.Key_Space:
+                self.set_truth(None)
+                return
+        super().keyPressEvent(event)
+
+    def poll_tester(self):
+        """ Последний результат проверки: превью, статистика, матрица ошибок """
+        if self.tester_thread is None:
+            return
+        result = self.tester_thread.mailbox.take()
+        if result is None:
+            return
+
+        h, w, ch = result.frame.shape
+        image = QImage(result.frame.data, w, h, ch * w, QImage.Format_BGR888)
+        self.test_preview.setPixmap(QPixmap.fromImage(image))
+
+        for stage, seconds in result.timings.items():
+            previous = self.stage_times.get(stage, seconds)
+            self.stage_times[stage] = previous + 0.1 * (seconds - previous)
+
+        if result.gesture is None:
+            prediction = "рука не найдена"
+        else:
+            prediction = self.labels.get(result.gesture, str(result.gesture))
+            if result.confidence is not None:
+                prediction += f" ({result.confidence * 100:.0f}%)"
+            if self.truth is not None and result.gesture in self.labels:
+                self.confusion.add(self.truth, result.gesture)
+                self.update_confusion()
+
+        lines = [f"FPS: {self.tester_thread.fps:5.1f}", f"Жест: {prediction}", ""]
+        lines += [f"{stage:9s} {self.stage_times.get(stage, 0) * 1000:6.1f} мс" for stage in STAGES]
+        self.test_stats_label.setText("\n".join(lines))
+
+    def update_confusion(self):
+        """ Матрица ошибок последних кадров: строки - показанный жест """
+        matrix = self.confusion.matrix()
+        names = [self.labels[gesture] for gesture in sorted(self.labels)]
+        lines = [f"{'показан / распознан':20s}" + "".join(f"{name:>8s}" for name in names)]
+        for name, row in zip(names, matrix):
+            lines.append(f"{name:20s}" + "".join(f"{count:8d}" for count in row))
+        accuracy = self.confusion.accuracy()
+        lines.append(f"Точность: {'-' if accuracy is None else f'{accuracy * 100:.1f}%'}"
+                     f" по {len(self.confusion.samples)} кадрам")
+        self.confusion_label.setText("\n".join(lines))
+
     def update_step_info(self):
         """Обновление информации о текущем шаге"""
         steps = [
@@ -110,6 +295,8 @@ class ProcessingWindow(QDialog):
                 except:
                     pass
 
+            self.test_button.setEnabled(False)
+
             # Создаем и запускаем поток обработки
             self.processing_thread = ProcessingThread(self.current_step)
             self.processing_thread.progress_updated.connect(self.update_progress)
@@ -125,6 +312,7 @@ class ProcessingWindow(QDialog):
 
             self.start_button.setEnabled(True)
             self.cancel_button.setEnabled(True)
+            self.test_button.setEnabled(True)
 
     def update_progress(self, value):
         """Обновление прогресс-бара"""
@@ -136,6 +324,7 @@ class ProcessingWindow(QDialog):
 
     def step_completed(self, success):
         """Обработка завершения шага"""
+        self.test_button.setEnabled(True)
         if success:
             self.current_step += 1
             self.update_step_info()
@@ -155,5 +344,13 @@ class ProcessingWindow(QDialog):
 
     def reject(self):
         """Обработка закрытия окна"""
+        if self.pages.currentIndex() == 1:
+            # Escape на странице проверки - возврат к обработке
+            self.close_model_test()
+            return
+        # Окно закрывается - дожидаемся остановленных проверок
+        for thread in self.stopping_testers:
+            thread.wait()
+        self.stopping_testers.clear()
         super().reject()
         self.finished.emit()
\ No newline at end of file
@@ -0,0 +1,58 @@
+import numpy as np
+
+
+class NoveltySelector:
+    """ Отбор кадров при сборе данных одного жеста: кадр сохраняется, только
+    если его признаки (42 нормализованные координаты точек руки) дальше
+    threshold от всех уже сохраненных. Кадры, на которых предварительная
+    модель не уверена в собираемом жесте, ценнее - им хватает половины порога.
+    Сбор насыщен, когда patience кадров подряд с рукой ничего не добавили """
+
+    def __init__(self, threshold=0.1, patience=60, min_samples=10, max_samples=200,
+                 model=None, gesture=None, uncertainty=0.8):
+        self.threshold = threshold
+        self.patience = patience
+        self.min_samples = min_samples
+        self.max_samples = max_samples
+        self.model = model          # Предварительная модель или None
+        self.gesture = gesture      # Собираемый жест (класс модели)
+        self.uncertainty = uncertainty  # Вероятность жеста, ниже которой модель не уверена
+        self.kept = np.empty((0, 0))
+        self.considered = 0         # Кадров с рукой
+        self.since_kept = 0         # Кадров с рукой после последнего сохраненного
+
+    def confidence(self, features):
+        """ Вероятность собираемого жеста по предварительной модели (None - модели нет) """
+        if self.model is None or not hasattr(self.model, 'predict_proba'):
+            return None
+        classes = [str(label) for label in self.model.classes_]
+        if str(self.gesture) not in classes:
+            return None
+        probabilities = self.model.predict_proba(features.reshape(1, -1))[0]
+        return float(probabilities[classes.index(str(self.gesture))])
+
+    def consider(self, features):
+        """ Решение по кадру с признаками features: (сохранить ли, расстояние
+        до ближайшего сохраненного, уверенность модели) """
+        self.considered += 1
+        distance = np.inf
+        if len(self.kept):
+            distance = float(np.sqrt(((self.kept - features) ** 2).sum(axis=1).min()))
+        confidence = self.confidence(features)
+
+        threshold = self.threshold
+        if confidence is not None and confidence < self.uncertainty:
+            threshold /= 2
+        keep = distance >= threshold
+        if keep:
+            self.kept = features[None] if not len(self.kept) else np.vstack((self.kept, features))
+            self.since_kept = 0
+        else:
+            self.since_kept += 1
+        return keep, distance, confidence
+
+    @property
+    def saturated(self):
+        """ Новые кадры больше не добавляют разнообразия (или набран максимум) """
+        return len(self.kept) >= self.max_samples or (
+            len(self.kept) >= self.min_samples and self.since_kept >= self.patience)
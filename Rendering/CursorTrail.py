@@ -0,0 +1,93 @@
+import numpy as np
+from PyQt5.QtCore import Qt, QPointF
+from PyQt5.QtGui import QColor, QPainterPath, QPen, QPolygonF
+
+# Цвета следа по жесту (0: ладонь, 1: кулак)
+TRAIL_COLORS = {0: (255, 0, 0), 1: (0, 255, 0)}
+
+
+def polygon_from_array(points):
+    """ QPolygonF из массива (n, 2) копированием памяти, без QPointF на точку """
+    polygon = QPolygonF()
+    polygon.fill(QPointF(), len(points))
+    buffer = polygon.data()
+    buffer.setsize(len(points) * 2 * 8)
+    np.frombuffer(buffer, dtype=np.float64).reshape(-1, 2)[:] = points
+    return polygon
+
+
+class CursorTrail:
+    """ След курсора: кольцевой буфер фиксированной длины на NumPy.
+    Добавление точки - O(1), отрисовка - один QPainterPath на
+    каждое сочетание цвета и степени затухания """
+
+    def __init__(self, length=20, fade_levels=4, width=2):
+        self.capacity = max(2, int(length))
+        self.fade_levels = max(1, int(fade_levels))  # 1 - без затухания
+        self.width = width
+
+        # Нормализованные позиции (0..1) и жесты точек следа
+        self.positions = np.zeros((self.capacity, 2), dtype=np.float64)
+        self.gestures = np.zeros(self.capacity, dtype=np.int8)
+        self.head = 0   # Индекс следующей записи
+        self.count = 0  # Количество точек в буфере
+
+        self._pens = {}  # (жест, уровень затухания) -> QPen
+
+    def __len__(self):
+        return self.count
+
+    def append(self, x, y, gesture):
+        """ Добавление точки (самая старая перезаписывается) """
+        self.positions[self.head] = (x, y)
+        self.gestures[self.head] = gesture
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def clear(self):
+        """ Очистка следа """
+        self.head = 0
+        self.count = 0
+
+    def ordered(self):
+        """ Точки следа от самой старой к самой новой """
+        indices = (self.head - self.count + np.arange(self.count)) % self.capacity
+        return self.positions[indices], self.gestures[indices]
+
+    def pen(self, gesture, level):
+        """ Кэшированное перо для жеста и уровня затухания """
+        key = (gesture, level)
+        if key not in self._pens:
+            r, g, b = TRAIL_COLORS.get(gesture, TRAIL_COLORS[0])
+            alpha = 255 * (level + 1) // self.fade_levels
+            self._pens[key] = QPen(QColor(r, g, b, alpha), self.width)
+        return self._pens[key]
+
+    def draw(self, painter, width, height):
+        """ Отрисовка следа в области width x height """
+        if self.count < 2:
+            return
+
+        positions, gestures = self.ordered()
+        points = positions * (width, height)
+
+        # Отрезок i соединяет точки i и i + 1, цвет - по жесту конечной точки
+        segments = self.count - 1
+        levels = np.arange(segments) * self.fade_levels // segments
+        keys = gestures[1:].astype(np.int32) * self.fade_levels + levels
+
+        # Непрерывные участки с одинаковым ключом собираются в общий путь
+        breaks = np.flatnonzero(np.diff(keys)) + 1
+        starts = np.concatenate(([0], breaks))
+        ends = np.concatenate((breaks, [segments]))
+        paths = {}
+        for start, end in zip(starts, ends):
+            key = (int(gestures[start + 1]), int(levels[start]))
+            if key not in paths:
+                paths[key] = QPainterPath()
+            paths[key].addPolygon(polygon_from_array(points[start:end + 1]))
+
+        painter.setBrush(Qt.NoBrush)
+        for (gesture, level), path in paths.items():
+            painter.setPen(self.pen(gesture, level))
+            painter.drawPath(path)
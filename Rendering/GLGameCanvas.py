@@ -0,0 +1,225 @@
+import numpy as np
+from PyQt5.QtGui import (QMatrix4x4, QOpenGLBuffer, QOpenGLShader, QOpenGLShaderProgram,
+                         QOpenGLTexture, QOpenGLVersionProfile, QPainter, QSurfaceFormat)
+from PyQt5.QtWidgets import QOpenGLWidget
+
+from Diagnostics.Log import get_logger
+from Rendering.TextureAtlas import build_atlases
+from Rendering.TextureManager import TextureManager
+
+log = get_logger('render')
+
+# Константы OpenGL (в PyQt5 функции есть, а констант нет)
+GL_TRIANGLES = 0x0004
+GL_FLOAT = 0x1406
+GL_BLEND = 0x0BE2
+GL_SRC_ALPHA = 0x0302
+GL_ONE_MINUS_SRC_ALPHA = 0x0303
+GL_COLOR_BUFFER_BIT = 0x4000
+GL_MAX_TEXTURE_SIZE = 0x0D33
+
+# Шейдеры GLSL 1.10 / GLSL ES 1.00 - работают и на Mesa llvmpipe
+VERTEX_SHADER = """
+attribute vec2 position;
+attribute vec2 texcoord;
+uniform mat4 projection;
+varying vec2 v_texcoord;
+void main() {
+    v_texcoord = texcoord;
+    gl_Position = projection * vec4(position, 0.0, 1.0);
+}
+"""
+
+FRAGMENT_SHADER = """
+#ifdef GL_ES
+precision mediump float;
+#endif
+uniform sampler2D atlas;
+varying vec2 v_texcoord;
+void main() {
+    gl_FragColor = texture2D(atlas, v_texcoord);
+}
+"""
+
+FLOATS_PER_VERTEX = 4  # x, y, u, v
+VERTICES_PER_SPRITE = 6
+DEFAULT_TEXTURE_SIZE = 2048  # Предел текстуры, если драйвер его не сообщил
+
+
+class GLGameCanvas(QOpenGLWidget):
+    """ Холст игрового поля на OpenGL: все спрайты сцены рисуются
+    одним вызовом glDrawArrays из общего атласа текстур. Если текстуры
+    не помещаются в предел драйвера (фон на весь 4K-экран), атласов
+    несколько - по вызову на каждую серию спрайтов одного атласа """
+
+    def __init__(self, scene, parent=None):
+        """ scene - объект с методами collect_sprites() и paint_overlay(painter) """
+        super().__init__(parent)
+        self.scene = scene
+
+        # OpenGL 2.0 без профиля - минимум, который есть у программных драйверов
+        surface_format = QSurfaceFormat()
+        surface_format.setVersion(2, 0)
+        surface_format.setProfile(QSurfaceFormat.NoProfile)
+        self.setFormat(surface_format)
+
+        self.gl = None
+        self.program = None
+        self.vertex_buffer = None
+        self.max_texture_size = DEFAULT_TEXTURE_SIZE  # GL_MAX_TEXTURE_SIZE драйвера
+        self.atlases = []         # Атласы (TextureAtlas)
+        self.atlas_textures = []  # Текстуры OpenGL атласов (по индексу атласа)
+        self.atlas_index = {}     # ключ текстуры -> индекс атласа
+        self.projection = QMatrix4x4()
+
+    def initializeGL(self):
+        """ Создание шейдеров и буфера вершин """
+        if self.context().isOpenGLES():
+            self.gl = self.context().versionFunctions()
+        else:
+            profile = QOpenGLVersionProfile()
+            profile.setVersion(2, 0)
+            self.gl = self.context().versionFunctions(profile)
+        if self.gl is None:
+            log.error("OpenGL 2.0 functions are not available")
+            return
+        self.gl.initializeOpenGLFunctions()
+
+        max_size = self.gl.glGetIntegerv(GL_MAX_TEXTURE_SIZE)
+        if isinstance(max_size, (tuple, list)):
+            max_size = max_size[0]
+        if max_size:
+            self.max_texture_size = int(max_size)
+        log.info("OpenGL max texture size: %d", self.max_texture_size)
+
+        self.program = QOpenGLShaderProgram(self)
+        self.program.addShaderFromSourceCode(QOpenGLShader.Vertex, VERTEX_SHADER)
+        self.program.addShaderFromSourceCode(QOpenGLShader.Fragment, FRAGMENT_SHADER)
+        self.program.bindAttributeLocation('position', 0)
+        self.program.bindAttributeLocation('texcoord', 1)
+        if not self.program.link():
+            log.error("Shader link error: %s", self.program.log())
+            self.program = None
+            return
+
+        self.vertex_buffer = QOpenGLBuffer(QOpenGLBuffer.VertexBuffer)
+        self.vertex_buffer.create()
+        self.vertex_buffer.setUsagePattern(QOpenGLBuffer.DynamicDraw)
+
+    def resizeGL(self, width, height):
+        """ Проекция в координатах виджета (y вниз, как у QPainter) """
+        self.projection = QMatrix4x4()
+        self.projection.ortho(0, width, height, 0, -1, 1)
+
+    def paintGL(self):
+        """ Отрисовка кадра: спрайты одним вызовом, затем наложение QPainter """
+        if self.gl is None:
+            return
+
+        self.gl.glClearColor(0.0, 0.0, 0.2, 1.0)
+        self.gl.glClear(GL_COLOR_BUFFER_BIT)
+
+        if self.program is not None:
+            sprites = self.scene.collect_sprites()
+            self.ensure_atlas(sprites)
+            sprites = [sprite for sprite in sprites if sprite.key in self.atlas_index]
+            if sprites:
+                self.draw_sprites(sprites)
+
+        # Курсор, след и надписи - поверх спрайтов
+        painter = QPainter(self)
+        self.scene.paint_overlay(painter)
+        painter.end()
+
+    def ensure_atlas(self, sprites):
+        """ Пересборка атласов, если в сцене появились новые текстуры """
+        missing = [sprite.key for sprite in sprites if sprite.key not in self.atlas_index]
+        if not missing:
+            return
+
+        manager = TextureManager.instance()
+        # Кадры поворота попадают в атлас всем листом - без пересборки на каждый кадр
+        keys = {sheet_key for key in missing for sheet_key in manager.sheet_keys(key)}
+        keys.update(self.atlas_index)
+        images = {}
+        for key in keys:
+            image = manager.image(key)
+            if image is not None:
+                images[key] = image
+        if not images:
+            return
+
+        for texture in self.atlas_textures:
+            texture.destroy()
+        self.atlases = build_atlases(images, self.max_texture_size)
+        self.atlas_textures = []
+        self.atlas_index = {}
+        for index, atlas in enumerate(self.atlases):
+            texture = QOpenGLTexture(atlas.image)
+            texture.setMinificationFilter(QOpenGLTexture.Nearest)
+            texture.setMagnificationFilter(QOpenGLTexture.Nearest)
+            texture.setWrapMode(QOpenGLTexture.ClampToEdge)
+            self.atlas_textures.append(texture)
+            self.atlas_index.update(dict.fromkeys(atlas.regions, index))
+
+    def reset_atlas(self):
+        """ Сброс атласов после смены размера поля: текстуры старого размера
+        больше не нужны, новые атласы соберет ensure_atlas """
+        self.atlas_index = {}
+
+    def build_vertices(self, sprites, atlas):
+        """ Вершины спрайтов атласа atlas: по два треугольника на спрайт """
+        rects = np.array([(s.x, s.y, s.width, s.height) for s in sprites], dtype=np.float32)
+        uvs = np.array([atlas.regions[s.key] for s in sprites], dtype=np.float32)
+
+        x0, y0 = rects[:, 0], rects[:, 1]
+        x1, y1 = x0 + rects[:, 2], y0 + rects[:, 3]
+        u0, v0, u1, v1 = uvs[:, 0], uvs[:, 1], uvs[:, 2], uvs[:, 3]
+
+        corners = [
+            (x0, y0, u0, v0), (x1, y0, u1, v0), (x1, y1, u1, v1),
+            (x0, y0, u0, v0), (x1, y1, u1, v1), (x0, y1, u0, v1)
+        ]
+        vertices = np.stack([np.stack(corner, axis=1) for corner in corners], axis=1)
+        return np.ascontiguousarray(vertices, dtype=np.float32)
+
+    def sprite_runs(self, sprites):
+        """ Серии подряд идущих спрайтов одного атласа: (индекс атласа, спрайты).
+        Порядок отрисовки сохраняется; обычно серия одна """
+        runs = []
+        for sprite in sprites:
+            index = self.atlas_index[sprite.key]
+            if runs and runs[-1][0] == index:
+                runs[-1][1].append(sprite)
+            else:
+                runs.append((index, [sprite]))
+        return runs
+
+    def draw_sprites(self, sprites):
+        """ Загрузка вершин и по вызову отрисовки на серию спрайтов одного атласа """
+        stride = FLOATS_PER_VERTEX * 4
+
+        self.gl.glEnable(GL_BLEND)
+        self.gl.glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+
+        self.program.bind()
+        self.program.setUniformValue('projection', self.projection)
+        self.program.setUniformValue('atlas', 0)
+        self.vertex_buffer.bind()
+        self.program.enableAttributeArray(0)
+        self.program.enableAttributeArray(1)
+
+        for index, run in self.sprite_runs(sprites):
+            vertices = self.build_vertices(run, self.atlases[index])
+            texture = self.atlas_textures[index]
+            texture.bind(0)
+            self.vertex_buffer.allocate(vertices.tobytes(), vertices.nbytes)
+            self.program.setAttributeBuffer(0, GL_FLOAT, 0, 2, stride)
+            self.program.setAttributeBuffer(1, GL_FLOAT, 2 * 4, 2, stride)
+            self.gl.glDrawArrays(GL_TRIANGLES, 0, len(run) * VERTICES_PER_SPRITE)
+            texture.release()
+
+        self.program.disableAttributeArray(0)
+        self.program.disableAttributeArray(1)
+        self.vertex_buffer.release()
+        self.program.release()
@@ -0,0 +1,47 @@
+from PyQt5.QtCore import QPointF
+from PyQt5.QtGui import QBrush, QColor, QPolygonF
+
+from Objects.ObjectWithTarget import ObjectWithTarget
+from Objects.StaticCircle import StaticCircle
+from Rendering.TextureManager import TextureManager
+
+
+def has_texture(obj):
+    """ Загружена ли текстура объекта """
+    return (obj.texture_key is not None and
+            TextureManager.instance().source_image(obj.texture_key[0]) is not None)
+
+
+def draw_object(painter, obj, view):
+    """ Отрисовка игрового объекта через QPainter (view - PlayfieldView:
+    объект в единицах мира переносится на экран) """
+    sprite = obj.get_sprite()
+    if sprite is not None:
+        sprite = view.screen_sprite(sprite)
+        pixmap = TextureManager.instance().pixmap(sprite.key, view.dpr)
+        if pixmap is not None:
+            painter.drawPixmap(QPointF(sprite.x, sprite.y), pixmap)
+            return
+
+    # Текстуры нет - рисуем фигуру цветом объекта в координатах мира
+    painter.save()
+    painter.translate(view.offset_x, view.offset_y)
+    painter.scale(view.scale, view.scale)
+    color = QColor(*obj.color)
+    if isinstance(obj, StaticCircle):
+        painter.setBrush(QBrush(color))
+        painter.drawEllipse(QPointF(obj.x, obj.y), obj.radius, obj.radius)
+    elif isinstance(obj, ObjectWithTarget):
+        # Враг - треугольник
+        painter.setBrush(QBrush(color.lighter(150) if obj.dragging else color))
+        points = [
+            QPointF(obj.x + obj.size / 2, obj.y),
+            QPointF(obj.x, obj.y + obj.size),
+            QPointF(obj.x + obj.size, obj.y + obj.size)
+        ]
+        painter.drawPolygon(QPolygonF(points))
+    else:
+        # Квадрат
+        painter.setBrush(QBrush(color.lighter(150)))
+        painter.drawRect(int(obj.x), int(obj.y), obj.size, obj.size)
+    painter.restore()
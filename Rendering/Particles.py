@@ -0,0 +1,121 @@
+from collections import namedtuple
+
+import numpy as np
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor, QPainter, QPen
+
+from Rendering.CursorTrail import polygon_from_array
+
+# Общая палитра частиц (номер цвета хранится в массиве частиц)
+PALETTE = (
+    (255, 240, 160),  # 0 - вспышка
+    (255, 170, 40),   # 1 - огонь
+    (230, 60, 20),    # 2 - пламя
+    (150, 140, 130),  # 3 - каменная крошка
+    (90, 80, 75),     # 4 - пыль
+    (0, 230, 0),      # 5 - захват (как курсор-кулак)
+)
+
+# Эффект: число частиц, скорость (пикс/с), разброс скорости (доля),
+# время жизни (с), размер (пикс), номера цветов палитры
+Effect = namedtuple('Effect', 'count speed spread life size colors')
+
+EFFECTS = {
+    'explosion': Effect(160, 260.0, 0.8, 1.4, 5, (0, 1, 1, 2)),
+    'impact': Effect(24, 140.0, 0.6, 0.5, 3, (3, 4)),
+    'grab': Effect(14, 90.0, 0.3, 0.3, 3, (5,)),
+}
+
+
+class ParticleSystem:
+    """ Частицы эффектов на NumPy: состояние всех частиц - заранее выделенные
+    массивы на capacity частиц, шаг - одна векторная операция, отрисовка -
+    один drawPoints на сочетание цвета, размера и степени затухания.
+    Сверх capacity новые частицы не создаются (dropped) - эффекты
+    не выходят за бюджет кадра """
+
+    def __init__(self, capacity=512, fade_levels=4, drag=1.5, seed=None):
+        self.capacity = max(1, int(capacity))
+        self.fade_levels = max(1, int(fade_levels))
+        self.drag = drag  # Затухание скорости, 1/с
+
+        self.positions = np.zeros((self.capacity, 2), dtype=np.float64)
+        self.velocities = np.zeros((self.capacity, 2), dtype=np.float64)
+        self.life = np.zeros(self.capacity, dtype=np.float32)      # Осталось жить, с (0 - свободна)
+        self.max_life = np.ones(self.capacity, dtype=np.float32)
+        self.colors = np.zeros(self.capacity, dtype=np.int16)      # Номер цвета PALETTE
+        self.sizes = np.zeros(self.capacity, dtype=np.int16)
+
+        self.rng = np.random.default_rng(seed)  # Свой генератор: игра от частиц не зависит
+        self.dropped = 0  # Частиц, не созданных из-за предела
+        self._pens = {}   # (цвет, размер, уровень затухания) -> QPen
+
+    def __len__(self):
+        return int(np.count_nonzero(self.life > 0))
+
+    def emit(self, name, x, y):
+        """ Эффект name (EFFECTS) в точке (x, y) """
+        effect = EFFECTS[name]
+        free = np.flatnonzero(self.life <= 0)[:effect.count]
+        self.dropped += effect.count - len(free)
+        if not len(free):
+            return
+
+        count = len(free)
+        angles = self.rng.uniform(0, 2 * np.pi, count)
+        speeds = effect.speed * (1 + effect.spread * self.rng.uniform(-1, 1, count))
+        self.positions[free] = (x, y)
+        self.velocities[free, 0] = np.cos(angles) * speeds
+        self.velocities[free, 1] = np.sin(angles) * speeds
+        life = effect.life * self.rng.uniform(0.6, 1.0, count)
+        self.life[free] = life
+        self.max_life[free] = life
+        self.colors[free] = self.rng.choice(effect.colors, count)
+        self.sizes[free] = effect.size
+
+    def update(self, dt):
+        """ Шаг всех частиц на dt секунд """
+        alive = self.life > 0
+        if not alive.any():
+            return
+        self.positions[alive] += self.velocities[alive] * dt
+        self.velocities[alive] *= np.exp(-self.drag * dt)
+        self.life[alive] -= dt
+
+    def clear(self):
+        self.life[:] = 0
+
+    def pen(self, color, size, level):
+        """ Кэшированное перо для цвета, размера и уровня затухания """
+        key = (color, size, level)
+        if key not in self._pens:
+            r, g, b = PALETTE[color]
+            alpha = 255 * (level + 1) // self.fade_levels
+            pen = QPen(QColor(r, g, b, alpha), size)
+            pen.setCapStyle(Qt.SquareCap)  # Квадратные «пиксели», как у текстур
+            self._pens[key] = pen
+        return self._pens[key]
+
+    def draw(self, painter, scale=1.0):
+        """ Отрисовка живых частиц (scale - пикселей экрана на единицу позиции) """
+        alive = np.flatnonzero(self.life > 0)
+        if not len(alive):
+            return
+
+        levels = np.minimum((self.life[alive] / self.max_life[alive] * self.fade_levels)
+                            .astype(np.int32), self.fade_levels - 1)
+        keys = (self.colors[alive].astype(np.int64) * 256 + self.sizes[alive]) \
+            * self.fade_levels + levels
+        order = np.argsort(keys, kind='stable')
+        keys, alive = keys[order], alive[order]
+        breaks = np.flatnonzero(np.diff(keys)) + 1
+        points = self.positions[alive] * scale
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing, False)
+        for start, end in zip(np.concatenate(([0], breaks)), np.concatenate((breaks, [len(keys)]))):
+            index = alive[start]
+            painter.setPen(self.pen(int(self.colors[index]), max(1, int(self.sizes[index] * scale)),
+                                    int(levels[order[start]])))
+            painter.drawPoints(polygon_from_array(points[start:end]))
+        painter.restore()
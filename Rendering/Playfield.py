@@ -0,0 +1,58 @@
+from Rendering.Sprite import Sprite
+
+
+class PlayfieldView:
+    """ Отображение игрового поля на виджет: игра считает в мировых единицах
+    (поле world_width x world_height), на экран поле выводится с равномерным
+    масштабом по центру виджета. Текстуры берутся в пикселях устройства
+    (с учетом devicePixelRatio) - при отрисовке они не масштабируются """
+
+    def __init__(self, world_width, world_height):
+        self.world_width = world_width
+        self.world_height = world_height
+        self.scale = 1.0      # Логических пикселей виджета на единицу мира
+        self.offset_x = 0.0   # Левый верхний угол поля в виджете
+        self.offset_y = 0.0
+        self.dpr = 1.0        # Пикселей устройства на логический пиксель
+        self.size = None      # (ширина, высота, dpr) виджета, под которые посчитан вид
+
+    def update(self, width, height, dpr=1.0):
+        """ Пересчет под размер виджета. True - вид изменился (нужны новые текстуры) """
+        size = (width, height, dpr)
+        if size == self.size:
+            return False
+        self.size = size
+        self.dpr = dpr
+        self.scale = max(min(width / self.world_width, height / self.world_height), 1e-6)
+        self.offset_x = (width - self.field_width) / 2
+        self.offset_y = (height - self.field_height) / 2
+        return True
+
+    @property
+    def field_width(self):
+        """ Ширина поля на экране, логические пиксели """
+        return self.world_width * self.scale
+
+    @property
+    def field_height(self):
+        return self.world_height * self.scale
+
+    def to_screen(self, x, y):
+        """ Точка мира в логических пикселях виджета """
+        return self.offset_x + x * self.scale, self.offset_y + y * self.scale
+
+    def snap(self, value):
+        """ Координата, выровненная по пикселю устройства """
+        return round(value * self.dpr) / self.dpr
+
+    def device_pixels(self, length):
+        """ Длина в мировых единицах -> целое число пикселей устройства """
+        return max(1, int(round(length * self.scale * self.dpr)))
+
+    def screen_sprite(self, sprite):
+        """ Спрайт в мире -> спрайт на экране: прямоугольник в логических
+        пикселях, ключ текстуры - под размер в пикселях устройства """
+        width, height = self.device_pixels(sprite.width), self.device_pixels(sprite.height)
+        key = sprite.key[:1] + (width, height) + sprite.key[3:]
+        x, y = self.to_screen(sprite.x, sprite.y)
+        return Sprite(key, self.snap(x), self.snap(y), width / self.dpr, height / self.dpr)
@@ -0,0 +1,22 @@
+from collections import namedtuple
+
+# Описание спрайта для отрисовки: ключ текстуры и прямоугольник. У игровых
+# объектов прямоугольник в единицах мира, после PlayfieldView.screen_sprite -
+# в логических пикселях экрана, а размер в ключе - в пикселях устройства.
+# Модуль без зависимостей от Qt - его используют игровые объекты.
+Sprite = namedtuple('Sprite', 'key x y width height')
+
+
+def texture_key(path, width, height):
+    """ Ключ текстуры: файл и размер, под который она масштабирована """
+    return path, int(width), int(height)
+
+
+def rotation_key(path, width, height, frame, frames):
+    """ Ключ кадра frame из frames заранее повернутых кадров текстуры """
+    return path, int(width), int(height), int(frame) % frames, frames
+
+
+def rotation_frame(angle, frames):
+    """ Ближайший к углу angle (градусы) кадр поворота """
+    return int(round(angle * frames / 360.0)) % frames
@@ -0,0 +1,79 @@
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage, QPainter
+
+
+class TextureAtlas:
+    """ Атлас: все используемые текстуры упакованы в одно изображение,
+    чтобы рисовать все спрайты за один вызов с одной текстурой """
+
+    def __init__(self, images, max_size=2048, padding=2):
+        """ images - словарь ключ текстуры -> QImage, каждое не больше
+        max_size - padding по обеим сторонам (см. fit_image). Изображения,
+        не поместившиеся в max_size x max_size, остаются в overflow """
+        self.regions = {}   # ключ -> (u0, v0, u1, v1) в координатах текстуры
+        self.overflow = []  # ключи, не поместившиеся в атлас
+
+        # Упаковка по полкам: высокие изображения первыми
+        placements = {}
+        shelf_x, shelf_y, shelf_height, width = 0, 0, 0, 0
+        for key, image in sorted(images.items(), key=lambda item: -item[1].height()):
+            w, h = image.width() + padding, image.height() + padding
+            if shelf_x + w > max_size and shelf_x > 0:
+                shelf_y += shelf_height
+                shelf_x, shelf_height = 0, 0
+            if shelf_y + h > max_size:
+                self.overflow.append(key)
+                continue
+            placements[key] = (shelf_x, shelf_y)
+            shelf_x += w
+            shelf_height = max(shelf_height, h)
+            width = max(width, shelf_x)
+        height = shelf_y + shelf_height
+
+        # Размеры степени двойки - для старых и программных драйверов
+        self.width = self._texture_size(width, max_size)
+        self.height = self._texture_size(height, max_size)
+
+        self.image = QImage(self.width, self.height, QImage.Format_ARGB32_Premultiplied)
+        self.image.fill(Qt.transparent)
+        painter = QPainter(self.image)
+        painter.setCompositionMode(QPainter.CompositionMode_Source)
+        for key, (x, y) in placements.items():
+            image = images[key]
+            painter.drawImage(x, y, image)
+            self.regions[key] = (
+                x / self.width,
+                y / self.height,
+                (x + image.width()) / self.width,
+                (y + image.height()) / self.height
+            )
+        painter.end()
+
+    def __contains__(self, key):
+        return key in self.regions
+
+    @staticmethod
+    def _texture_size(value, max_size):
+        """ Степень двойки не меньше value, если она не больше max_size """
+        size = 1 << (int(max(value, 1)) - 1).bit_length()
+        return size if size <= max_size else int(value)
+
+
+def fit_image(image, limit):
+    """ Изображение, уменьшенное до limit x limit с сохранением пропорций
+    (спрайт рисуется прежним прямоугольником - растягивается при выводе) """
+    if image.width() <= limit and image.height() <= limit:
+        return image
+    return image.scaled(limit, limit, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+
+def build_atlases(images, max_size=2048, padding=2):
+    """ Атласы для всех изображений: слишком большие уменьшаются до max_size
+    (предел текстуры драйвера), не поместившиеся переходят в следующий атлас """
+    images = {key: fit_image(image, max_size - padding) for key, image in images.items()}
+    atlases = []
+    while images:
+        atlas = TextureAtlas(images, max_size, padding)
+        atlases.append(atlas)
+        images = {key: images[key] for key in atlas.overflow}
+    return atlases
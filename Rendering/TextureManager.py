@@ -0,0 +1,103 @@
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage, QPainter, QPixmap
+
+from Diagnostics.Log import get_logger
+
+log = get_logger('render')
+
+
+class TextureManager:
+    """ Кэш текстур: файл читается с диска один раз,
+    каждый размер масштабируется один раз. Ключ из пяти элементов
+    (Rendering.Sprite.rotation_key) - кадр поворота: все кадры текстуры
+    этого размера строятся сразу при первом обращении к любому из них.
+    Размеры в ключах - пиксели устройства: при смене размера поля или
+    devicePixelRatio масштабированные текстуры сбрасываются (clear_scaled) """
+
+    _instance = None
+
+    def __init__(self):
+        self._sources = {}  # путь -> исходное изображение (None при ошибке)
+        self._images = {}   # ключ -> масштабированное QImage
+        self._pixmaps = {}  # (ключ, devicePixelRatio) -> QPixmap для отрисовки через QPainter
+
+    @classmethod
+    def instance(cls):
+        """ Общий экземпляр менеджера текстур """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def source_image(self, path):
+        """ Исходное изображение из файла """
+        if path not in self._sources:
+            image = QImage()
+            if not image.load(path):
+                log.error("Error loading texture: %s", path)
+                image = None
+            self._sources[path] = image
+        return self._sources[path]
+
+    def image(self, key):
+        """ Изображение, масштабированное под размер из ключа """
+        if key not in self._images and len(key) > 3:
+            self.render_rotations(*key[:3], key[4])
+        if key not in self._images:
+            path, width, height = key[:3]
+            source = self.source_image(path)
+            if source is None:
+                self._images[key] = None
+            else:
+                self._images[key] = source.scaled(
+                    width, height,
+                    Qt.IgnoreAspectRatio,
+                    Qt.SmoothTransformation
+                ).convertToFormat(QImage.Format_ARGB32_Premultiplied)
+        return self._images[key]
+
+    def render_rotations(self, path, width, height, frames):
+        """ Лист кадров поворота: текстура масштабируется один раз и поворачивается
+        вокруг центра на 360 / frames градусов на кадр. Без сглаживания -
+        пиксельная текстура остается четкой """
+        scaled = self.image((path, width, height))
+        for frame in range(frames):
+            key = (path, width, height, frame, frames)
+            if scaled is None:
+                self._images[key] = None
+                continue
+            image = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+            image.fill(Qt.transparent)
+            painter = QPainter(image)
+            painter.translate(width / 2, height / 2)
+            painter.rotate(360.0 * frame / frames)
+            painter.drawImage(-width // 2, -height // 2, scaled)
+            painter.end()
+            self._images[key] = image
+
+    def sheet_keys(self, key):
+        """ Все ключи листа, к которому относится key (для атласа) """
+        if len(key) <= 3:
+            return [key]
+        path, width, height, _, frames = key
+        return [(path, width, height, frame, frames) for frame in range(frames)]
+
+    def pixmap(self, key, dpr=1.0):
+        """ QPixmap для ключа (None, если текстура не загрузилась).
+        dpr - devicePixelRatio экрана: пиксель текстуры ложится на пиксель
+        устройства, QPainter ее не масштабирует """
+        if (key, dpr) not in self._pixmaps:
+            image = self.image(key)
+            pixmap = QPixmap.fromImage(image) if image is not None else None
+            if pixmap is not None:
+                pixmap.setDevicePixelRatio(dpr)
+            self._pixmaps[key, dpr] = pixmap
+        return self._pixmaps[key, dpr]
+
+    def clear_scaled(self):
+        """ Сброс масштабированных текстур (исходные файлы остаются в кэше) """
+        self._images.clear()
+        self._pixmaps.clear()
+
+    def loaded_keys(self):
+        """ Ключи всех успешно подготовленных текстур """
+        return [key for key, image in self._images.items() if image is not None]
@@ -0,0 +1,69 @@
+import json
+import logging
+import os
+
+# Diagnostics.Log сам читает настройки, поэтому здесь логгер стандартный с тем же
+# именем: до настройки журнала ошибки выводит logging.lastResort (stderr)
+log = logging.getLogger('hand_game.settings')
+
+SETTINGS_PATH = os.path.join('Files', 'settings.json')
+
+# Значения по умолчанию (используются, если ключа нет в файле настроек)
+DEFAULT_SETTINGS = {
+    'canvas': 'raster',      # Холст игрового поля: raster (QPainter) или opengl
+    'trail_length': 20,      # Максимальная длина следа курсора (точек)
+    'trail_fade_levels': 4,  # Ступени затухания следа (1 - без затухания)
+    'input_log_dir': '',     # Папка журналов ввода партий ('' - не записывать)
+    'idle_preview_fps': 5,   # Частота превью камеры на паузе (без распознавания)
+    'camera_device': 0,      # Номер камеры
+    'camera_backend': 'auto',  # API захвата: auto (V4L2 на Linux), v4l2, any
+    'camera_mode': 'auto',   # auto (подбор с кэшем), driver или строка 'MJPG 640x480@30'
+    'camera_buffer_size': 1,   # Кадров в буфере драйвера (больше - выше задержка)
+    'camera_min_width': 640,   # Минимальная ширина кадра при автоподборе
+    'difficulty_curve': 'linear',    # Рост скорости врагов: linear, smoothstep, exponential
+    'difficulty_start_speed': 1.0,   # Скорость врагов в начале партии
+    'difficulty_max_speed': 10.0,    # Скорость врагов после разгона
+    'difficulty_ramp_seconds': 45.0, # Время активной игры до максимальной скорости
+    'collision_masks': True, # Столкновения по непрозрачным пикселям текстур (False - прямоугольники)
+    'max_hands': 1,          # Рук в игре (2 - у каждой руки свой курсор и захват)
+    'hand_backend': 'solutions',   # Поиск рук: solutions или tasks (HandLandmarker)
+    'hand_landmarker_path': '',    # Модель Tasks ('' - Model/hand_landmarker.task)
+    'hand_running_mode': 'video',  # Режим Tasks: video или live_stream
+    'hand_model_complexity': 1,    # Модель точек solutions: 0 - облегченная, 1 - полная
+    'preview_pixel_size': 9, # Размер «пикселя» превью камеры (1 - без эффекта)
+    'preview_fps': 15,       # Частота превью камеры во время игры (0 - каждый кадр)
+    'particle_cap': 512,     # Предел частиц эффектов на экране
+    'log_level': 'INFO',     # Уровень журнала: DEBUG, INFO, WARNING, ERROR
+    'log_burst': 5,          # Одинаковых сообщений подряд до подавления
+    'log_interval': 10.0,    # Окно ограничения частоты сообщений, с
+    'collection_mode': 'smart',      # Сбор данных: smart (только новые позы) или fixed
+    'collection_novelty': 0.1,       # Мин. расстояние признаков до сохраненных кадров
+    'collection_uncertainty': 0.8,   # Модель не уверена ниже этой вероятности жеста
+    'collection_patience': 60,       # Кадров с рукой без новых поз до остановки
+    'collection_min_samples': 10,    # Кадров на жест не меньше этого
+    'collection_max_samples': 200,   # Кадров на жест не больше этого
+    'dataset_dedup_radius': 0.0,     # Строки ближе этого в классе - дубликаты (0 - не удалять)
+    'dataset_coreset_size': 0,       # Строк для обучения после отбора (0 - все)
+}
+
+_settings = None
+
+
+def load_settings(path=SETTINGS_PATH):
+    """ Загрузка настроек из файла с подстановкой значений по умолчанию """
+    settings = dict(DEFAULT_SETTINGS)
+    try:
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                settings.update(json.load(f))
+    except Exception as e:
+        log.error("Error loading settings: %s", e)
+    return settings
+
+
+def get_settings():
+    """ Общий для всего приложения экземпляр настроек """
+    global _settings
+    if _settings is None:
+        _settings = load_settings()
+    return _settings
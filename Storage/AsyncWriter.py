@@ -0,0 +1,105 @@
+import os
+import threading
+
+from Diagnostics.Log import get_logger
+
+log = get_logger('storage')
+
+
+class AsyncWriter:
+    """ Фоновая запись файлов: игра не ждет диск.
+    Замена файла атомарная (временный файл + os.replace), поэтому сбой
+    посреди записи оставляет старую версию целой. Дописывание строк
+    копится и сбрасывается пачками """
+
+    _instance = None
+
+    def __init__(self, flush_interval=2.0):
+        self.flush_interval = flush_interval  # Макс. задержка дописывания строк, с
+        self._condition = threading.Condition()
+        self._replace = {}   # путь -> новое содержимое (последнее побеждает)
+        self._appends = {}   # путь -> строки для дописывания
+        self._flush_requested = False
+        self._busy = False
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='AsyncWriter', daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def instance(cls):
+        """ Общий экземпляр фоновой записи """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def write_atomic(self, path, text):
+        """ Заменить содержимое файла (сразу в фоне) """
+        with self._condition:
+            self._replace[path] = text
+            self._condition.notify_all()
+
+    def append(self, path, line):
+        """ Дописать строку в конец файла (в фоне, пачкой) """
+        with self._condition:
+            self._appends.setdefault(path, []).append(line.rstrip('\n') + '\n')
+
+    def flush(self, timeout=5.0):
+        """ Записать все накопленное и дождаться окончания записи """
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify_all()
+            return self._condition.wait_for(
+                lambda: not self._replace and not self._appends and not self._busy, timeout)
+
+    def close(self):
+        """ Запись остатка и остановка потока (при выходе из приложения) """
+        self.flush()
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        self._thread.join(1.0)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                # Замены пишутся сразу, дописывания - раз в flush_interval
+                self._condition.wait_for(
+                    lambda: self._replace or self._flush_requested or not self._running,
+                    self.flush_interval)
+                if not self._running and not self._replace and not self._appends:
+                    return
+                replace, self._replace = self._replace, {}
+                appends, self._appends = self._appends, {}
+                self._flush_requested = False
+                self._busy = True
+
+            for path, text in replace.items():
+                self._write_atomic(path, text)
+            for path, lines in appends.items():
+                self._append(path, lines)
+
+            with self._condition:
+                self._busy = False
+                self._condition.notify_all()
+
+    @staticmethod
+    def _write_atomic(path, text):
+        temp_path = path + '.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+        except Exception as e:
+            log.error("Error writing %s: %s", path, e)
+
+    @staticmethod
+    def _append(path, lines):
+        try:
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(''.join(lines))
+                f.flush()
+                os.fsync(f.fileno())
+        except Exception as e:
+            log.error("Error appending to %s: %s", path, e)
@@ -0,0 +1,68 @@
+import json
+import os
+import time
+
+import numpy as np
+
+STATS_PATH = os.path.join('Files', 'game_stats.jsonl')  # Одна партия - одна строка JSON
+
+
+class SessionStats:
+    """ Статистика одной партии: время, частота кадров трекера и задержка """
+
+    def __init__(self):
+        self.started = time.time()
+        self.started_monotonic = time.monotonic()
+        self.frames = 0        # Распознанных кадров трекера
+        self.latencies = []    # Задержки от захвата кадра до интерфейса, с
+
+    def add_frame(self, captured):
+        """ Кадр трекера получен интерфейсом (captured - время захвата) """
+        self.frames += 1
+        if captured is not None:
+            self.latencies.append(time.monotonic() - captured)
+
+    def finish(self, duration, max_speed, grabs, lost):
+        """ Запись партии для журнала """
+        wall_time = max(time.monotonic() - self.started_monotonic, 1e-9)
+        record = {
+            'started': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started)),
+            'duration': round(duration, 3),
+            'max_speed': round(max_speed, 2),
+            'grabs': grabs,
+            'lost': lost,
+            'tracker_fps': round(self.frames / wall_time, 1),
+        }
+        if self.latencies:
+            p50, p90, p99 = np.percentile(self.latencies, [50, 90, 99]) * 1000
+            record['latency_ms'] = {'p50': round(p50, 1), 'p90': round(p90, 1), 'p99': round(p99, 1)}
+        return record
+
+
+def format_record(record):
+    return json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+
+
+def read_stats(path=STATS_PATH):
+    """ Все партии из журнала (оборванная при сбое строка пропускается) """
+    records = []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return records
+
+
+def leaderboard(records, top=10):
+    """ Лучшие партии по длительности """
+    return sorted(records, key=lambda record: record['duration'], reverse=True)[:top]
+
+
+def history(records, count=20):
+    """ Последние партии, новые первыми """
+    return list(reversed(records[-count:]))
@@ -0,0 +1,41 @@
+""" Непрерывная проверка столкновений: враги и перетаскиваемые объекты
+не проскакивают сквозь препятствия ни по прямоугольникам, ни по маскам.
+Сценарии те же, что в Benchmarks.collision_stress, но без замеров времени.
+
+Запуск из корня проекта:
+    python -m pytest Tests
+    python -m unittest discover Tests
+"""
+import unittest
+
+from Benchmarks.collision_stress import run_blocked_enemy, run_free_enemy, run_teleport_drag
+
+MAX_SPEED = 15  # Наибольшая скорость врагов в настройках игры
+
+
+class CollisionTest(unittest.TestCase):
+
+    def test_enemy_stops_at_block(self):
+        """ Враг на наибольшей скорости упирается в блок, а не пролетает его """
+        for collision_masks in (False, True):
+            with self.subTest(collision_masks=collision_masks):
+                tunnels, hits, _ = run_blocked_enemy(MAX_SPEED, collision_masks)
+                self.assertEqual(tunnels, 0)
+                self.assertGreater(hits, 0)
+
+    def test_fast_enemy_reaches_target(self):
+        """ Враг, перелетающий цель за один шаг, все равно заканчивает игру """
+        for collision_masks in (False, True):
+            for speed in (MAX_SPEED, 800):
+                with self.subTest(collision_masks=collision_masks, speed=speed):
+                    self.assertTrue(run_free_enemy(speed, collision_masks))
+
+    def test_teleport_drag_stops_at_enemy(self):
+        """ Блок, перенесенный курсором за один кадр, останавливается о врага """
+        for collision_masks in (False, True):
+            with self.subTest(collision_masks=collision_masks):
+                self.assertTrue(run_teleport_drag(collision_masks))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import os
+import threading
+import time
+
+import numpy as np
+
+from Diagnostics.Log import get_logger
+from Tracking.HandFeatures import landmark_points
+
+log = get_logger('tracker')
+
+# Модель MediaPipe Tasks (hand_landmarker.task) - скачивается отдельно:
+# https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/float16/1/hand_landmarker.task
+LANDMARKER_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                               'Model', 'hand_landmarker.task')
+
+NO_HANDS = np.zeros((0, 21, 2))  # Результат кадра без рук
+
+
+class SolutionsHandBackend:
+    """ Поиск рук через mediapipe.solutions.hands (граф с настройками по умолчанию) """
+
+    name = 'solutions'
+
+    def __init__(self, max_hands, model_complexity=1):
+        """ model_complexity: 0 - облегченная модель точек руки, 1 - полная """
+        mp_hands = __import__('mediapipe').solutions.hands
+        self.hands = mp_hands.Hands(
+            static_image_mode=False,       # True - изображения отдельно,
+                                           # False - с учетом предыдущих кадров
+            min_detection_confidence=0.5,  # Мин порог доверия обнаружения
+            max_num_hands=max_hands,       # Максимальное кол-во рук
+            model_complexity=model_complexity,
+            min_tracking_confidence=0.5    # Мин порог доверия отслеживания
+        )
+
+    def detect(self, frame_rgb, timestamp=None):
+        """ Точки рук кадра RGB: массив (руки, 21, 2) в долях кадра """
+        results = self.hands.process(frame_rgb)
+        if not results.multi_hand_landmarks:
+            return NO_HANDS
+        return landmark_points(results.multi_hand_landmarks)
+
+    def close(self):
+        self.hands.close()
+
+
+class TasksHandBackend:
+    """ Поиск рук через HandLandmarker из MediaPipe Tasks на CPU (XNNPACK).
+
+    running_mode 'video' - синхронный вызов на каждый кадр;
+    'live_stream' - кадр уходит в граф асинхронно, detect() возвращает
+    последний готовый результат (он может отставать на кадр), а кадры,
+    пришедшие пока граф занят, граф пропускает сам """
+
+    name = 'tasks'
+
+    def __init__(self, max_hands, model_path=LANDMARKER_PATH, running_mode='video'):
+        self.mp = __import__('mediapipe')
+        from mediapipe.tasks.python import BaseOptions, vision
+
+        self.live = running_mode == 'live_stream'
+        options = vision.HandLandmarkerOptions(
+            base_options=BaseOptions(model_asset_path=model_path,
+                                     delegate=BaseOptions.Delegate.CPU),
+            running_mode=vision.RunningMode.LIVE_STREAM if self.live else vision.RunningMode.VIDEO,
+            num_hands=max_hands,
+            min_hand_detection_confidence=0.5,
+            min_tracking_confidence=0.5,
+            result_callback=self.on_result if self.live else None
+        )
+        self.landmarker = vision.HandLandmarker.create_from_options(options)
+        self.last_timestamp_ms = -1
+        self.lock = threading.Lock()
+        self.latest = NO_HANDS   # Последний результат live_stream
+        self.listener = None     # Вызывается с (метка кадра, мс; точки) на результат live_stream
+
+    def next_timestamp_ms(self, timestamp):
+        """ Метка кадра в мс: граф требует строго возрастающих меток """
+        timestamp_ms = int((time.monotonic() if timestamp is None else timestamp) * 1000)
+        self.last_timestamp_ms = max(timestamp_ms, self.last_timestamp_ms + 1)
+        return self.last_timestamp_ms
+
+    def detect(self, frame_rgb, timestamp=None):
+        """ Точки рук кадра RGB (timestamp - время захвата, с) """
+        image = self.mp.Image(image_format=self.mp.ImageFormat.SRGB,
+                              data=np.ascontiguousarray(frame_rgb))
+        timestamp_ms = self.next_timestamp_ms(timestamp)
+        if self.live:
+            self.landmarker.detect_async(image, timestamp_ms)
+            with self.lock:
+                return self.latest
+        return self.points(self.landmarker.detect_for_video(image, timestamp_ms))
+
+    def on_result(self, result, image, timestamp_ms):
+        """ Результат live_stream (поток графа MediaPipe) """
+        points = self.points(result)
+        with self.lock:
+            self.latest = points
+        if self.listener is not None:
+            self.listener(timestamp_ms, points)
+
+    @staticmethod
+    def points(result):
+        if not result.hand_landmarks:
+            return NO_HANDS
+        return np.array([[(lm.x, lm.y) for lm in hand] for hand in result.hand_landmarks],
+                        dtype=np.float64)
+
+    def close(self):
+        self.landmarker.close()
+
+
+def create_hand_backend(settings, backend=None, running_mode=None):
+    """ Поиск рук по настройкам: hand_backend 'solutions' или 'tasks'.
+    Без файла модели Tasks используется solutions """
+    backend = backend or settings['hand_backend']
+    if backend == 'tasks':
+        model_path = settings['hand_landmarker_path'] or LANDMARKER_PATH
+        if os.path.exists(model_path):
+            return TasksHandBackend(settings['max_hands'], model_path,
+                                    running_mode or settings['hand_running_mode'])
+        log.warning("Hand landmarker model not found: %s, using mediapipe.solutions", model_path)
+    return SolutionsHandBackend(settings['max_hands'], settings['hand_model_complexity'])
@@ -0,0 +1,59 @@
+from itertools import permutations
+
+import numpy as np
+
+CENTER_LANDMARK = 9  # Основание среднего пальца - позиция курсора
+
+
+def landmark_points(multi_hand_landmarks):
+    """ Точки всех рук из MediaPipe одним массивом (руки, 21, 2) """
+    return np.array([[(lm.x, lm.y) for lm in hand.landmark]
+                     for hand in multi_hand_landmarks], dtype=np.float64)
+
+
+def mirror_points(points):
+    """ Точки рук в зеркальном кадре (x -> 1 - x) без отражения самого кадра """
+    mirrored = points.copy()
+    mirrored[:, :, 0] = 1 - mirrored[:, :, 0]
+    return mirrored
+
+
+def hand_features(points):
+    """ Признаки классификатора для всех рук сразу: точки нормализуются
+    по рамке своей руки (как при обучении), результат (руки, 42).
+    Рука с вырожденной рамкой остается в исходных координатах """
+    mins = points.min(axis=1, keepdims=True)
+    spans = points.max(axis=1, keepdims=True) - mins
+    valid = (spans > 0).all(axis=2, keepdims=True)
+    normalized = np.where(valid, (points - mins) / np.where(spans > 0, spans, 1), points)
+    return normalized.reshape(len(points), -1)
+
+
+class HandSlots:
+    """ Устойчивые номера рук между кадрами: MediaPipe не сохраняет
+    порядок рук, поэтому рука получает слот, ближайший к позиции
+    руки в этом слоте на прошлом кадре """
+
+    NEW_HAND_COST = 0.25  # Цена занятия пустого слота (в долях кадра)
+
+    def __init__(self, max_hands):
+        self.positions = [None] * max_hands  # Позиция руки слота на прошлом кадре
+
+    def assign(self, centers):
+        """ Слоты для рук с центрами centers [(x, y)], в том же порядке """
+        def cost(hand, slot):
+            previous = self.positions[slot]
+            if previous is None:
+                return self.NEW_HAND_COST
+            return np.hypot(centers[hand][0] - previous[0], centers[hand][1] - previous[1])
+
+        slots = min(permutations(range(len(self.positions)), len(centers)),
+                    key=lambda order: sum(cost(hand, slot) for hand, slot in enumerate(order)))
+
+        self.positions = [None] * len(self.positions)
+        for center, slot in zip(centers, slots):
+            self.positions[slot] = center
+        return list(slots)
+
+    def clear(self):
+        self.positions = [None] * len(self.positions)
@@ -0,0 +1,48 @@
+import threading
+from collections import namedtuple
+
+# Результат обработки одного кадра трекером:
+#   index         - номер кадра камеры
+#   captured      - время захвата кадра (time.monotonic())
+#   hand_detected - найдена ли рука (None - кадр не распознавался, только превью)
+#   x, y          - нормализованная позиция курсора (если рука найдена)
+#   gesture       - жест (0: ладонь, 1: кулак)
+#   frame         - кадр превью BGR (numpy) или None
+#   hands         - все найденные руки (HandState), x, y, gesture - первая из них
+TrackerResult = namedtuple(
+    'TrackerResult',
+    ['index', 'captured', 'hand_detected', 'x', 'y', 'gesture', 'frame', 'hands'],
+    defaults=((),)
+)
+
+# Одна рука кадра: slot - устойчивый номер руки (свой курсор и захват)
+HandState = namedtuple('HandState', ['slot', 'x', 'y', 'gesture'])
+
+
+class ResultMailbox:
+    """ Почтовый ящик последнего результата трекера: новый результат
+    заменяет непрочитанный, поэтому при задержке интерфейса очередь
+    не растет и устаревшие позиции не воспроизводятся пачкой """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._result = None
+        self.posted = 0       # Результатов отправлено
+        self.overwritten = 0  # Заменено непрочитанными
+
+    def post(self, result):
+        """ Новый результат (поток трекера). Непрочитанный кадр превью
+        переносится в результат без превью - он приходит реже результатов """
+        with self._lock:
+            if self._result is not None:
+                self.overwritten += 1
+                if result.frame is None and self._result.frame is not None:
+                    result = result._replace(frame=self._result.frame)
+            self._result = result
+            self.posted += 1
+
+    def take(self):
+        """ Последний результат или None, если нового нет (поток интерфейса) """
+        with self._lock:
+            result, self._result = self._result, None
+        return result
@@ -0,0 +1,39 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TrackerWarmup:
+    """ Параллельная подготовка трекера при запуске, пока видна заставка:
+    открытие камеры, загрузка модели жестов и построение графа MediaPipe """
+
+    def __init__(self):
+        self.futures = {}
+        self.timings = {}  # имя -> время подготовки, с
+
+    def start(self):
+        # Импорт здесь: модуль трекера тянет cv2 и numpy
+        from Camera.CameraService import CameraService
+        from HandTrackerThread import create_hands, load_gesture_model
+
+        executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix='warmup')
+        self.submit(executor, 'camera', CameraService.instance().open)
+        self.submit(executor, 'model', load_gesture_model)
+        self.submit(executor, 'hands', create_hands)
+        executor.shutdown(wait=False)
+
+    def submit(self, executor, name, function):
+        def timed():
+            start = time.perf_counter()
+            try:
+                return function()
+            finally:
+                self.timings[name] = time.perf_counter() - start
+        self.futures[name] = executor.submit(timed)
+
+    def take(self, name, factory):
+        """ Результат подготовки (ожидает ее окончания; ошибка подготовки
+        пробрасывается). Выдается один раз - повторно вызывается factory() """
+        future = self.futures.pop(name, None)
+        if future is None:
+            return factory()
+        return future.result()
@@ -1,22 +1,40 @@
+import argparse
 import os
 import sys
 import time
 
-import cv2
+STARTED = time.perf_counter()  # Начало запуска - для --startup-profile
+
 from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QPixmap, QFont
-from PyQt5.QtWidgets import (QApplication, QWidget, QHBoxLayout,
+from PyQt5.QtGui import QImage, QPixmap, QFont
+from PyQt5.QtWidgets import (QApplication, QWidget, QHBoxLayout, QSplashScreen,
                              QMainWindow, QLabel, QSpinBox, QPushButton, QVBoxLayout)
 
-from HandTrackerThread import HandTrackerThread
+from Camera.CameraService import CameraService
+from Diagnostics.GuiLoad import GuiLoad
+from Diagnostics.LatencyProbe import LatencyProbe
+from Diagnostics.Log import get_logger
+from HandTrackerThread import (HandTrackerThread, POWER_ACTIVE,
+                               POWER_PREVIEW, POWER_SUSPENDED)
 from HandCursorWidget import HandCursorWidget
 from Processing.ProcessingWindow import ProcessingWindow
 from RulesDialog import RulesDialog
+from Settings import get_settings
+from Storage.AsyncWriter import AsyncWriter
+from Storage.GameStats import STATS_PATH, SessionStats, format_record
+from Tracking.Warmup import TrackerWarmup
+
+log = get_logger('app')
+
+PANEL_WIDTH = 400  # Ширина правой панели (превью камеры)
+MIN_PLAYFIELD_SIDE = 400  # Меньше поле не становится даже на маленьком экране
+TIMER_LABEL_INTERVAL = 0.1  # Таймер игры обновляется не чаще, с
 
 
 class MainWindow(QMainWindow):
     """ Инициализация главного окна, создание интерфейса и подключение сигналов """
-    def __init__(self):
+    def __init__(self, warmup=None):
+        """ warmup - подготовка трекера, начатая при показе заставки """
         super().__init__()
         self.setWindowFlags(Qt.Window | Qt.FramelessWindowHint)
         self.setGeometry(100, 100, 1200, 600)
@@ -71,12 +89,12 @@ class MainWindow(QMainWindow):
         self.setFont(pixel_font)
 
         # Переменные и флаги
-        self.best_time = 0
-        self.active_seconds = 0
-        self.game_start_time = 0
+        self.best_time = 0.0
+        self.session = None           # Статистика текущей партии
         self.current_gesture = 0
         self.hand_detected = False
         self.game_paused = True
+        self.timer_label_time = 0.0   # Время последнего обновления таймера (monotonic)
         self.processing_window_open = False
 
         # Центральный виджет
@@ -89,9 +107,11 @@ class MainWindow(QMainWindow):
         main_horizontal_layout.setContentsMargins(10, 10, 10, 10)
         main_horizontal_layout.setSpacing(20)
 
-        # Виджет игрового поля (слева)
+        # Виджет игрового поля (слева): квадрат во всю высоту экрана,
+        # игра в единицах мира от размера не зависит
         self.cursor_widget = HandCursorWidget()
-        self.cursor_widget.setFixedSize(800, 800)
+        side = self.playfield_side(main_horizontal_layout, PANEL_WIDTH)
+        self.cursor_widget.setFixedSize(side, side)
         main_horizontal_layout.addWidget(self.cursor_widget)
 
         # Вертикальный контейнер для правой панели
@@ -157,7 +177,7 @@ class MainWindow(QMainWindow):
         timer_v_layout = QVBoxLayout(timer_container)
         timer_label = QLabel("Текущее время:")
         timer_label.setStyleSheet("font-weight: bold; font-size: 24px; color: #ff8800;")
-        self.timer_label = QLabel("00:00")
+        self.timer_label = QLabel(self.format_time(0))
         self.timer_label.setObjectName("TimerLabel")
         self.timer_label.setAlignment(Qt.AlignCenter)
         self.timer_label.setFixedHeight(40)
@@ -174,7 +194,6 @@ class MainWindow(QMainWindow):
         self.speed_spinbox.setButtonSymbols(QSpinBox.NoButtons)
         self.speed_spinbox.setRange(1, 15)
         self.speed_spinbox.setValue(1)
-        self.speed_spinbox.valueChanged.connect(self.update_beetle_speed)
         self.speed_spinbox.setDisabled(True)
         self.speed_spinbox.setAlignment(Qt.AlignCenter)
         self.speed_spinbox.setFixedHeight(40)
@@ -194,13 +213,14 @@ class MainWindow(QMainWindow):
         best_time_v_layout = QVBoxLayout(best_time_container)
         best_time_label = QLabel("Лучшее время:")
         best_time_label.setStyleSheet("font-weight: bold; font-size: 24px; color: #ff8800;")
-        self.best_time_label_value = QLabel("00:00")
+        self.best_time_label_value = QLabel(self.format_time(0))
         self.best_time_label_value.setObjectName("BestTimeLabel")
         self.best_time_label_value.setAlignment(Qt.AlignCenter)
         self.best_time_label_value.setFixedHeight(40)
         best_time_v_layout.addWidget(best_time_label)
         best_time_v_layout.addWidget(self.best_time_label_value)
         best_rules_layout.addWidget(best_time_container)
+        right_layout.addWidget(best_rules_container)
 
         # Кнопка обработки данных
         self.processing_button = QPushButton("Настройка модели")
@@ -218,7 +238,7 @@ class MainWindow(QMainWindow):
                     font-size: 24px;
                     qproperty-alignment: AlignCenter;
                 """)
-        self.camera_widget.setFixedSize(400, 400)
+        self.camera_widget.setFixedSize(PANEL_WIDTH, PANEL_WIDTH)
         right_layout.addWidget(self.camera_widget)
 
         # Добавляем правую колонку в основной layout
@@ -228,52 +248,80 @@ class MainWindow(QMainWindow):
         # main_vertical_layout.addLayout(content_layout)
 
         # Thread для отслеживания руки
-        self.tracker_thread = HandTrackerThread()
-        self.tracker_thread.position_updated.connect(self.update_cursor_position_from_tracker)
-        self.tracker_thread.landmarks_detected.connect(self.cursor_widget.set_hand_detected)
-        self.tracker_thread.landmarks_detected.connect(self.set_hand_detected)
+        self.first_tracked_time = None  # Первый распознанный кадр (--startup-profile)
+        self.tracker_thread = HandTrackerThread(warmup)
         self.tracker_thread.tracker_ready.connect(self.enable_start_button)
-        self.tracker_thread.tracker_ready.connect(self.enable_start_button)
-        self.tracker_thread.frame_updated.connect(self.update_camera)
+        self.set_preview_size()
         self.tracker_thread.start()
 
-        # Таймер игры
-        self.active_timer = QTimer(self)
-        self.active_timer.setInterval(1000)
-        self.active_timer.timeout.connect(self.update_active_timer)
+        # Результаты трекера забираются раз в кадр экрана: между опросами
+        # новый результат заменяет старый, очередь событий не растет
+        refresh_rate = QApplication.primaryScreen().refreshRate() or 60
+        self.tracker_poll_timer = QTimer(self)
+        self.tracker_poll_timer.setTimerType(Qt.PreciseTimer)
+        self.tracker_poll_timer.setInterval(max(1, int(1000 / refresh_rate)))
+        self.tracker_poll_timer.timeout.connect(self.poll_tracker)
+        self.tracker_poll_timer.start()
 
         # Сигналы виджета
         self.cursor_widget.restart_requested.connect(self.restart_game)
         self.cursor_widget.game_ended.connect(self.on_game_ended)
-
-        # Таймер для увеличения скорости
-        self.speed_increase_timer = QTimer(self)
-        self.speed_increase_timer.setInterval(5000)  # 5 секунд
-        self.speed_increase_timer.timeout.connect(self.increase_beetle_speed)
+        self.cursor_widget.speed_changed.connect(self.speed_spinbox.setValue)
 
         # Загрузка лучшего времени из файла
         self.load_best_time()
 
 
+    @staticmethod
+    def playfield_side(layout, panel_width):
+        """ Сторона игрового поля: вся доступная высота экрана,
+        если рядом помещается правая панель """
+        screen = QApplication.primaryScreen().availableGeometry()
+        margins = layout.contentsMargins()
+        height = screen.height() - margins.top() - margins.bottom()
+        width = (screen.width() - margins.left() - margins.right()
+                 - layout.spacing() - panel_width)
+        return max(MIN_PLAYFIELD_SIDE, min(height, width))
+
     def set_hand_detected(self, detected):
         """ Обновление статуса обнаружения руки """
         self.hand_detected = detected
 
-    def update_active_timer(self):
-        """ Обновление таймера во время игры """
-        if (not self.game_paused and
-                self.current_gesture == 0 and
-                self.hand_detected):
-            self.active_seconds += 1
-            minutes = self.active_seconds // 60
-            seconds = self.active_seconds % 60
-            self.timer_label.setText(f"{minutes:02d}:{seconds:02d}")
+    @property
+    def active_seconds(self):
+        """ Время активной игры - по часам симуляции (сумма шагов с открытой ладонью) """
+        return self.cursor_widget.simulation.active_time
+
+    def update_timer_label(self, force=False):
+        """ Таймер игры: текст меняется не чаще раза в TIMER_LABEL_INTERVAL
+        (force - сразу, например итоговое время партии) """
+        now = time.monotonic()
+        if not force and now - self.timer_label_time < TIMER_LABEL_INTERVAL:
+            return
+        self.timer_label_time = now
+        text = self.format_time(self.active_seconds)
+        if text != self.timer_label.text():
+            self.timer_label.setText(text)
+
+    def update_tracker_power(self):
+        """ Режим трекера по состоянию игры: распознавание только во время игры """
+        if self.processing_window_open:
+            state = POWER_SUSPENDED
+        elif self.game_paused:
+            state = POWER_PREVIEW
+        else:
+            state = POWER_ACTIVE
+        self.tracker_thread.set_power_state(state)
+        GuiLoad.instance().set_mode(state)
 
     def stop_tracker(self):
         if hasattr(self, 'tracker_thread') and self.tracker_thread and self.tracker_thread.isRunning():
-            print("Stopping tracker thread...")
+            log.info("Stopping tracker thread...")
             self.tracker_thread.stop()
+        self.show_camera_off()
 
+    def show_camera_off(self):
+        """ Заглушка вместо превью камеры """
         # Очищаем виджет камеры (один раз)
         self.camera_widget.clear()
 
@@ -294,30 +342,36 @@ class MainWindow(QMainWindow):
         """Перезапуск потока трекера руки"""
         if not self.tracker_thread.isRunning():
             self.tracker_thread = HandTrackerThread()
-            self.tracker_thread.position_updated.connect(self.update_cursor_position_from_tracker)
-            self.tracker_thread.landmarks_detected.connect(self.cursor_widget.set_hand_detected)
-            self.tracker_thread.landmarks_detected.connect(self.set_hand_detected)
             self.tracker_thread.tracker_ready.connect(self.enable_start_button)
-            self.tracker_thread.frame_updated.connect(self.update_camera)
+            self.set_preview_size()
+            self.update_tracker_power()
             self.tracker_thread.start()
 
+    def set_preview_size(self):
+        """ Трекер строит превью сразу в размере виджета камеры (без рамки) """
+        self.camera_widget.ensurePolished()
+        area = self.camera_widget.contentsRect()
+        self.tracker_thread.set_preview_size(area.width(), area.height())
+
     def open_processing_window(self):
         """Открытие окна обработки данных"""
         if self.processing_window_open:
-            print("Processing window is already open")
+            log.info("Processing window is already open")
             return
 
         try:
+            # Игра на паузу, трекер засыпает. Камеру держит CameraService:
+            # трекер только отписывается, окно обучения подписывается
+            # на то же открытое устройство
+            if not self.game_paused:
+                self.toggle_pause()
             self.processing_window_open = True
-            print("Stopping tracker...")
-            self.stop_tracker()
-
-            print("Waiting for resources release...")
-            QTimer.singleShot(7000, self._open_processing_window)
+            self.update_tracker_power()
+            self.show_camera_off()
+            self._open_processing_window()
         except Exception as e:
-            print(f"Error opening processing window: {e}")
-            self.processing_window_open = False
-            self.restart_tracker()
+            log.error("Error opening processing window: %s", e)
+            self.on_processing_finished()
 
     def _open_processing_window(self):
         try:
@@ -325,20 +379,26 @@ class MainWindow(QMainWindow):
             self.processing_window.finished.connect(self.on_processing_finished)
             self.processing_window.exec_()
         except Exception as e:
-            print(f"Error showing processing window: {e}")
-            self.processing_window_open = False
-            self.restart_tracker()
+            log.error("Error showing processing window: %s", e)
+            self.on_processing_finished()
 
     def on_processing_finished(self):
         """Обработчик закрытия окна обработки"""
+        if not self.processing_window_open:
+            return
         self.processing_window_open = False
-        self.restart_tracker()
+        if self.tracker_thread.isRunning():
+            # Модель могла быть переобучена
+            self.tracker_thread.request_model_reload()
+            self.update_tracker_power()
+        else:
+            self.restart_tracker()
 
     def format_time(self, seconds):
-        """ Форматирование времени в формате MM:SS """
-        minutes = seconds // 60
-        seconds = seconds % 60
-        return f"{minutes:02d}:{seconds:02d}"
+        """ Форматирование времени в формате MM:SS.d """
+        tenths = int(seconds * 10)
+        minutes, tenths = divmod(tenths, 600)
+        return f"{minutes:02d}:{tenths // 10:02d}.{tenths % 10}"
 
     def load_best_time(self):
         """ Загрузка лучшего времени из файла """
@@ -346,24 +406,33 @@ class MainWindow(QMainWindow):
             if os.path.exists("Files/best_score.txt"):
                 with open("Files/best_score.txt", "r") as f:
                     content = f.read().strip()
-                    if content.isdigit():
-                        self.best_time = int(content)
+                    if content:
+                        self.best_time = float(content)
                         self.best_time_label_value.setText(self.format_time(self.best_time))
         except Exception as e:
-            print(f"Error loading best time: {e}")
+            log.error("Error loading best time: %s", e)
 
     def save_best_time(self):
-        """ Сохранение лучшего времени в файл """
-        try:
-            with open("Files/best_score.txt", "w") as f:
-                f.write(str(self.best_time))
-        except Exception as e:
-            print(f"Error saving best time: {e}")
+        """ Сохранение лучшего времени в файл (в фоне, атомарной заменой) """
+        AsyncWriter.instance().write_atomic("Files/best_score.txt", f"{self.best_time:.1f}")
+
+    def finish_session(self, lost):
+        """ Запись статистики партии в журнал (в фоне) """
+        if self.session is None:
+            return
+        if self.active_seconds <= 0:
+            self.session = None  # Партия не начиналась
+            return
+        simulation = self.cursor_widget.simulation
+        record = self.session.finish(self.active_seconds, simulation.speed, simulation.grabs, lost)
+        AsyncWriter.instance().append(STATS_PATH, format_record(record))
+        self.session = None
 
     def best_time_to_file(self):
         """ Обновление лучшего времени при завершении игры """
-        if self.active_seconds > self.best_time:
-            self.best_time = self.active_seconds
+        active_seconds = round(self.active_seconds, 1)
+        if active_seconds > self.best_time:
+            self.best_time = active_seconds
             self.save_best_time()
             self.best_time_label_value.setText(self.format_time(self.best_time))
 
@@ -375,51 +444,39 @@ class MainWindow(QMainWindow):
     def toggle_pause(self):
         """ Переключение состояния паузы игры """
         if self.game_paused:
-            self.active_timer.start()
+            if self.session is None:
+                self.session = SessionStats()
             self.game_paused = False
             self.start_pause_button.setText("Пауза")
-            self.speed_increase_timer.start()
             self.cursor_widget.game_paused = False
         else:
             self.game_paused = True
             self.start_pause_button.setText("Старт")
-            self.speed_increase_timer.stop()
-            self.active_timer.stop()
             self.cursor_widget.game_paused = True
+        self.update_tracker_power()
 
     def on_game_ended(self):
         """ Обработка завершения игры """
-        self.active_timer.stop()
-        self.speed_increase_timer.stop()
+        self.update_timer_label(force=True)
         self.game_paused = True
         self.start_pause_button.setText("Старт")
+        self.update_tracker_power()
         self.best_time_to_file()
+        self.finish_session(lost=True)
 
     def restart_game(self):
         """ Перезапуск игры со сбросом состояний """
-        # Обновление лучшего времени
-        if self.active_seconds > self.best_time:
-            self.best_time = self.active_seconds
-            self.best_time_label_value.setText(self.format_time(self.best_time))
-            self.best_time_to_file()
-
-        # Остановка таймеров
-        self.speed_increase_timer.stop()
-        self.active_timer.stop()
+        # Обновление лучшего времени и статистики прерванной партии
+        self.best_time_to_file()
+        self.finish_session(lost=False)
 
         # Сброс переменных и флагов
         self.game_paused = True
-        self.active_seconds = 0
-        self.game_start_time = 0
-        self.timer_label.setText("00:00")
+        self.timer_label.setText(self.format_time(0))
         self.start_pause_button.setText("Старт")
+        self.update_tracker_power()
 
-        # Сброс скорости врагов
-        self.cursor_widget.beetle.speed = 1
-        self.cursor_widget.beetle2.speed = 1
-        self.speed_spinbox.setValue(1)
-
-        # Сброс игрового поля
+        # Сброс игрового поля и скорости врагов
         self.cursor_widget.reset_game()
 
 
@@ -428,67 +485,169 @@ class MainWindow(QMainWindow):
         self.start_pause_button.setEnabled(model_loaded)
         self.restart_button.setEnabled(model_loaded)
 
-    def increase_beetle_speed(self):
-        """ Увеличение скорости врагов каждые 5 секунд """
-        # Увеличиваем скорость только при открытой руке
-        if (not self.game_paused and
-                self.current_gesture == 0 and
-                self.hand_detected):
-            current_speed = self.cursor_widget.beetle.speed
-            if current_speed < 10:
-                new_speed = current_speed + 1
-                self.cursor_widget.beetle.speed = new_speed
-                self.cursor_widget.beetle2.speed = new_speed
-                self.speed_spinbox.setValue(new_speed)
-
-    def update_beetle_speed(self, speed):
-        """ Обновление скорости врагов """
-        self.cursor_widget.beetle.speed = speed
-        self.cursor_widget.beetle2.speed = speed
-
-    def update_cursor_position_from_tracker(self, x, y, gesture):
+    def poll_tracker(self):
+        """ Последний результат трекера: рука, позиция курсора и превью """
+        result = self.tracker_thread.mailbox.take()
+        if result is None:
+            return
+
+        if result.hand_detected is not None:
+            if self.first_tracked_time is None:
+                self.first_tracked_time = time.perf_counter()
+            if self.session is not None and not self.game_paused:
+                self.session.add_frame(result.captured)
+            self.set_hand_detected(result.hand_detected)
+            self.cursor_widget.set_hand_detected(result.hand_detected)
+        load = GuiLoad.instance()
+        if result.hand_detected:
+            with load.measure('cursor'):
+                self.update_cursor_position_from_tracker(result.x, result.y, result.gesture,
+                                                         result.captured, result.hands)
+                if not self.game_paused:
+                    self.update_timer_label()
+        if result.frame is not None:
+            with load.measure('preview'):
+                self.update_camera(result.frame)
+
+    def update_cursor_position_from_tracker(self, x, y, gesture, captured=None, hands=None):
         """ Обновление позиции курсора на основе данных трекера """
+        LatencyProbe.instance().mark(captured, 'received')
         self.current_gesture = gesture
-        self.cursor_widget.update_cursor_position(x, y, gesture)
+        self.cursor_widget.update_cursor_position(x, y, gesture, captured, hands)
 
-    def update_camera(self, image):
-        """ Обновление изображения с камеры """
+    def update_camera(self, frame):
+        """ Обновление изображения с камеры (кадр BGR). Превью трекера уже
+        в размере показа - масштабируются только кадры крупнее него """
+        h, w, ch = frame.shape
+        image = QImage(frame.data, w, h, ch * w, QImage.Format_BGR888)
         pixmap = QPixmap.fromImage(image)
-        self.camera_widget.setPixmap(pixmap.scaled(
-            self.camera_widget.size(),
-            Qt.KeepAspectRatio,
-            Qt.SmoothTransformation
-        ))
+        area = self.camera_widget.contentsRect().size()
+        if w > area.width() or h > area.height():
+            pixmap = pixmap.scaled(area, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        self.camera_widget.setPixmap(pixmap)
 
     def closeEvent(self, event):
         """ Обработчик закрытия окна """
         try:
-            print("Закрытие приложения...")
+            log.info("Закрытие приложения...")
+            # Дописываем журнал ввода и статистику текущей партии
+            self.cursor_widget.simulation.stop_recording()
+            self.best_time_to_file()
+            self.finish_session(lost=False)
+            AsyncWriter.instance().close()
+
             # Останавливаем трекер
             self.stop_tracker()
 
             # Даем время на освобождение ресурсов
             if hasattr(self, 'tracker_thread') and self.tracker_thread:
                 if self.tracker_thread.isRunning():
-                    print("Ожидание завершения потока трекера...")
+                    log.info("Ожидание завершения потока трекера...")
                     self.tracker_thread.wait(1000)
 
                     # Принудительно завершаем поток, если он все еще работает
                     if self.tracker_thread.isRunning():
-                        print("Принудительное завершение потока трекера")
+                        log.warning("Принудительное завершение потока трекера")
                         self.tracker_thread.terminate()
                         self.tracker_thread.wait(1000)
 
+            # Освобождаем камеру
+            CameraService.instance().close()
+
+            probe = LatencyProbe.instance()
+            if probe.enabled:
+                print(probe.report())
+                print(GuiLoad.instance().report())
+
             event.accept()
         except Exception as e:
-            print(f"Ошибка при закрытии: {e}")
+            log.error("Ошибка при закрытии: %s", e)
             event.accept()
 
         super().closeEvent(event)
 
 
+def parse_arguments():
+    """ Разбор параметров запуска (остальные аргументы передаются в Qt) """
+    parser = argparse.ArgumentParser(description="Игра с управлением жестами рук")
+    parser.add_argument('--canvas', choices=('raster', 'opengl'),
+                        help="холст игрового поля (по умолчанию из Files/settings.json)")
+    parser.add_argument('--software-gl', action='store_true',
+                        help="программный OpenGL (Mesa llvmpipe / opengl32sw), без GPU")
+    parser.add_argument('--record-input', metavar='DIR',
+                        help="записывать журнал ввода каждой партии в папку DIR")
+    parser.add_argument('--latency-probe', action='store_true',
+                        help="замер задержки от захвата кадра до отрисовки курсора "
+                             "и загрузки потока интерфейса (отчет при выходе)")
+    parser.add_argument('--camera', metavar='DEVICE',
+                        help="номер камеры или видеофайл вместо камеры")
+    parser.add_argument('--startup-profile', action='store_true',
+                        help="вывести время до первого окна и первого распознанного кадра и выйти")
+    return parser.parse_known_args()
+
+
+def show_splash():
+    """ Заставка на время загрузки """
+    pixmap = QPixmap('Images/space.png').scaled(400, 400, Qt.KeepAspectRatio)
+    splash = QSplashScreen(pixmap)
+    splash.showMessage("Загрузка...", Qt.AlignBottom | Qt.AlignHCenter, Qt.white)
+    splash.show()
+    QApplication.processEvents()
+    return splash
+
+
+def profile_startup(app, window, timeout=30.0):
+    """ --startup-profile: трекер сразу в режиме распознавания,
+    после первого распознанного кадра - отчет и выход """
+    first_window = time.perf_counter() - STARTED
+    window.tracker_thread.set_power_state(POWER_ACTIVE)
+
+    def check():
+        tracked = window.first_tracked_time
+        if tracked is None and time.perf_counter() - STARTED < timeout:
+            return
+        timer.stop()
+        tracked_ms = f"{(tracked - STARTED) * 1000:.0f}" if tracked is not None else "none"
+        warmup = ' '.join(f"{name}={seconds * 1000:.0f}"
+                          for name, seconds in sorted(window.tracker_thread.warmup.timings.items()))
+        print(f"startup: first_window={first_window * 1000:.0f} "
+              f"first_tracked={tracked_ms} warmup: {warmup}")
+        window.close()
+        app.quit()
+
+    timer = QTimer(window)
+    timer.timeout.connect(check)
+    timer.start(5)
+
+
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    window = MainWindow()
+    args, qt_args = parse_arguments()
+    if args.canvas:
+        get_settings()['canvas'] = args.canvas
+    if args.record_input:
+        get_settings()['input_log_dir'] = args.record_input
+    if args.latency_probe:
+        LatencyProbe.instance().enabled = True
+        GuiLoad.instance().enabled = True
+    if args.camera:
+        get_settings()['camera_device'] = int(args.camera) if args.camera.isdigit() else args.camera
+    if args.software_gl:
+        os.environ['LIBGL_ALWAYS_SOFTWARE'] = '1'
+        QApplication.setAttribute(Qt.AA_UseSoftwareOpenGL)
+    # Настоящий devicePixelRatio на HiDPI-экранах: текстуры поля строятся в пикселях устройства
+    QApplication.setAttribute(Qt.AA_EnableHighDpiScaling)
+    QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps)
+
+    app = QApplication(sys.argv[:1] + qt_args)
+    splash = show_splash()
+
+    # Камера, модель и MediaPipe готовятся параллельно, пока строится окно
+    warmup = TrackerWarmup()
+    warmup.start()
+
+    window = MainWindow(warmup)
     window.show()
+    splash.finish(window)
+    if args.startup_profile:
+        profile_startup(app, window)
     sys.exit(app.exec_())
\ No newline at end of file